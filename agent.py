@@ -4,46 +4,135 @@ Chemical-driven agent with pathway memory, generations, and 12 chemicals.
 NO hardcoded behaviours.
 """
 
+import functools
 import math
-import random
+from collections.abc import Mapping
+from enum import IntEnum
+
+import numpy as np
 import config as cfg
+import falloff
+from world import LAYER_SCENT, LAYER_FOOD_MARKERS, LAYER_ALARM_MARKERS
+
+# the 12 chemicals, in storage order, with their starting concentrations
+CHEMICAL_DEFAULTS = {
+    "hunger":                0.0,
+    "fear":                  0.0,
+    "curiosity":             0.5,
+    "satiation":             0.0,
+    "aggression":            0.0,
+    "fatigue":               0.0,
+    "alertness":             0.5,
+    "comfort":               0.0,
+    "urgency":               0.0,
+    "memory_consolidation":  0.0,
+    "social":                0.0,
+    "stress":                0.0,
+}
+CHEMICALS = tuple(CHEMICAL_DEFAULTS)
+
+# index of each chemical in an agent's chemical vector
+Chem = IntEnum("Chem", [name.upper() for name in CHEMICALS], start=0)
+# plain-int aliases for the hot paths
+(HUNGER, FEAR, CURIOSITY, SATIATION, AGGRESSION, FATIGUE, ALERTNESS,
+ COMFORT, URGENCY, MEMORY_CONSOLIDATION, SOCIAL, STRESS) = map(int, Chem)
+CHEMICAL_START = np.array(list(CHEMICAL_DEFAULTS.values()))
+_CHEMICAL_INDEX = {name: index for index, name in enumerate(CHEMICALS)}
+
+
+@functools.lru_cache(maxsize=None)
+def territory_kernel(radius: int):
+    """(dx, dy, weights, total) of the territory kernel: 1 / (1 + distance)
+    over the square of cells within `radius`."""
+    dx, dy = (
+        a.ravel() for a in np.meshgrid(np.arange(-radius, radius + 1),
+                                       np.arange(-radius, radius + 1))
+    )
+    weights = 1.0 / (1.0 + np.sqrt(dx ** 2 + dy ** 2))
+    return dx, dy, weights, weights.sum()
+
+
+def territory_density(grids: np.ndarray, rows, xs, ys,
+                      radius: int) -> np.ndarray:
+    """Weighted pathway coverage of grids[rows] around (xs, ys), in [0, 1].
+
+    `grids` is (N, H, W); cells off the grid count as empty.
+    """
+    kernel_dx, kernel_dy, weights, total = territory_kernel(radius)
+    cx = np.asarray(xs)[:, None] + kernel_dx
+    cy = np.asarray(ys)[:, None] + kernel_dy
+    size = grids.shape[-1]
+    on_grid = (cx >= 0) & (cx < size) & (cy >= 0) & (cy < size)
+    np.clip(cx, 0, size - 1, out=cx)
+    np.clip(cy, 0, size - 1, out=cy)
+    held = (grids[np.asarray(rows)[:, None], cy, cx] > 0) & on_grid
+    return (held * weights).sum(axis=1) / total
+
+
+def agent_label(agent_id: int) -> str:
+    """Display name of the agent with this id: A, B, … Z, then A1, B1, …"""
+    letter = chr(ord("A") + agent_id % 26)
+    return letter if agent_id < 26 else f"{letter}{agent_id // 26}"
+
+
+# neighbour scan order; decide_move keeps the first of equal best scores
+NEIGHBOUR_OFFSETS = [
+    (dx, dy)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    if not (dx == 0 and dy == 0)
+]
+
+
+class ChemicalView(Mapping):
+    """Read-only name -> concentration view of a chemical vector."""
+
+    __slots__ = ("_vector",)
+
+    def __init__(self, vector: np.ndarray):
+        self._vector = vector
+
+    def __getitem__(self, name: str) -> float:
+        return float(self._vector[_CHEMICAL_INDEX[name]])
+
+    def __iter__(self):
+        return iter(CHEMICALS)
+
+    def __len__(self) -> int:
+        return len(CHEMICALS)
+
+    def __repr__(self) -> str:
+        return f"ChemicalView({dict(self)!r})"
 
 
 class Agent:
     """An agent whose behaviour emerges from chemical pressure, not rules."""
 
-    def __init__(self, agent_id: int, x: int, y: int, color_name: str):
+    def __init__(self, agent_id: int, x: int, y: int, color_name: str,
+                 config: cfg.SimConfig | None = None,
+                 rng: np.random.Generator | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        # move noise; offspring share their parent's stream
+        self.rng = np.random.default_rng() if rng is None else rng
         self.id = agent_id
         self.x = x
         self.y = y
         self.color_name = color_name       # "blue" or "red"
 
         # energy
-        self.energy = cfg.ENERGY_START
+        self.energy = self.config.ENERGY_START
         self.alive = True
 
-        # 12 chemical internal states
-        self.chemicals = {
-            "hunger":                0.0,
-            "fear":                  0.0,
-            "curiosity":             0.5,
-            "satiation":             0.0,
-            "aggression":            0.0,
-            "fatigue":               0.0,
-            "alertness":             0.5,
-            "comfort":               0.0,
-            "urgency":               0.0,
-            "memory_consolidation":  0.0,
-            "social":                0.0,
-            "stress":                0.0,
-        }
-
-        # pathway memory: (x, y) -> strength
-        self.pathways: dict[tuple[int, int], float] = {}
+        # 12 chemical internal states, indexed by Chem
+        self.chem = CHEMICAL_START.copy()
+
+        # pathway memory: strength per cell, 0 where there is none
+        size = self.config.GRID_SIZE
+        self.pathways = np.zeros((size, size), dtype=np.float32)
 
         # exploration tracking
-        self.visited: set[tuple[int, int]] = set()
-        self.visited.add((x, y))
+        self.visited = np.zeros((size, size), dtype=bool)
+        self.visited[y, x] = True
 
         # recent move history for pathway reinforcement
         self._move_history: list[tuple[int, int]] = []
@@ -63,241 +152,272 @@ class Agent:
         # movement tracking for fatigue
         self._stationary_ticks = 0
 
+    @property
+    def chemicals(self) -> ChemicalView:
+        """Read-only dict-like view of `chem` by chemical name."""
+        return ChemicalView(self.chem)
+
+    @property
+    def label(self) -> str:
+        """Display name: A, B, … Z, then A1, B1, …"""
+        return agent_label(self.id)
+
     # ── chemical update ──────────────────────────────────────────────────
-    def update_chemicals(self, other_agent: "Agent", predator=None):
-        """Recompute all 12 chemical concentrations from current state."""
+    def update_chemicals(self, other_agent: "Agent | None", predator=None):
+        """Recompute all 12 chemical concentrations from current state.
+
+        `other_agent` is the nearest living neighbour, or None when the
+        agent is alone; fear, aggression and social read from it.
+        """
+        near = other_agent is not None and other_agent.alive
+        c = self.chem.tolist()
 
         # ── hunger — inverse of energy ───────────────────────────────
         raw_hunger = 1.0 - (self.energy / 100.0)
-        self.chemicals["hunger"] = max(0.0, min(1.0, raw_hunger))
+        c[HUNGER] = max(0.0, min(1.0, raw_hunger))
 
         # satiation decay
-        self.chemicals["satiation"] = max(
-            0.0, self.chemicals["satiation"] - cfg.SATIATION_DECAY
+        c[SATIATION] = max(
+            0.0, c[SATIATION] - self.config.SATIATION_DECAY
         )
         # hunger suppression by satiation
-        self.chemicals["hunger"] = max(
+        c[HUNGER] = max(
             0.0,
-            self.chemicals["hunger"] - self.chemicals["satiation"] * 0.5,
+            c[HUNGER] - c[SATIATION] * 0.5,
         )
 
+        # distances and falloffs, once per call
+        lut = falloff.tables(self.config)
+        if near:
+            odx, ody = self.x - other_agent.x, self.y - other_agent.y
+            dist = math.hypot(odx, ody)
+        pred_near = predator is not None and predator.alive
+        if pred_near:
+            # smooth inverse-distance: strong nearby, fades to near-zero far away
+            pred_fear = lut.predator_fear(self.x - predator.x,
+                                          self.y - predator.y)
+
         # ── fear — proximity to other agent ──────────────────────────
-        if other_agent.alive:
-            dist = math.hypot(self.x - other_agent.x, self.y - other_agent.y)
-            max_dist = math.hypot(cfg.GRID_SIZE, cfg.GRID_SIZE)
-            self.chemicals["fear"] = max(0.0, min(
+        if near:
+            size = self.config.GRID_SIZE
+            max_dist = math.hypot(size, size)
+            c[FEAR] = max(0.0, min(
                 1.0, 1.0 - (dist / max_dist)
             ))
         else:
-            self.chemicals["fear"] = 0.0
+            c[FEAR] = 0.0
 
         # ── predator fear boost — continuous falloff, no range cutoff ─
-        if predator is not None and predator.alive:
-            pred_dist = math.hypot(self.x - predator.x, self.y - predator.y)
-            # smooth inverse-distance: strong nearby, fades to near-zero far away
-            pred_fear = 1.0 / (1.0 + (pred_dist / cfg.PREDATOR_SENSE_RANGE) ** 2)
-            self.chemicals["fear"] = min(
+        if pred_near:
+            c[FEAR] = min(
                 1.0,
-                self.chemicals["fear"] + pred_fear * cfg.PREDATOR_FEAR_BOOST
+                c[FEAR] + pred_fear * self.config.PREDATOR_FEAR_BOOST
             )
 
         # fear suppressed by hunger — continuous gradient, no threshold
         # the hungrier the agent, the less it fears (squared for nonlinearity)
-        hunger_sq = self.chemicals["hunger"] ** 2
-        self.chemicals["fear"] *= (1.0 - hunger_sq * 0.9)
+        hunger_sq = c[HUNGER] ** 2
+        c[FEAR] *= (1.0 - hunger_sq * 0.9)
 
         # ── curiosity — rises in new cells, decays in known ──────────
-        if (self.x, self.y) not in self.visited:
-            self.chemicals["curiosity"] = min(
-                1.0, self.chemicals["curiosity"] + 0.15
+        if not self.visited[self.y, self.x]:
+            c[CURIOSITY] = min(
+                1.0, c[CURIOSITY] + 0.15
             )
-            self.visited.add((self.x, self.y))
+            self.visited[self.y, self.x] = True
         else:
-            self.chemicals["curiosity"] = max(
-                0.0, self.chemicals["curiosity"] - cfg.CURIOSITY_GAIN
+            c[CURIOSITY] = max(
+                0.0, c[CURIOSITY] - self.config.CURIOSITY_GAIN
             )
         # fear suppresses curiosity
-        self.chemicals["curiosity"] = max(
+        c[CURIOSITY] = max(
             0.0,
-            self.chemicals["curiosity"] - self.chemicals["fear"] * 0.4,
+            c[CURIOSITY] - c[FEAR] * 0.4,
         )
 
         # ── aggression — rises when territory invaded ────────────────
-        if other_agent.alive:
-            other_dist = math.hypot(
-                self.x - other_agent.x, self.y - other_agent.y
-            )
+        if near:
             # aggression — continuous inverse-square proximity, no threshold
             # closer = stronger signal, fades smoothly with distance
-            proximity_pressure = 1.0 / (1.0 + other_dist ** 2 / 25.0)
+            proximity_pressure = lut.aggression(odx, ody)
             # modulated by how many pathways are nearby (territory density)
-            path_density = sum(
-                1.0 / (1.0 + math.hypot(other_agent.x - px, other_agent.y - py))
-                for (px, py) in list(self.pathways.keys())[:20]
-            ) / max(1, min(20, len(self.pathways)))
+            path_density = self.path_density(other_agent.x, other_agent.y)
             aggression_input = proximity_pressure * path_density
-            self.chemicals["aggression"] = max(0.0, min(1.0,
-                self.chemicals["aggression"] * 0.95 + aggression_input * 0.1
+            c[AGGRESSION] = max(0.0, min(1.0,
+                c[AGGRESSION] * 0.95 + aggression_input * 0.1
             ))
         # fatigue suppresses aggression
-        self.chemicals["aggression"] = max(
+        c[AGGRESSION] = max(
             0.0,
-            self.chemicals["aggression"]
-            - self.chemicals["fatigue"] * 0.3,
+            c[AGGRESSION]
+            - c[FATIGUE] * 0.3,
         )
 
         # ── fatigue — rises with movement, decays when stationary ────
         # updated in update() based on movement
 
         # fatigue suppresses curiosity
-        self.chemicals["curiosity"] = max(
+        c[CURIOSITY] = max(
             0.0,
-            self.chemicals["curiosity"] - self.chemicals["fatigue"] * 0.3,
+            c[CURIOSITY] - c[FATIGUE] * 0.3,
         )
 
         # ── alertness — rises with fear and predator proximity ────────
-        alert_input = self.chemicals["fear"] * 0.5
-        if predator is not None and predator.alive:
-            pred_dist = math.hypot(self.x - predator.x, self.y - predator.y)
+        alert_input = c[FEAR] * 0.5
+        if pred_near:
             # continuous: closer predator = more alertness
-            alert_input += 1.0 / (1.0 + (pred_dist / cfg.PREDATOR_SENSE_RANGE) ** 2) * 0.5
-        self.chemicals["alertness"] = max(0.0, min(1.0,
-            self.chemicals["alertness"] * 0.9 + alert_input * 0.3
+            alert_input += pred_fear * 0.5
+        c[ALERTNESS] = max(0.0, min(1.0,
+            c[ALERTNESS] * 0.9 + alert_input * 0.3
         ))
         # alertness suppresses satiation — continuous, no threshold
         # the more alert, the more satiation is suppressed
-        self.chemicals["satiation"] *= (1.0 - self.chemicals["alertness"] * 0.25)
+        c[SATIATION] *= (1.0 - c[ALERTNESS] * 0.25)
 
         # ── comfort — continuous product of familiarity × satedness × safety
-        familiarity = 1.0 if (self.x, self.y) in self.visited else 0.0
-        satedness = 1.0 - self.chemicals["hunger"]
-        safety = 1.0 - self.chemicals["fear"]
+        familiarity = 1.0 if self.visited[self.y, self.x] else 0.0
+        satedness = 1.0 - c[HUNGER]
+        safety = 1.0 - c[FEAR]
         comfort_input = familiarity * satedness * safety
-        self.chemicals["comfort"] = max(0.0, min(1.0,
-            self.chemicals["comfort"] * 0.97 + comfort_input * 0.03
+        c[COMFORT] = max(0.0, min(1.0,
+            c[COMFORT] * 0.97 + comfort_input * 0.03
         ))
         # comfort suppresses fear
-        self.chemicals["fear"] = max(
+        c[FEAR] = max(
             0.0,
-            self.chemicals["fear"] - self.chemicals["comfort"] * 0.3,
+            c[FEAR] - c[COMFORT] * 0.3,
         )
 
         # ── urgency — hunger × fear, rises when both are high ────────
-        urgency_input = self.chemicals["hunger"] * self.chemicals["fear"]
-        self.chemicals["urgency"] = min(
-            1.0, self.chemicals["urgency"] * 0.95 + urgency_input * 1.5
+        urgency_input = c[HUNGER] * c[FEAR]
+        c[URGENCY] = min(
+            1.0, c[URGENCY] * 0.95 + urgency_input * 1.5
         )
 
         # ── memory_consolidation — fatigue × satedness, continuous ────
         consolidation_input = (
-            self.chemicals["fatigue"] * (1.0 - self.chemicals["hunger"])
+            c[FATIGUE] * (1.0 - c[HUNGER])
         )
-        self.chemicals["memory_consolidation"] = min(
+        c[MEMORY_CONSOLIDATION] = min(
             1.0,
-            self.chemicals["memory_consolidation"] * 0.97
+            c[MEMORY_CONSOLIDATION] * 0.97
             + consolidation_input * 0.04,
         )
 
         # ── social — continuous proximity × hunger compatibility ─────
-        if other_agent.alive:
-            other_dist = math.hypot(
-                self.x - other_agent.x, self.y - other_agent.y
-            )
-            proximity_social = 1.0 / (1.0 + other_dist ** 2 / 50.0)
+        if near:
+            proximity_social = lut.social(odx, ody)
             hunger_compat = (
-                (1.0 - self.chemicals["hunger"])
-                * (1.0 - other_agent.chemicals.get("hunger", 0))
+                (1.0 - c[HUNGER])
+                * (1.0 - float(other_agent.chem[HUNGER]))
             )
             # positive when both satiated, negative when either hungry
             social_input = proximity_social * (hunger_compat * 2.0 - 1.0)
-            self.chemicals["social"] = max(-1.0, min(1.0,
-                self.chemicals["social"] * 0.99 + social_input * 0.03
+            c[SOCIAL] = max(-1.0, min(1.0,
+                c[SOCIAL] * 0.99 + social_input * 0.03
             ))
 
         # ── stress — continuous inverse of energy, accumulates ────────
         energy_pressure = max(0.0, 1.0 - self.energy / 50.0)
-        self.chemicals["stress"] = max(0.0, min(1.0,
-            self.chemicals["stress"] * 0.999 + energy_pressure * 0.01
+        c[STRESS] = max(0.0, min(1.0,
+            c[STRESS] * 0.999 + energy_pressure * 0.01
         ))
 
+        self.chem[:] = c
+
+    def path_density(self, x: int, y: int) -> float:
+        """Territory density of our pathways as seen from (x, y)."""
+        return float(territory_density(
+            self.pathways[None], [0], [x], [y],
+            self.config.PATHWAY_TERRITORY_RADIUS,
+        )[0])
+
+    @property
+    def pathway_count(self) -> int:
+        """Number of cells holding pathway memory."""
+        return int(np.count_nonzero(self.pathways))
+
     # ── movement decision ────────────────────────────────────────────────
-    def decide_move(self, world, other_agent: "Agent",
+    def decide_move(self, world, other_agent: "Agent | None",
                     predator=None) -> tuple[int, int]:
         """Score neighbouring cells via chemical weights. Return (nx, ny)."""
         best_score = -999.0
         best_cell = (self.x, self.y)
+        c = self.chem.tolist()
+        lut = falloff.tables(self.config)
 
-        hunger_w = self.chemicals["hunger"] * cfg.HUNGER_WEIGHT_MULTIPLIER
-        fear_w = self.chemicals["fear"] * cfg.FEAR_WEIGHT_MULTIPLIER
-        curiosity_w = (self.chemicals["curiosity"]
-                       * cfg.CURIOSITY_WEIGHT_MULTIPLIER)
+        hunger_w = c[HUNGER] * self.config.HUNGER_WEIGHT_MULTIPLIER
+        fear_w = c[FEAR] * self.config.FEAR_WEIGHT_MULTIPLIER
+        curiosity_w = (c[CURIOSITY]
+                       * self.config.CURIOSITY_WEIGHT_MULTIPLIER)
 
         # stress makes responses erratic
-        stress_noise = self.chemicals["stress"] * 0.15
+        stress_noise = c[STRESS] * 0.15
 
         # urgency continuously amplifies hunger, suppresses fear
-        hunger_w *= (1.0 + self.chemicals["urgency"])
-        fear_w *= (1.0 - self.chemicals["urgency"] * 0.7)
+        hunger_w *= (1.0 + c[URGENCY])
+        fear_w *= (1.0 - c[URGENCY] * 0.7)
 
         # fatigue continuously suppresses curiosity
-        curiosity_w *= (1.0 - self.chemicals["fatigue"] * 0.7)
+        curiosity_w *= (1.0 - c[FATIGUE] * 0.7)
 
         # alertness sharpens effective vision — continuous
-        effective_vision = cfg.VISION_RANGE + self.chemicals["alertness"]
+        effective_vision = self.config.VISION_RANGE + c[ALERTNESS]
 
-        neighbours = [
-            (self.x + dx, self.y + dy)
-            for dx in (-1, 0, 1)
-            for dy in (-1, 0, 1)
-            if not (dx == 0 and dy == 0)
-        ]
+        # 3×3 window of every layer around us; off-grid cells are skipped
+        window = world.window_values(self.x, self.y)
+        scent_w = window[LAYER_SCENT].tolist()
+        food_mark_w = window[LAYER_FOOD_MARKERS].tolist()
+        alarm_mark_w = window[LAYER_ALARM_MARKERS].tolist()
+        inside_w = world.window_inside(self.x, self.y).tolist()
 
-        for nx, ny in neighbours:
-            if nx < 0 or ny < 0 or nx >= cfg.GRID_SIZE or ny >= cfg.GRID_SIZE:
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            if not inside_w[dy + 1][dx + 1]:
                 continue
+            nx, ny = self.x + dx, self.y + dy
 
             # food scent pull
-            scent = world.get_scent(nx, ny)
+            scent = scent_w[dy + 1][dx + 1]
             score = scent * hunger_w
 
             # food marker attraction
-            food_mark = world.get_food_marker(nx, ny)
-            score += food_mark * cfg.FOOD_MARKER_WEIGHT * self.chemicals["hunger"]
+            food_mark = food_mark_w[dy + 1][dx + 1]
+            score += food_mark * self.config.FOOD_MARKER_WEIGHT * c[HUNGER]
 
             # alarm marker repulsion
-            alarm_mark = world.get_alarm_marker(nx, ny)
-            score -= alarm_mark * cfg.ALARM_MARKER_WEIGHT * self.chemicals["fear"]
+            alarm_mark = alarm_mark_w[dy + 1][dx + 1]
+            score -= alarm_mark * self.config.ALARM_MARKER_WEIGHT * c[FEAR]
 
             # other-agent repulsion
-            if other_agent.alive:
-                d = math.hypot(nx - other_agent.x, ny - other_agent.y)
-                proximity = 1.0 / (d + 1.0)
+            if other_agent is not None and other_agent.alive:
+                proximity = lut.repulsion(nx - other_agent.x,
+                                          ny - other_agent.y)
                 score -= proximity * fear_w
                 # social modulation — continuous, positive social reduces repulsion
-                score += proximity * max(0.0, self.chemicals["social"]) * 0.3
+                score += proximity * max(0.0, c[SOCIAL]) * 0.3
 
-            # predator repulsion
+            # predator repulsion, zero beyond PREDATOR_SENSE_RANGE
             if predator is not None and predator.alive:
-                pd = math.hypot(nx - predator.x, ny - predator.y)
-                if pd < cfg.PREDATOR_SENSE_RANGE:
-                    pred_prox = 1.0 / (pd + 0.5)
-                    score -= pred_prox * fear_w * 2.0
+                pred_prox = lut.predator_repulsion(nx - predator.x,
+                                                   ny - predator.y)
+                score -= pred_prox * fear_w * 2.0
 
             # unexplored bonus
-            if (nx, ny) not in self.visited:
+            known = self.visited[ny, nx]
+            if not known:
                 score += curiosity_w
 
             # pathway memory bonus
-            pw = self.pathways.get((nx, ny), 0.0)
-            score += pw * cfg.PATHWAY_WEIGHT
+            pw = float(self.pathways[ny, nx])
+            score += pw * self.config.PATHWAY_WEIGHT
 
             # comfort bonus for known zones — continuous
-            if (nx, ny) in self.visited:
-                score += self.chemicals["comfort"] * 0.1
+            if known:
+                score += c[COMFORT] * 0.1
 
             # random noise (stress amplifies)
-            noise_range = cfg.RANDOM_NOISE_RANGE + stress_noise
-            score += random.uniform(-noise_range, noise_range)
+            noise_range = self.config.RANDOM_NOISE_RANGE + stress_noise
+            score += self.rng.uniform(-noise_range, noise_range)
 
             if score > best_score:
                 best_score = score
@@ -309,7 +429,7 @@ class Agent:
         return best_cell
 
     # ── tick ─────────────────────────────────────────────────────────────
-    def update(self, world, other_agent: "Agent",
+    def update(self, world, other_agent: "Agent | None",
                predator=None) -> dict:
         """Run one tick: chemicals → decide → move → eat → pathways.
         Returns dict of events for the renderer/logger.
@@ -317,31 +437,41 @@ class Agent:
         if not self.alive:
             return {"alive": False}
 
-        self.total_ticks += 1
-        events: dict = {"ate": False, "moved": False, "died": False}
-
         # 1. update chemicals
         self.update_chemicals(other_agent, predator)
 
         # 2. decide
         nx, ny = self.decide_move(world, other_agent, predator)
+        return self.act(world, nx, ny)
+
+    def act(self, world, nx: int, ny: int) -> dict:
+        """Carry out a decided move: move → eat → markers → pathways.
+        Returns dict of events for the renderer/logger.
+        """
+        if not self.alive:
+            return {"alive": False}
+
+        self.total_ticks += 1
+        events: dict = {"ate": False, "moved": False, "died": False}
         moved = (nx, ny) != (self.x, self.y)
+        c = self.chem
+        config = self.config
 
         # 3. energy cost (seasonal modifier)
-        drain_mod = cfg.SEASON_DRAIN_MODIFIER.get(world.get_season(), 1.0)
+        drain_mod = config.SEASON_DRAIN_MODIFIER.get(world.get_season(), 1.0)
 
         # fatigue scales movement cost continuously — no binary switch
-        fatigue_mult = 1.0 + self.chemicals["fatigue"]
+        fatigue_mult = 1.0 + float(c[FATIGUE])
 
-        self.energy -= cfg.ENERGY_PASSIVE_DRAIN * drain_mod
+        self.energy -= config.ENERGY_PASSIVE_DRAIN * drain_mod
         if moved:
-            self.energy -= cfg.ENERGY_MOVE_DRAIN * drain_mod * fatigue_mult
+            self.energy -= config.ENERGY_MOVE_DRAIN * drain_mod * fatigue_mult
             self.x, self.y = nx, ny
             events["moved"] = True
 
             # fatigue rises with movement
-            self.chemicals["fatigue"] = min(
-                1.0, self.chemicals["fatigue"] + 0.01
+            c[FATIGUE] = min(
+                1.0, c[FATIGUE] + 0.01
             )
             self._stationary_ticks = 0
 
@@ -352,30 +482,30 @@ class Agent:
         else:
             # fatigue decays when stationary
             self._stationary_ticks += 1
-            self.chemicals["fatigue"] = max(
-                0.0, self.chemicals["fatigue"] - 0.02
+            c[FATIGUE] = max(
+                0.0, c[FATIGUE] - 0.02
             )
 
         # 4. eat
         gained = world.eat_food(self.x, self.y)
         if gained > 0:
-            self.energy = min(cfg.ENERGY_MAX, self.energy + gained)
-            self.chemicals["satiation"] = min(
-                1.0, self.chemicals["satiation"] + 0.5
+            self.energy = min(config.ENERGY_MAX, self.energy + gained)
+            c[SATIATION] = min(
+                1.0, c[SATIATION] + 0.5
             )
             self.food_eaten += 1
             events["ate"] = True
             # reinforce pathway — consolidation amplifies continuously
-            consolidation_mult = 1.0 + self.chemicals["memory_consolidation"]
+            consolidation_mult = 1.0 + float(c[MEMORY_CONSOLIDATION])
             self._reinforce_pathways(consolidation_mult)
             # leave food marker
             world.leave_food_marker(self.x, self.y, strength=0.8)
 
         # leave alarm marker proportional to fear — continuous
-        if self.chemicals["fear"] > 0.01:
+        if c[FEAR] > 0.01:
             world.leave_alarm_marker(
                 self.x, self.y,
-                strength=self.chemicals["fear"] ** 2,
+                strength=float(c[FEAR]) ** 2,
             )
 
         # 6. weaken pathway for current cell if no food gained
@@ -384,7 +514,7 @@ class Agent:
 
         # 7. record move history
         self._move_history.append((self.x, self.y))
-        if len(self._move_history) > cfg.PATHWAY_LOOKBACK:
+        if len(self._move_history) > self.config.PATHWAY_LOOKBACK:
             self._move_history.pop(0)
 
         # 8. death check
@@ -398,40 +528,40 @@ class Agent:
     # ── pathway helpers ──────────────────────────────────────────────────
     def _reinforce_pathways(self, multiplier: float = 1.0):
         """Strengthen cells visited in the last PATHWAY_LOOKBACK ticks."""
-        for pos in self._move_history:
-            self.pathways[pos] = min(
-                1.0,
-                self.pathways.get(pos, 0.0)
-                + cfg.PATHWAY_REINFORCE * multiplier,
-            )
+        if not self._move_history:
+            return
+        xs, ys = zip(*self._move_history)
+        # a cell visited twice is reinforced twice
+        np.add.at(self.pathways, (list(ys), list(xs)),
+                  self.config.PATHWAY_REINFORCE * multiplier)
+        np.minimum(self.pathways, 1.0, out=self.pathways)
 
     def _weaken_recent_path(self):
         """Slightly weaken the most recent cell if no food was found."""
         if self._move_history:
-            pos = self._move_history[-1]
-            pw = self.pathways.get(pos, 0.0) - cfg.PATHWAY_WEAKEN
-            if pw < cfg.PATHWAY_PRUNE_THRESHOLD:
-                self.pathways.pop(pos, None)
-            else:
-                self.pathways[pos] = pw
+            x, y = self._move_history[-1]
+            pw = self.pathways[y, x] - self.config.PATHWAY_WEAKEN
+            self.pathways[y, x] = (
+                0.0 if pw < self.config.PATHWAY_PRUNE_THRESHOLD else pw
+            )
 
     # ── generations (Phase 4) ────────────────────────────────────────────
     def produce_offspring(self, x: int, y: int) -> "Agent":
         """Create offspring inheriting strongest pathways."""
-        child = Agent(self.id, x, y, self.color_name)
+        child = Agent(self.id, x, y, self.color_name, self.config, self.rng)
         child.generation = self.generation + 1
         child.parent_food_eaten = self.food_eaten
 
         # inherit top 50% of pathways by strength
-        if self.pathways:
-            sorted_paths = sorted(
-                self.pathways.items(),
-                key=lambda item: item[1],
-                reverse=True,
+        flat = self.pathways.ravel()
+        cells = np.flatnonzero(flat)
+        if cells.size:
+            inherit_count = max(1, cells.size // 2)
+            top = np.argpartition(flat[cells], cells.size - inherit_count)
+            cells = cells[top[cells.size - inherit_count:]]
+            child.pathways.ravel()[cells] = (
+                flat[cells] * self.config.INHERITANCE_STRENGTH
             )
-            inherit_count = max(1, len(sorted_paths) // 2)
-            for pos, strength in sorted_paths[:inherit_count]:
-                child.pathways[pos] = strength * cfg.INHERITANCE_STRENGTH
 
         return child
 
@@ -440,13 +570,11 @@ class Agent:
         """Reset agent for a new life, keeping pathway memory."""
         self.x = x
         self.y = y
-        self.energy = cfg.ENERGY_START
+        self.energy = self.config.ENERGY_START
         self.alive = True
-        self.chemicals = {k: 0.0 for k in self.chemicals}
-        self.chemicals["curiosity"] = 0.5
-        self.chemicals["alertness"] = 0.5
+        self.chem[:] = CHEMICAL_START
         self.trail.clear()
         self._move_history.clear()
-        self.visited.clear()
-        self.visited.add((x, y))
+        self.visited[...] = False
+        self.visited[y, x] = True
         self._stationary_ticks = 0
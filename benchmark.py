@@ -0,0 +1,225 @@
+"""
+GENESIS — Benchmarks
+Micro-benchmarks for the hot paths of the simulation engine.
+
+    python benchmark.py diffusion sampling precision chemistry moves predators
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import config as cfg
+from world import World
+
+
+def _best_of(fn, repeat: int, number: int) -> float:
+    """Best mean seconds per call over `repeat` batches of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+# ── scent diffusion ──────────────────────────────────────────────────────
+def _diffuse_reference(food: np.ndarray, diffusion: float) -> np.ndarray:
+    """The original allocating diffusion: pad, copy per pass, clip."""
+    scent = food.copy()
+    padded = np.pad(scent, 1, mode="constant", constant_values=0)
+    for _ in range(3):
+        new = padded.copy()
+        new[1:-1, 1:-1] = (
+            padded[1:-1, 1:-1] * (1.0 - diffusion)
+            + (padded[:-2, 1:-1] + padded[2:, 1:-1]
+               + padded[1:-1, :-2] + padded[1:-1, 2:])
+            * (diffusion / 4.0)
+        )
+        padded = new
+    scent = padded[1:-1, 1:-1]
+    scent *= (1.0 - cfg.SCENT_DECAY)
+    return np.clip(scent, 0.0, 1.0)
+
+
+def bench_diffusion(sizes=(60, 512, 2048)):
+    print(f"{'grid':>10} {'reference':>12} {'in-place':>12} {'speed-up':>9}"
+          f" {'identical':>10}")
+    for size in sizes:
+        world = World(size=size)
+        diffusion = cfg.SEASON_SCENT_DIFFUSION[world.get_season()]
+        number = max(1, 2_000_000 // (size * size))
+
+        ref = _diffuse_reference(world.food, diffusion)
+        world._diffuse_scent()
+        identical = np.array_equal(ref, world.scent)
+
+        t_ref = _best_of(lambda: _diffuse_reference(world.food, diffusion),
+                         repeat=3, number=number)
+        t_new = _best_of(world._diffuse_scent, repeat=3, number=number)
+        print(f"{size:>5}x{size:<4} {t_ref * 1e3:>10.3f}ms "
+              f"{t_new * 1e3:>10.3f}ms {t_ref / t_new:>8.2f}x "
+              f"{str(identical):>10}")
+
+
+# ── food event sampling ──────────────────────────────────────────────────
+def bench_sampling(sizes=(512, 2048, 4096)):
+    rate = cfg.SEASON_FOOD_REGEN["Spring"]
+    print(f"{'grid':>10} {'dense':>12} {'sparse':>12} {'speed-up':>9}"
+          f" {'hits/expected':>14}")
+    for size in sizes:
+        # _sample_cells only needs the grid size and the mode flag
+        dense = SimpleNamespace(size=size, sparse_sampling=False)
+        sparse = SimpleNamespace(size=size, sparse_sampling=True)
+        number = max(1, 4_000_000 // (size * size))
+
+        hits = np.mean([World._sample_cells(sparse, rate)[0].size
+                        for _ in range(20)])
+        t_dense = _best_of(lambda: World._sample_cells(dense, rate),
+                           repeat=3, number=number)
+        t_sparse = _best_of(lambda: World._sample_cells(sparse, rate),
+                            repeat=3, number=number)
+        print(f"{size:>5}x{size:<4} {t_dense * 1e3:>10.3f}ms "
+              f"{t_sparse * 1e3:>10.3f}ms {t_dense / t_sparse:>8.1f}x "
+              f"{hits / (rate * size * size):>14.3f}")
+
+
+# ── world layer precision ────────────────────────────────────────────────
+def bench_precision(sizes=(512, 2048), ticks=20):
+    """Memory and World.update throughput per WORLD_PRECISION."""
+    from world import PRECISIONS
+    print(f"{'grid':>10} {'precision':>10} {'memory':>10} {'ticks/s':>9}"
+          f" {'vs float64':>11}")
+    for size in sizes:
+        baseline = None
+        for precision in PRECISIONS:
+            world = World(size=size, precision=precision,
+                          rng=np.random.default_rng(0))
+            world.update()
+            seconds = _best_of(world.update, repeat=3, number=ticks)
+            rate = 1.0 / seconds
+            baseline = baseline or rate
+            print(f"{size:>5}x{size:<4} {precision:>10} "
+                  f"{world.memory_bytes() / 2**20:>8.1f}MB {rate:>9.1f}"
+                  f" {rate / baseline:>10.2f}x")
+
+
+# ── agent chemistry ──────────────────────────────────────────────────────
+def bench_chemistry(sizes=(2, 100, 1000)):
+    """Agent.update_chemicals loop vs AgentPopulation.update_chemicals."""
+    from agent import Agent
+    from population import AgentPopulation
+    from predator import Predator
+
+    print(f"{'agents':>7} {'scalar':>12} {'vectorized':>12} {'speed-up':>9}")
+    predator = Predator(cfg.PREDATOR_START_X, cfg.PREDATOR_START_Y)
+    for n in sizes:
+        xy = np.random.randint(0, cfg.GRID_SIZE, (n, 2))
+        agents = [Agent(i, int(x), int(y), "blue") for i, (x, y) in enumerate(xy)]
+        population = AgentPopulation(agents)
+        partners = population.nearest_partners()
+        others = [agents[j] for j in partners]
+
+        def scalar():
+            for agent, other in zip(agents, others):
+                agent.update_chemicals(other, predator)
+
+        number = max(1, 2000 // n)
+        t_scalar = _best_of(scalar, repeat=3, number=number)
+        t_vector = _best_of(
+            lambda: population.update_chemicals(partners, predator),
+            repeat=3, number=number,
+        )
+        print(f"{n:>7} {t_scalar * 1e3:>10.3f}ms {t_vector * 1e3:>10.3f}ms "
+              f"{t_scalar / t_vector:>8.1f}x")
+
+
+# ── move scoring ─────────────────────────────────────────────────────────
+def bench_moves(sizes=(2, 100, 1000)):
+    """Agent.decide_move loop vs AgentPopulation.decide_moves."""
+    from predator import Predator
+    from simulation import Simulation
+
+    print(f"{'agents':>7} {'scalar':>12} {'batched':>12} {'speed-up':>9}")
+    for n in sizes:
+        sim = Simulation(log_dir=None, seed=0, n_agents=n)
+        sim.run(50)
+        population = sim.population
+        population.gather()
+        partners = population.nearest_partners()
+        agents = population.agents
+        others = [agents[j] if j >= 0 else None for j in partners]
+        pack = sim.predators
+        predator = Predator(int(pack.x[0]), int(pack.y[0]))
+
+        def scalar():
+            for agent, other in zip(agents, others):
+                agent.decide_move(sim.world, other, predator)
+
+        number = max(1, 2000 // n)
+        t_scalar = _best_of(scalar, repeat=3, number=number)
+        t_batch = _best_of(
+            lambda: population.decide_moves(sim.world, partners, pack),
+            repeat=3, number=number,
+        )
+        print(f"{n:>7} {t_scalar * 1e3:>10.3f}ms {t_batch * 1e3:>10.3f}ms "
+              f"{t_scalar / t_batch:>8.1f}x")
+
+
+# ── predators ────────────────────────────────────────────────────────────
+def bench_predators(sizes=((1, 2), (10, 1000), (100, 10000))):
+    """K Predator.update calls vs one PredatorPack.update."""
+    from agent import Agent
+    from predator import Predator, PredatorPack
+
+    print(f"{'pack':>5} {'agents':>7} {'scalar':>12} {'pack':>12} "
+          f"{'speed-up':>9}")
+    for k, n in sizes:
+        xy = np.random.randint(0, cfg.GRID_SIZE, (n, 2))
+        agents = [Agent(i, int(x), int(y), "blue")
+                  for i, (x, y) in enumerate(xy)]
+        start = np.random.randint(0, cfg.GRID_SIZE, (k, 2))
+        # tick 0 moves; predators walk a little between repeats
+        predators = [Predator(int(x), int(y)) for x, y in start]
+        pack = PredatorPack(start[:, 0], start[:, 1])
+
+        def scalar():
+            for predator in predators:
+                predator.update(agents, 0)
+
+        number = max(1, 200 // k)
+        t_scalar = _best_of(scalar, repeat=3, number=number)
+        t_pack = _best_of(lambda: pack.update(agents, 0), repeat=3,
+                          number=number)
+        print(f"{k:>5} {n:>7} {t_scalar * 1e3:>10.3f}ms "
+              f"{t_pack * 1e3:>10.3f}ms {t_scalar / t_pack:>8.1f}x")
+
+
+BENCHMARKS = {
+    "diffusion": bench_diffusion,
+    "sampling": bench_sampling,
+    "precision": bench_precision,
+    "chemistry": bench_chemistry,
+    "moves": bench_moves,
+    "predators": bench_predators,
+}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="GENESIS benchmarks")
+    parser.add_argument("names", nargs="*", metavar="NAME",
+                        help=f"one of {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    np.random.seed(0)
+    for name in args.names or BENCHMARKS:
+        print(f"[GENESIS] benchmark: {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
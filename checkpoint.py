@@ -0,0 +1,211 @@
+"""
+GENESIS — Checkpoints
+Save a running Simulation to one uncompressed .npz file and restore it,
+bit for bit, to resume the run or fork variants from the saved tick.
+
+    save_checkpoint(sim, "data/tick_50000.npz")
+    sim = load_checkpoint("data/tick_50000.npz")              # resume
+    fork = load_checkpoint("data/tick_50000.npz", seed=3,
+                           config=sim.config.replace(PREDATOR_DAMAGE=20))
+
+A checkpoint holds the world layers, every agent's state (chemicals,
+pathways, visited cells, move history, trail, generation), the predators,
+the explored map, the simulation's RNG state and the config the run
+used. Other simulations in the process are not touched.
+"""
+
+import dataclasses
+import json
+from collections.abc import Mapping
+
+import numpy as np
+import config as cfg
+from simulation import Simulation
+
+# bumped whenever the stored arrays change meaning
+FORMAT_VERSION = 2
+
+
+# ── packing helpers ──────────────────────────────────────────────────────
+def _pack_points(lists) -> tuple[np.ndarray, np.ndarray]:
+    """Ragged lists of (x, y) as one (total, 2) array plus lengths."""
+    lengths = np.array([len(points) for points in lists], dtype=np.int64)
+    points = [p for points in lists for p in points]
+    flat = np.array(points, dtype=np.int64).reshape(-1, 2)
+    return flat, lengths
+
+
+def _unpack_points(flat: np.ndarray, lengths: np.ndarray) -> list[list]:
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    pairs = [tuple(p) for p in flat.tolist()]
+    return [pairs[a:b] for a, b in zip(bounds[:-1].tolist(),
+                                        bounds[1:].tolist())]
+
+
+def config_to_json(config: cfg.SimConfig) -> str:
+    """A SimConfig as JSON, mappings as plain objects."""
+    values = {}
+    for field in dataclasses.fields(config):
+        value = getattr(config, field.name)
+        values[field.name] = (dict(value) if isinstance(value, Mapping)
+                              else value)
+    return json.dumps(values)
+
+
+def config_from_json(text: str) -> cfg.SimConfig:
+    """The SimConfig written by config_to_json."""
+    def tuples(value):
+        # JSON turns tuples into lists; config values never hold lists
+        if isinstance(value, list):
+            return tuple(tuples(v) for v in value)
+        if isinstance(value, dict):
+            return {k: tuples(v) for k, v in value.items()}
+        return value
+    return cfg.SimConfig(**{name: tuples(value)
+                            for name, value in json.loads(text).items()})
+
+
+# ── save ─────────────────────────────────────────────────────────────────
+def save_checkpoint(sim: Simulation, path: str, compress: bool = False):
+    """Write the simulation's full state between ticks to `path` (.npz).
+
+    Uncompressed by default so loading is a straight read; `compress`
+    trades load time for a smaller file.
+    """
+    world = sim.world
+    agents = sim.agents
+    predators = sim.predators
+    interior = (slice(None), *world._interior)
+    history, history_len = _pack_points([a._move_history for a in agents])
+    trail, trail_len = _pack_points([a.trail for a in agents])
+    pred_trail, pred_trail_len = _pack_points(predators.trails)
+
+    arrays = {
+        "format": np.array(FORMAT_VERSION),
+        "config": np.array(config_to_json(sim.config)),
+        "tick": np.array(sim.tick),
+        "last_season": np.array(sim.last_season),
+        # world
+        "layers": world.layers[interior],
+        "marker_ticks": world.marker_ticks[interior],
+        "world_tick": np.array(world.tick_count),
+        "season_index": np.array(world.season_index),
+        # agents
+        "agent_id": np.array([a.id for a in agents], dtype=np.int64),
+        "color": np.array([a.color_name for a in agents]),
+        "x": np.array([a.x for a in agents], dtype=np.int64),
+        "y": np.array([a.y for a in agents], dtype=np.int64),
+        "energy": np.array([a.energy for a in agents], dtype=np.float64),
+        "alive": np.array([a.alive for a in agents], dtype=bool),
+        "chem": np.array([a.chem for a in agents], dtype=np.float64),
+        "pathways": np.array([a.pathways for a in agents], dtype=np.float32),
+        "visited": np.array([a.visited for a in agents], dtype=bool),
+        "explored": sim.population.explored,
+        "history": history, "history_len": history_len,
+        "trail": trail, "trail_len": trail_len,
+        "food_eaten": np.array([a.food_eaten for a in agents], dtype=np.int64),
+        "total_ticks": np.array([a.total_ticks for a in agents],
+                                dtype=np.int64),
+        "generation": np.array([a.generation for a in agents],
+                               dtype=np.int64),
+        "parent_food_eaten": np.array([a.parent_food_eaten for a in agents],
+                                      dtype=np.int64),
+        "stationary_ticks": np.array([a._stationary_ticks for a in agents],
+                                     dtype=np.int64),
+        # predators
+        "predator_x": predators.x, "predator_y": predators.y,
+        "predator_alive": predators.alive,
+        "predator_trail": pred_trail, "predator_trail_len": pred_trail_len,
+        # RNG stream; its 128-bit integers go through JSON
+        "rng": np.array(json.dumps(sim.rng.bit_generator.state)),
+    }
+    (np.savez_compressed if compress else np.savez)(path, **arrays)
+
+
+# ── load ─────────────────────────────────────────────────────────────────
+def read_config(path: str) -> cfg.SimConfig:
+    """Config the checkpointed run used (e.g. to derive a variant)."""
+    with np.load(path) as data:
+        return config_from_json(str(data["config"]))
+
+
+def load_checkpoint(path: str, config: cfg.SimConfig | None = None,
+                    seed: int | None = None,
+                    log_dir: str | None = None) -> Simulation:
+    """Simulation restored from a save_checkpoint file.
+
+    With no arguments the run continues exactly as if it was never
+    stopped. `config` replaces the saved config for the rest of the run
+    (it must keep GRID_SIZE and WORLD_PRECISION) and `seed` reseeds the
+    simulation's RNG, so many variants can be forked from one saved
+    tick. Logging starts a new file in `log_dir` when given.
+    """
+    with np.load(path) as npz:
+        data = dict(npz)
+    if int(data["format"]) != FORMAT_VERSION:
+        raise ValueError(f"{path}: checkpoint format {int(data['format'])}, "
+                         f"expected {FORMAT_VERSION}")
+    saved = config_from_json(str(data["config"]))
+    config = saved if config is None else config
+    for name in ("GRID_SIZE", "WORLD_PRECISION"):
+        if getattr(config, name) != getattr(saved, name):
+            raise ValueError(f"{path}: saved with {name}="
+                             f"{getattr(saved, name)!r}, cannot load with "
+                             f"{getattr(config, name)!r}")
+
+    sim = Simulation(log_dir=log_dir, seed=None, n_agents=data["x"].size,
+                     n_predators=data["predator_x"].size, config=config)
+    sim.seed = seed
+    _restore_world(sim.world, data)
+    _restore_agents(sim, data)
+    predators = sim.predators
+    predators.x[:] = data["predator_x"]
+    predators.y[:] = data["predator_y"]
+    predators.alive[:] = data["predator_alive"]
+    predators.trails = _unpack_points(data["predator_trail"],
+                                      data["predator_trail_len"])
+    sim.geometry.update_predators(*predators.positions())
+    sim._locate_agents()
+    sim.tick = int(data["tick"])
+    sim.last_season = str(data["last_season"])
+
+    # set in place: world, population and agents share this generator
+    sim.rng.bit_generator.state = (
+        json.loads(str(data["rng"])) if seed is None
+        else np.random.default_rng(seed).bit_generator.state
+    )
+    return sim
+
+
+def _restore_world(world, data: dict):
+    world.layers[(slice(None), *world._interior)] = data["layers"]
+    world.marker_ticks[(slice(None), *world._interior)] = data["marker_ticks"]
+    world.tick_count = int(data["world_tick"])
+    world.season_index = int(data["season_index"])
+    world.current_season = world.config.SEASONS[world.season_index]
+    world.invalidate_scent()
+
+
+def _restore_agents(sim: Simulation, data: dict):
+    histories = _unpack_points(data["history"], data["history_len"])
+    trails = _unpack_points(data["trail"], data["trail_len"])
+    population = sim.population
+    for i, agent in enumerate(population.agents):
+        agent.id = int(data["agent_id"][i])
+        agent.color_name = str(data["color"][i])
+        agent.x = int(data["x"][i])
+        agent.y = int(data["y"][i])
+        agent.energy = float(data["energy"][i])
+        agent.alive = bool(data["alive"][i])
+        agent.chem[:] = data["chem"][i]
+        agent.pathways[...] = data["pathways"][i]
+        agent.visited[...] = data["visited"][i]
+        agent._move_history = histories[i]
+        agent.trail = trails[i]
+        agent.food_eaten = int(data["food_eaten"][i])
+        agent.total_ticks = int(data["total_ticks"][i])
+        agent.generation = int(data["generation"][i])
+        agent.parent_food_eaten = int(data["parent_food_eaten"][i])
+        agent._stationary_ticks = int(data["stationary_ticks"][i])
+    population.gather()
+    population.explored[...] = data["explored"]
@@ -3,6 +3,9 @@ GENESIS — Configuration Constants
 All simulation parameters in one place.
 """
 
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+
 # ── World ────────────────────────────────────────────────────────────────
 GRID_SIZE = 60
 CELL_SIZE = 12            # pixels per cell
@@ -10,6 +13,10 @@ FOOD_SPAWN_RATE = 0.15    # 15% of cells start with food
 FOOD_REGEN_RATE = 0.003   # per tick per cell (3x faster regrowth)
 SCENT_DIFFUSION = 0.3     # how far scent spreads
 SCENT_DECAY = 0.05        # scent fades per tick
+SCENT_INCREMENTAL = True  # rediffuse only around changed food cells
+FOOD_EVENT_SAMPLING = "auto"          # "dense", "sparse" or "auto"
+SPARSE_SAMPLING_MIN_CELLS = 256 * 256 # "auto" goes sparse from this grid area
+WORLD_PRECISION = "float64"           # "float64", "float32" or "uint16"
 
 # ── Energy ───────────────────────────────────────────────────────────────
 ENERGY_START = 100.0
@@ -22,6 +29,8 @@ ENERGY_FOOD_GAIN = 30.0       # per food eaten (increased from 20.0)
 SATIATION_DECAY = 0.02        # per tick
 CURIOSITY_GAIN = 0.01         # per tick in known cell
 CURIOSITY_RESET = 0.0         # when entering new cell
+AGGRESSION_PROXIMITY_SCALE = 25.0  # d² at which territory pressure halves
+SOCIAL_PROXIMITY_SCALE = 50.0      # d² at which social pull halves
 
 # ── Movement weights ────────────────────────────────────────────────────
 HUNGER_WEIGHT_MULTIPLIER = 2.0
@@ -35,19 +44,27 @@ PATHWAY_WEAKEN = 0.05
 PATHWAY_WEIGHT = 0.3
 PATHWAY_PRUNE_THRESHOLD = 0.01
 PATHWAY_LOOKBACK = 5          # ticks to check for food reward
+PATHWAY_TERRITORY_RADIUS = 5  # cells around an intruder read as territory
 
 # ── Vision ───────────────────────────────────────────────────────────────
 VISION_RANGE = 4              # cells in each direction (wider scent detection)
 
 # ── Simulation ───────────────────────────────────────────────────────────
+N_AGENTS = 2
 TARGET_FPS = 10
 TICKS_PER_LOG = 100
+LOG_MAX_AGENTS = 8            # agents with their own CSV columns
+LOG_FLUSH_ROWS = 500          # buffered CSV rows written in one batch
+LOG_FLUSH_SECONDS = 5.0       # …or after this long, whichever is first
+LOG_ROTATE_ROWS = 0           # rows per CSV file before a new one (0: never)
+LOG_GRAPH_ROWS = 5000         # rows kept in memory for graphs, thinned evenly
 
 # ── Display ──────────────────────────────────────────────────────────────
 SCREEN_WIDTH = 1100
 SCREEN_HEIGHT = 780
 SIDEBAR_WIDTH = 280
 GRID_PIXEL_SIZE = GRID_SIZE * CELL_SIZE  # 720
+SIDEBAR_MAX_AGENTS = 2        # agents with a stats panel in the sidebar
 
 # ── Seasons ──────────────────────────────────────────────────────────────
 SEASON_LENGTH = 500          # ticks per season
@@ -89,6 +106,8 @@ FOOD_MARKER_DECAY  = 0.005   # fades over ~200 ticks
 ALARM_MARKER_DECAY = 0.01    # fades over ~100 ticks
 FOOD_MARKER_WEIGHT = 1.2
 ALARM_MARKER_WEIGHT = 0.8
+LAZY_MARKERS = True          # decay on read from the last-write tick
+MARKER_COMPACT_INTERVAL = 1000  # ticks between lazy compactions (0 = never)
 
 # ── Predator ─────────────────────────────────────────────────────────────
 PREDATOR_SPEED       = 3     # moves every N ticks
@@ -97,7 +116,154 @@ PREDATOR_SENSE_RANGE = 8
 PREDATOR_FEAR_BOOST  = 0.4
 PREDATOR_START_X     = 30
 PREDATOR_START_Y     = 30
+N_PREDATORS          = 1     # pack size; the first starts at START_X/Y
 
 # ── Generations ──────────────────────────────────────────────────────────
 INHERITANCE_STRENGTH = 0.7
 MAX_GENERATIONS      = 50
+
+
+# ── Injectable config ────────────────────────────────────────────────────
+class FrozenMap(Mapping):
+    """Read-only, hashable copy of a dict, for dict-valued config."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items=()):
+        self._items = dict(items)
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._items.items()))
+
+    def __repr__(self) -> str:
+        return f"FrozenMap({self._items!r})"
+
+
+# SimConfig is an immutable snapshot of every constant above, with the
+# module values as field defaults. Each simulation object reads its own
+# SimConfig, so differently configured runs can share one process:
+#     Simulation(config=SimConfig(GRID_SIZE=40, N_AGENTS=8))
+@dataclass(frozen=True)
+class SimConfig:
+    """Immutable set of simulation parameters; see the constants above."""
+
+    # world
+    GRID_SIZE: int = GRID_SIZE
+    CELL_SIZE: int = CELL_SIZE
+    FOOD_SPAWN_RATE: float = FOOD_SPAWN_RATE
+    FOOD_REGEN_RATE: float = FOOD_REGEN_RATE
+    SCENT_DIFFUSION: float = SCENT_DIFFUSION
+    SCENT_DECAY: float = SCENT_DECAY
+    SCENT_INCREMENTAL: bool = SCENT_INCREMENTAL
+    FOOD_EVENT_SAMPLING: str = FOOD_EVENT_SAMPLING
+    SPARSE_SAMPLING_MIN_CELLS: int = SPARSE_SAMPLING_MIN_CELLS
+    WORLD_PRECISION: str = WORLD_PRECISION
+
+    # energy
+    ENERGY_START: float = ENERGY_START
+    ENERGY_MAX: float = ENERGY_MAX
+    ENERGY_PASSIVE_DRAIN: float = ENERGY_PASSIVE_DRAIN
+    ENERGY_MOVE_DRAIN: float = ENERGY_MOVE_DRAIN
+    ENERGY_FOOD_GAIN: float = ENERGY_FOOD_GAIN
+
+    # chemicals
+    SATIATION_DECAY: float = SATIATION_DECAY
+    CURIOSITY_GAIN: float = CURIOSITY_GAIN
+    CURIOSITY_RESET: float = CURIOSITY_RESET
+    AGGRESSION_PROXIMITY_SCALE: float = AGGRESSION_PROXIMITY_SCALE
+    SOCIAL_PROXIMITY_SCALE: float = SOCIAL_PROXIMITY_SCALE
+
+    # movement weights
+    HUNGER_WEIGHT_MULTIPLIER: float = HUNGER_WEIGHT_MULTIPLIER
+    FEAR_WEIGHT_MULTIPLIER: float = FEAR_WEIGHT_MULTIPLIER
+    CURIOSITY_WEIGHT_MULTIPLIER: float = CURIOSITY_WEIGHT_MULTIPLIER
+    RANDOM_NOISE_RANGE: float = RANDOM_NOISE_RANGE
+
+    # pathway memory
+    PATHWAY_REINFORCE: float = PATHWAY_REINFORCE
+    PATHWAY_WEAKEN: float = PATHWAY_WEAKEN
+    PATHWAY_WEIGHT: float = PATHWAY_WEIGHT
+    PATHWAY_PRUNE_THRESHOLD: float = PATHWAY_PRUNE_THRESHOLD
+    PATHWAY_LOOKBACK: int = PATHWAY_LOOKBACK
+    PATHWAY_TERRITORY_RADIUS: int = PATHWAY_TERRITORY_RADIUS
+
+    # vision
+    VISION_RANGE: int = VISION_RANGE
+
+    # simulation
+    N_AGENTS: int = N_AGENTS
+    TARGET_FPS: int = TARGET_FPS
+    TICKS_PER_LOG: int = TICKS_PER_LOG
+    LOG_MAX_AGENTS: int = LOG_MAX_AGENTS
+    LOG_FLUSH_ROWS: int = LOG_FLUSH_ROWS
+    LOG_FLUSH_SECONDS: float = LOG_FLUSH_SECONDS
+    LOG_ROTATE_ROWS: int = LOG_ROTATE_ROWS
+    LOG_GRAPH_ROWS: int = LOG_GRAPH_ROWS
+
+    # display
+    SCREEN_WIDTH: int = SCREEN_WIDTH
+    SCREEN_HEIGHT: int = SCREEN_HEIGHT
+    SIDEBAR_WIDTH: int = SIDEBAR_WIDTH
+    SIDEBAR_MAX_AGENTS: int = SIDEBAR_MAX_AGENTS
+
+    # seasons
+    SEASON_LENGTH: int = SEASON_LENGTH
+    SEASONS: tuple[str, ...] = tuple(SEASONS)
+    SEASON_FOOD_REGEN: Mapping[str, float] = FrozenMap(SEASON_FOOD_REGEN)
+    SEASON_FOOD_DECAY: Mapping[str, float] = FrozenMap(SEASON_FOOD_DECAY)
+    SEASON_SCENT_DIFFUSION: Mapping[str, float] = FrozenMap(
+        SEASON_SCENT_DIFFUSION)
+    SEASON_DRAIN_MODIFIER: Mapping[str, float] = FrozenMap(
+        SEASON_DRAIN_MODIFIER)
+    SEASON_SKY_COLOR: Mapping[str, tuple[int, int, int]] = FrozenMap(
+        SEASON_SKY_COLOR)
+
+    # communication markers
+    FOOD_MARKER_DECAY: float = FOOD_MARKER_DECAY
+    ALARM_MARKER_DECAY: float = ALARM_MARKER_DECAY
+    FOOD_MARKER_WEIGHT: float = FOOD_MARKER_WEIGHT
+    ALARM_MARKER_WEIGHT: float = ALARM_MARKER_WEIGHT
+    LAZY_MARKERS: bool = LAZY_MARKERS
+    MARKER_COMPACT_INTERVAL: int = MARKER_COMPACT_INTERVAL
+
+    # predator
+    PREDATOR_SPEED: int = PREDATOR_SPEED
+    PREDATOR_DAMAGE: float = PREDATOR_DAMAGE
+    PREDATOR_SENSE_RANGE: int = PREDATOR_SENSE_RANGE
+    PREDATOR_FEAR_BOOST: float = PREDATOR_FEAR_BOOST
+    PREDATOR_START_X: int = PREDATOR_START_X
+    PREDATOR_START_Y: int = PREDATOR_START_Y
+    N_PREDATORS: int = N_PREDATORS
+
+    # generations
+    INHERITANCE_STRENGTH: float = INHERITANCE_STRENGTH
+    MAX_GENERATIONS: int = MAX_GENERATIONS
+
+    def __post_init__(self):
+        # dict- and list-valued overrides become read-only copies too, so
+        # the caller's dict cannot change the config afterwards
+        for name, value in vars(self).items():
+            if isinstance(value, dict):
+                object.__setattr__(self, name, FrozenMap(value))
+            elif isinstance(value, list):
+                object.__setattr__(self, name, tuple(value))
+
+    @property
+    def GRID_PIXEL_SIZE(self) -> int:
+        return self.GRID_SIZE * self.CELL_SIZE
+
+    def replace(self, **changes) -> "SimConfig":
+        """Copy with some fields changed."""
+        return replace(self, **changes)
+
+
+DEFAULT = SimConfig()
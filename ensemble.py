@@ -0,0 +1,595 @@
+"""
+GENESIS — Ensemble
+K independent replicas of the simulation advanced in lockstep: world
+layers carry a leading replica axis and agent state is K·N rows, so each
+stage of a tick is one NumPy pass over every replica.
+"""
+
+import numpy as np
+import config as cfg
+from agent import (
+    CHEMICALS, CHEMICAL_START, FEAR, FATIGUE, SATIATION,
+    MEMORY_CONSOLIDATION,
+)
+from population import AgentPopulation
+from simulation import create_predators, spawn_point
+from world import (
+    LAYERS, LAYER_FOOD_MARKERS, LAYER_ALARM_MARKERS, DIFFUSION_PASSES,
+    World, choose_distinct, stencil_pass, stencil_views,
+)
+
+
+# distance² standing in for "no such point"
+_FAR = np.iinfo(np.int64).max
+
+
+class EnsembleWorld:
+    """K worlds in one (K, layers, H, W) float64 tensor with a zero halo.
+
+    Follows World tick for tick, each stage run once for all replicas.
+    Food events are sampled over all K·H·W cells (FOOD_EVENT_SAMPLING
+    "auto" judges that total area) and markers honour LAZY_MARKERS. Scent
+    is rebuilt in full every tick, which is what World's incremental path
+    reproduces bit for bit. Every replica shares the tick count and so the
+    season.
+    """
+
+    def __init__(self, replicas: int, config: cfg.SimConfig | None = None,
+                 rng: np.random.Generator | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.replicas = replicas
+        self.size = self.config.GRID_SIZE
+        self.halo = self.config.VISION_RANGE + 1
+        padded = self.size + 2 * self.halo
+        self.layers = np.zeros((replicas, len(LAYERS), padded, padded))
+        self._interior = (slice(self.halo, self.halo + self.size),) * 2
+        for index, name in enumerate(LAYERS):
+            setattr(self, name, self.layers[(slice(None), index,
+                                             *self._interior)])
+        self.inside = np.zeros((padded, padded), dtype=bool)
+        self.inside[self._interior] = True
+        self._marker_decay = np.array(
+            [1.0 - self.config.FOOD_MARKER_DECAY,
+             1.0 - self.config.ALARM_MARKER_DECAY]
+        )[:, None, None]
+        self.lazy_markers = self.config.LAZY_MARKERS
+        self.marker_ticks = np.zeros((replicas, 2, padded, padded),
+                                     dtype=np.int32)
+
+        shape = (replicas, self.size + 2, self.size + 2)
+        self._diffuse_bufs = [stencil_views(np.zeros(shape))
+                              for _ in range(2)]
+        self._diffuse_tmp = np.zeros((replicas, self.size, self.size))
+
+        mode = self.config.FOOD_EVENT_SAMPLING
+        if mode == "auto":
+            mode = ("sparse" if self.food.size
+                    >= self.config.SPARSE_SAMPLING_MIN_CELLS else "dense")
+        self.sparse_sampling = mode == "sparse"
+
+        self.tick_count = 0
+        self.current_season = "Spring"
+        self.season_index = 0
+
+        # food spawn, replica after replica
+        mask = (self.rng.random(self.food.shape)
+                < self.config.FOOD_SPAWN_RATE)
+        self.food[mask] = self.rng.uniform(0.5, 1.0, size=mask.sum())
+
+    # ── season helpers ───────────────────────────────────────────────────
+    def get_season(self) -> str:
+        return self.current_season
+
+    def get_season_tick(self) -> int:
+        return self.tick_count % self.config.SEASON_LENGTH
+
+    def get_total_food(self) -> np.ndarray:
+        """Sum of all food per replica, shape (K,)."""
+        return self.food.sum(axis=(1, 2))
+
+    # ── per-tick update ──────────────────────────────────────────────────
+    def update(self):
+        """World.update for every replica at once."""
+        config = self.config
+        self.tick_count += 1
+
+        new_index = (self.tick_count // config.SEASON_LENGTH) % 4
+        if new_index != self.season_index:
+            self.season_index = new_index
+            self.current_season = config.SEASONS[self.season_index]
+
+        decay_rate = config.SEASON_FOOD_DECAY[self.current_season]
+        if decay_rate > 0:
+            hit = self._sample_cells(decay_rate)
+            self.food[hit] = self.food[hit] * 0.9
+
+        regen_rate = config.SEASON_FOOD_REGEN[self.current_season]
+        hit = self._sample_cells(regen_rate)
+        self.food[hit] = np.minimum(self.food[hit] + 0.1, 1.0)
+
+        self._diffuse_scent()
+
+        if not self.lazy_markers:
+            markers = self.layers[:, LAYER_FOOD_MARKERS:LAYER_ALARM_MARKERS + 1]
+            np.multiply(markers, self._marker_decay, out=markers)
+            np.clip(markers, 0, 1, out=markers)
+        elif (config.MARKER_COMPACT_INTERVAL and self.tick_count
+              % config.MARKER_COMPACT_INTERVAL == 0):
+            self.compact_markers()
+
+    def _sample_cells(self, rate: float) -> tuple:
+        """(ks, ys, xs) of cells hit by an independent per-cell event of
+        `rate`, drawn as World._sample_cells draws them."""
+        if not self.sparse_sampling:
+            return np.nonzero(self.rng.random(self.food.shape) < rate)
+        n_cells = self.food.size
+        hits = choose_distinct(n_cells, self.rng.binomial(n_cells, rate),
+                                self.rng)
+        return np.unravel_index(hits, self.food.shape)
+
+    def _diffuse_scent(self):
+        """World._diffuse_full over a (K, H, W) stack of food planes."""
+        diffusion = self.config.SEASON_SCENT_DIFFUSION.get(
+            self.current_season, self.config.SCENT_DIFFUSION
+        )
+        keep = 1.0 - diffusion
+        spread = diffusion / 4.0
+        src, dst = self._diffuse_bufs
+        np.copyto(src[0], self.food)
+        for _ in range(DIFFUSION_PASSES):
+            stencil_pass(src, dst[0], self._diffuse_tmp, keep, spread)
+            src, dst = dst, src
+        np.multiply(src[0], 1.0 - self.config.SCENT_DECAY, out=self.scent)
+        np.clip(self.scent, 0.0, 1.0, out=self.scent)
+
+    def compact_markers(self):
+        """Fold pending lazy decay into the stored marker values."""
+        planes = (slice(None), slice(LAYER_FOOD_MARKERS,
+                                     LAYER_ALARM_MARKERS + 1),
+                  *self._interior)
+        ticks = (slice(None), slice(None), *self._interior)
+        self.layers[planes] = self.layers[planes] * self._marker_decay ** (
+            self.tick_count - self.marker_ticks[ticks]
+        )
+        self.marker_ticks[ticks] = self.tick_count
+
+    # ── agent interactions ───────────────────────────────────────────────
+    def values_at(self, ks, xs, ys) -> np.ndarray:
+        """(layers, *xs.shape) values at cells (xs, ys) of replicas `ks`
+        (broadcast against xs), marker decay applied; cells may lie up to
+        `halo` off the grid."""
+        ks = np.broadcast_to(ks, np.shape(xs))
+        pys, pxs = ys + self.halo, xs + self.halo
+        values = np.moveaxis(self.layers[ks, :, pys, pxs], -1, 0)
+        if self.lazy_markers:
+            ages = self.tick_count - np.moveaxis(
+                self.marker_ticks[ks, :, pys, pxs], -1, 0)
+            decay = self._marker_decay.reshape(2, *[1] * (ages.ndim - 1))
+            values[LAYER_FOOD_MARKERS:LAYER_ALARM_MARKERS + 1] *= decay ** ages
+        return values
+
+    def inside_at(self, xs, ys) -> np.ndarray:
+        return self.inside[ys + self.halo, xs + self.halo]
+
+    def rows(self, ks) -> "_ReplicaCells":
+        """World-like reader for agents whose replicas are `ks`."""
+        return _ReplicaCells(self, ks)
+
+    def eat_food(self, ks, xs, ys) -> np.ndarray:
+        """One agent per replica eats at (xs, ys); returns energy gained."""
+        food = self.food[ks, ys, xs]
+        ate = food > 0.05
+        self.food[ks[ate], ys[ate], xs[ate]] = 0
+        return np.where(ate, np.minimum(food, 1.0), 0.0) * (
+            self.config.ENERGY_FOOD_GAIN
+        )
+
+    def leave_marker(self, plane: int, ks, xs, ys, strength):
+        """Add `strength` to one marker cell per replica, capped at 1."""
+        cell = (ks, LAYER_FOOD_MARKERS + plane, ys + self.halo,
+                xs + self.halo)
+        value = self.layers[cell]
+        if self.lazy_markers:
+            # decay with Python's pow, as World._marker_value applies it
+            # (NumPy's power can differ in the last place)
+            tick = (ks, plane, *cell[2:])
+            factor = float(self._marker_decay[plane, 0, 0])
+            ages = (self.tick_count - self.marker_ticks[tick]).tolist()
+            value = value * np.array([factor ** age for age in ages])
+            self.marker_ticks[tick] = self.tick_count
+        self.layers[cell] = np.minimum(1.0, value + strength)
+
+
+class _ReplicaCells:
+    """values_at / inside_at as AgentPopulation.decide_moves reads them,
+    with each row of cells looked up in its agent's replica."""
+
+    __slots__ = ("world", "ks")
+
+    def __init__(self, world: EnsembleWorld, ks: np.ndarray):
+        self.world = world
+        self.ks = ks
+
+    def values_at(self, xs, ys) -> np.ndarray:
+        ks = self.ks.reshape(-1, *[1] * (np.ndim(xs) - 1))
+        return self.world.values_at(ks, xs, ys)
+
+    def inside_at(self, xs, ys) -> np.ndarray:
+        return self.world.inside_at(xs, ys)
+
+
+class EnsembleGeometry:
+    """Geometry for K replicas of N agents and P predators.
+
+    Same attributes as spatial.Geometry over the K·N agent rows, found by
+    pairwise distances inside each replica: (K, N, N) and (K, N, P)
+    arrays, cheap for the small populations ensembles run.
+    """
+
+    def __init__(self, replicas: int, n_agents: int):
+        self.shape = (replicas, n_agents)
+        self.base = (np.arange(replicas) * n_agents)[:, None]
+        self.agents = None          # (xs, ys, alive), each (K, N)
+        self.predators = None       # (xs, ys, alive), each (K, P)
+
+    def update_agents(self, xs, ys, alive):
+        """Agent positions changed: nearest partners and predators."""
+        xs, ys, alive = (np.reshape(a, self.shape) for a in (xs, ys, alive))
+        self.agents = xs, ys, alive
+        n = self.shape[1]
+        dx = xs[:, :, None] - xs[:, None, :]
+        dy = ys[:, :, None] - ys[:, None, :]
+        d2 = np.where(alive[:, None, :], dx * dx + dy * dy, _FAR)
+        d2[:, np.arange(n), np.arange(n)] = _FAR
+        nearest = np.argmin(d2, axis=2)
+        has = np.take_along_axis(d2, nearest[..., None], 2)[..., 0] < _FAR
+        self.partners = np.where(has, nearest + self.base, -1).ravel()
+        pdx = xs - np.take_along_axis(xs, nearest, 1)
+        pdy = ys - np.take_along_axis(ys, nearest, 1)
+        self.partner_dist = np.where(
+            has, np.sqrt(pdx * pdx + pdy * pdy), np.inf
+        ).ravel()
+        self._predator_offsets()
+
+    def update_predators(self, xs, ys, alive):
+        """Predator positions or liveness changed; arrays are (K, P)."""
+        self.predators = xs, ys, alive
+        self._predator_offsets()
+
+    def _predator_offsets(self):
+        if self.agents is None or self.predators is None:
+            return
+        axs, ays, _ = self.agents
+        pxs, pys, palive = self.predators
+        if not pxs.shape[1]:
+            self.predator = np.full(axs.size, -1)
+            self.predator_dx = self.predator_dy = np.zeros(axs.size, int)
+            return
+        dx = axs[:, :, None] - pxs[:, None, :]
+        dy = ays[:, :, None] - pys[:, None, :]
+        d2 = np.where(palive[:, None, :], dx * dx + dy * dy, _FAR)
+        nearest = np.argmin(d2, axis=2)
+        has = np.broadcast_to(palive.any(axis=1)[:, None], self.shape)
+        self.predator = np.where(has, nearest, -1).ravel()
+        self.predator_dx = np.where(
+            has, np.take_along_axis(dx, nearest[..., None], 2)[..., 0], 0
+        ).ravel()
+        self.predator_dy = np.where(
+            has, np.take_along_axis(dy, nearest[..., None], 2)[..., 0], 0
+        ).ravel()
+
+
+class EnsemblePopulation(AgentPopulation):
+    """K·N agents as flat rows, replica-major: row k·N + j is agent j of
+    replica k. Chemistry and move scoring are AgentPopulation's; there
+    are no Agent objects, and `explored` is per replica, (K, H, W)."""
+
+    def __init__(self, replicas: int, n_agents: int,
+                 config: cfg.SimConfig | None = None,
+                 rng: np.random.Generator | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.agents = []
+        self.replicas, self.n_agents = replicas, n_agents
+        rows = replicas * n_agents
+        size = self.config.GRID_SIZE
+        self.replica = np.repeat(np.arange(replicas), n_agents)
+        self.index = np.tile(np.arange(n_agents), replicas)
+        self.x = np.zeros(rows, dtype=np.int64)
+        self.y = np.zeros(rows, dtype=np.int64)
+        self.energy = np.zeros(rows)
+        self.alive = np.zeros(rows, dtype=bool)
+        self.chem = np.zeros((rows, len(CHEMICALS)))
+        self.pathways = np.zeros((rows, size, size), dtype=np.float32)
+        self.visited = np.zeros((rows, size, size), dtype=bool)
+        self.explored = np.zeros((replicas, size, size), dtype=bool)
+        self.generation = np.zeros(rows, dtype=np.int64)
+        self.food_eaten = np.zeros(rows, dtype=np.int64)
+        self.total_ticks = np.zeros(rows, dtype=np.int64)
+
+        # last PATHWAY_LOOKBACK cells per agent, oldest first
+        lookback = self.config.PATHWAY_LOOKBACK
+        self.history_x = np.zeros((rows, lookback), dtype=np.int64)
+        self.history_y = np.zeros((rows, lookback), dtype=np.int64)
+        self.history_len = np.zeros(rows, dtype=np.int64)
+
+        self.spawn(np.arange(rows))
+
+    def __len__(self) -> int:
+        return self.x.size
+
+    def spawn(self, rows: np.ndarray):
+        """Fresh agents in `rows` at their spawn points. Pathways and
+        generation are left to the caller."""
+        size = self.config.GRID_SIZE
+        for r, j in zip(rows.tolist(), self.index[rows].tolist()):
+            self.x[r], self.y[r] = spawn_point(j, size)
+        self.energy[rows] = self.config.ENERGY_START
+        self.alive[rows] = True
+        self.chem[rows] = CHEMICAL_START
+        self.visited[rows] = False
+        self.visited[rows, self.y[rows], self.x[rows]] = True
+        self._explore(rows, self.y[rows], self.x[rows])
+        self.food_eaten[rows] = 0
+        self.total_ticks[rows] = 0
+        self.history_len[rows] = 0
+
+    def coverage(self) -> np.ndarray:
+        """Share of grid cells visited in each replica, shape (K,)."""
+        return self.explored.mean(axis=(1, 2))
+
+    def _explore(self, rows, ys, xs):
+        self.explored[self.replica[rows], ys, xs] = True
+
+    # ── acting ───────────────────────────────────────────────────────────
+    def act(self, world: EnsembleWorld, rows, nx, ny) -> tuple:
+        """Agent.act for one agent of each replica (rows of distinct
+        replicas). Returns (ate, died) bool arrays over `rows`."""
+        config = self.config
+        ks = self.replica[rows]
+        c = self.chem
+        live = self.alive[rows]
+        rows, ks, nx, ny = rows[live], ks[live], nx[live], ny[live]
+        self.total_ticks[rows] += 1
+
+        # energy cost, fatigue
+        drain_mod = config.SEASON_DRAIN_MODIFIER.get(world.get_season(), 1.0)
+        fatigue_mult = 1.0 + c[rows, FATIGUE]
+        moved = (nx != self.x[rows]) | (ny != self.y[rows])
+        energy = self.energy[rows] - config.ENERGY_PASSIVE_DRAIN * drain_mod
+        energy = np.where(
+            moved, energy - config.ENERGY_MOVE_DRAIN * drain_mod
+            * fatigue_mult, energy,
+        )
+        self.x[rows], self.y[rows] = nx, ny
+        c[rows, FATIGUE] = np.where(
+            moved, np.minimum(1.0, c[rows, FATIGUE] + 0.01),
+            np.maximum(0.0, c[rows, FATIGUE] - 0.02),
+        )
+
+        # eat
+        gained = world.eat_food(ks, nx, ny)
+        ate = gained > 0
+        energy = np.where(ate, np.minimum(config.ENERGY_MAX,
+                                          energy + gained), energy)
+        c[rows[ate], SATIATION] = np.minimum(1.0, c[rows[ate], SATIATION]
+                                             + 0.5)
+        self.food_eaten[rows[ate]] += 1
+        self._reinforce_pathways(rows[ate],
+                                 1.0 + c[rows[ate], MEMORY_CONSOLIDATION])
+        world.leave_marker(0, ks[ate], nx[ate], ny[ate], 0.8)
+
+        # alarm marker proportional to fear, squared with Python's pow as
+        # Agent.act squares it (fear * fear can differ in the last place)
+        fear = c[rows, FEAR]
+        afraid = fear > 0.01
+        strength = np.array([f ** 2 for f in fear[afraid].tolist()])
+        world.leave_marker(1, ks[afraid], nx[afraid], ny[afraid], strength)
+
+        self._weaken_recent_path(rows[~ate])
+        self._record_move(rows, nx, ny)
+
+        # death check
+        died = energy <= 0
+        energy[died] = 0
+        self.energy[rows] = energy
+        self.alive[rows[died]] = False
+        return rows[ate], rows[died]
+
+    def _reinforce_pathways(self, rows, multiplier):
+        """Strengthen each agent's remembered cells; repeats count."""
+        held = (np.arange(self.history_x.shape[1])
+                < self.history_len[rows, None])
+        agent, slot = np.nonzero(held)
+        r = rows[agent]
+        ys, xs = self.history_y[r, slot], self.history_x[r, slot]
+        amount = self.config.PATHWAY_REINFORCE * multiplier[agent]
+        np.add.at(self.pathways, (r, ys, xs), amount)
+        self.pathways[r, ys, xs] = np.minimum(self.pathways[r, ys, xs], 1.0)
+
+    def _weaken_recent_path(self, rows):
+        rows = rows[self.history_len[rows] > 0]
+        last = self.history_len[rows] - 1
+        ys, xs = self.history_y[rows, last], self.history_x[rows, last]
+        pw = self.pathways[rows, ys, xs] - self.config.PATHWAY_WEAKEN
+        self.pathways[rows, ys, xs] = np.where(
+            pw < self.config.PATHWAY_PRUNE_THRESHOLD, 0.0, pw
+        )
+
+    def _record_move(self, rows, xs, ys):
+        full = self.history_len[rows] == self.history_x.shape[1]
+        shift = rows[full]
+        self.history_x[shift, :-1] = self.history_x[shift, 1:]
+        self.history_y[shift, :-1] = self.history_y[shift, 1:]
+        slot = np.where(full, self.history_len[rows] - 1,
+                        self.history_len[rows])
+        self.history_x[rows, slot] = xs
+        self.history_y[rows, slot] = ys
+        self.history_len[rows] = slot + 1
+
+    def produce_offspring(self, rows):
+        """Replace dead agents by offspring inheriting the strongest half
+        of their pathways."""
+        strength = self.config.INHERITANCE_STRENGTH
+        for r in rows.tolist():
+            flat = self.pathways[r].ravel()
+            cells = np.flatnonzero(flat)
+            inherited = np.zeros_like(flat)
+            if cells.size:
+                inherit_count = max(1, cells.size // 2)
+                top = np.argpartition(flat[cells],
+                                      cells.size - inherit_count)
+                cells = cells[top[cells.size - inherit_count:]]
+                inherited[cells] = flat[cells] * strength
+            flat[:] = inherited
+        self.generation[rows] += 1
+        self.spawn(rows)
+
+
+class Ensemble:
+    """K replicas of a Simulation advanced together, headless.
+
+    Each replica is an independent run of the same config: its own food,
+    agents and predators, drawn from one `rng` seeded from `seed`.
+    step() runs the Simulation.step pipeline once for all replicas; only
+    acting loops, over the N agents of a replica, each pass covering
+    every replica.
+    """
+
+    def __init__(self, replicas: int, seed: int | None = None,
+                 n_agents: int | None = None, n_predators: int | None = None,
+                 config: cfg.SimConfig | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        self.replicas = replicas
+        self.seed = seed
+        self.n_agents = self.config.N_AGENTS if n_agents is None else n_agents
+        self.n_predators = (self.config.N_PREDATORS if n_predators is None
+                            else n_predators)
+        self.reset()
+
+    def reset(self):
+        """Fresh worlds, agents and predators for every replica."""
+        config, k = self.config, self.replicas
+        self.rng = np.random.default_rng(self.seed)
+        self.world = EnsembleWorld(k, config, self.rng)
+        self.population = EnsemblePopulation(k, self.n_agents, config,
+                                             self.rng)
+
+        # predators as (K, P) arrays, placed as create_predators places them
+        pack = create_predators(self.n_predators, config)
+        self.predator_x = np.tile(pack.x, (k, 1))
+        self.predator_y = np.tile(pack.y, (k, 1))
+        self.predator_alive = np.tile(pack.alive, (k, 1))
+
+        self.geometry = EnsembleGeometry(k, self.n_agents)
+        self.geometry.update_predators(self.predator_x, self.predator_y,
+                                       self.predator_alive)
+        self._locate_agents()
+        self.tick = 0
+
+        # per-replica tallies since reset
+        self.food_eaten = np.zeros(k, dtype=np.int64)
+        self.deaths = np.zeros(k, dtype=np.int64)
+        self.births = np.zeros(k, dtype=np.int64)
+        self.ticks_lived = np.zeros(k, dtype=np.int64)
+        self.max_ticks_lived = np.zeros(k, dtype=np.int64)
+
+    # ── per-tick step ────────────────────────────────────────────────────
+    def step(self):
+        """Advance every replica one tick."""
+        self.tick += 1
+        pop, world, geometry = self.population, self.world, self.geometry
+        world.update()
+        self._update_predators()
+
+        pop.update_chemicals(geometry=geometry)
+        xs, ys = pop.decide_moves(world.rows(pop.replica), geometry=geometry)
+
+        n = self.n_agents
+        dead = []
+        for j in range(n):
+            rows = np.arange(j, len(pop), n)
+            ate, died = pop.act(world, rows, xs[rows], ys[rows])
+            np.add.at(self.food_eaten, pop.replica[ate], 1)
+            dead.append(died)
+        died = np.concatenate(dead)
+        if died.size:
+            k = pop.replica[died]
+            lived = pop.total_ticks[died]
+            np.add.at(self.deaths, k, 1)
+            np.add.at(self.ticks_lived, k, lived)
+            np.maximum.at(self.max_ticks_lived, k, lived)
+            pop.produce_offspring(died)
+            np.add.at(self.births, k, 1)
+
+        self._locate_agents()
+
+    def _update_predators(self):
+        """PredatorPack.update for every replica's pack."""
+        if self.tick % self.config.PREDATOR_SPEED != 0:
+            return
+        axs, ays, alive = self.geometry.agents
+        px, py = self.predator_x, self.predator_y
+        dx = axs[:, None, :] - px[:, :, None]
+        dy = ays[:, None, :] - py[:, :, None]
+        d2 = np.where(alive[:, None, :], dx * dx + dy * dy, _FAR)
+        target = np.argmin(d2, axis=2)
+        hunting = self.predator_alive & alive.any(axis=1)[:, None]
+        if not hunting.any():
+            return
+        tdx = np.take_along_axis(dx, target[..., None], 2)[..., 0]
+        tdy = np.take_along_axis(dy, target[..., None], 2)[..., 0]
+        along_x = np.abs(tdx) > np.abs(tdy)
+        edge = self.config.GRID_SIZE - 1
+        px[...] = np.where(hunting, np.clip(
+            px + np.where(along_x, np.sign(tdx), 0), 0, edge), px)
+        py[...] = np.where(hunting, np.clip(
+            py + np.where(along_x, 0, np.sign(tdy)), 0, edge), py)
+        self.geometry.update_predators(px, py, self.predator_alive)
+
+        # attacks: one hit per hunting predator within reach
+        dx = axs[:, None, :] - px[:, :, None]
+        dy = ays[:, None, :] - py[:, :, None]
+        hit = (hunting[:, :, None] & alive[:, None, :]
+               & (dx * dx + dy * dy < 4.0))
+        energy = self.population.energy.reshape(alive.shape)
+        damage = self.config.PREDATOR_DAMAGE
+        for p in range(hit.shape[1]):
+            energy -= np.where(hit[:, p], damage, 0.0)
+
+    def _locate_agents(self):
+        pop = self.population
+        self.geometry.update_agents(pop.x, pop.y, pop.alive)
+
+    def run(self, n_ticks: int):
+        """Advance every replica n_ticks as fast as possible."""
+        for _ in range(n_ticks):
+            self.step()
+
+    # ── results ──────────────────────────────────────────────────────────
+    def summary(self) -> list[dict]:
+        """Per-replica metrics, as sweep.run_one reports them."""
+        pop = self.population
+        shape = (self.replicas, self.n_agents)
+        ages = pop.total_ticks.reshape(shape)
+        generations = pop.generation.reshape(shape)
+        lived = self.ticks_lived + ages.sum(axis=1)
+        lives = self.deaths + self.n_agents
+        coverage = pop.coverage()
+        return [
+            {
+                "deaths": int(self.deaths[k]),
+                "births": int(self.births[k]),
+                "food_eaten": int(self.food_eaten[k]),
+                "mean_ticks_survived": round(float(lived[k] / lives[k]), 2),
+                "max_ticks_survived": int(max(self.max_ticks_lived[k],
+                                              ages[k].max(initial=0))),
+                "max_generation": int(generations[k].max(initial=0)),
+                "mean_generation": round(float(generations[k].mean()), 3),
+                "final_energy": round(float(
+                    pop.energy.reshape(shape)[k].sum()), 2),
+                "explored": round(float(coverage[k]), 4),
+            }
+            for k in range(self.replicas)
+        ]
@@ -0,0 +1,67 @@
+"""
+GENESIS — Falloff tables
+Distance falloff curves of the chemical signals, tabulated once over
+integer grid offsets so the hot paths read them instead of computing.
+"""
+
+import numpy as np
+import config as cfg
+
+
+class Curve:
+    """One falloff curve tabulated by (|dy|, |dx|); every curve is
+    symmetric. Call it for one offset, take() for arrays of offsets."""
+
+    __slots__ = ("table", "_rows")
+
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        self._rows: list | None = None      # list copy for scalar reads
+
+    def __call__(self, dx: int, dy: int) -> float:
+        if self._rows is None:
+            self._rows = self.table.tolist()
+        return self._rows[abs(dy)][abs(dx)]
+
+    def take(self, dx, dy) -> np.ndarray:
+        return self.table[np.abs(dy), np.abs(dx)]
+
+
+class FalloffTables:
+    """The signal falloff curves for one set of config values.
+
+    Tables cover offsets up to `reach` cells on each axis, enough for any
+    pair of cells on a grid of side `reach` plus one cell of margin.
+    """
+
+    def __init__(self, reach: int, sense_range: float,
+                 aggression_scale: float, social_scale: float):
+        self.reach = reach
+        r = np.arange(reach + 1)
+        d = np.sqrt(r[:, None] ** 2 + r[None, :] ** 2)
+
+        # 1/(1+(d/R)²): predator fear and alertness, no range cutoff
+        self.predator_fear = Curve(1.0 / (1.0 + (d / sense_range) ** 2))
+        # 1/(1+d²/s): territory pressure and social pull
+        self.aggression = Curve(1.0 / (1.0 + d ** 2 / aggression_scale))
+        self.social = Curve(1.0 / (1.0 + d ** 2 / social_scale))
+        # move repulsion from the nearest agent, and from a sensed predator
+        self.repulsion = Curve(1.0 / (d + 1.0))
+        self.predator_repulsion = Curve(
+            np.where(d < sense_range, 1.0 / (d + 0.5), 0.0)
+        )
+
+
+_tables: dict[tuple, FalloffTables] = {}
+
+
+def tables(config: cfg.SimConfig | None = None) -> FalloffTables:
+    """Falloff tables for a config (default: config.py), built on first
+    use and shared by every config with the same signal values."""
+    config = cfg.DEFAULT if config is None else config
+    key = (config.GRID_SIZE, config.PREDATOR_SENSE_RANGE,
+           config.AGGRESSION_PROXIMITY_SCALE, config.SOCIAL_PROXIMITY_SCALE)
+    found = _tables.get(key)
+    if found is None:
+        found = _tables[key] = FalloffTables(*key)
+    return found
@@ -4,70 +4,249 @@ CSV data capture and Matplotlib graph generation.
 Expanded for v2.0: seasons, generations, additional chemicals.
 """
 
+import atexit
 import csv
 import math
 import os
+import signal
+import threading
+import time
+import weakref
 from datetime import datetime
 
-import numpy as np
 import config as cfg
+from agent import HUNGER, FEAR, CURIOSITY, STRESS, FATIGUE, SOCIAL
+from spatial import SpatialHash
+
+
+# (column suffix, value) for every logged agent
+AGENT_COLUMNS = [
+    ("energy",     lambda a: round(a.energy, 2)),
+    ("hunger",     lambda a: round(float(a.chem[HUNGER]), 3)),
+    ("fear",       lambda a: round(float(a.chem[FEAR]), 3)),
+    ("curiosity",  lambda a: round(float(a.chem[CURIOSITY]), 3)),
+    ("stress",     lambda a: round(float(a.chem[STRESS]), 3)),
+    ("fatigue",    lambda a: round(float(a.chem[FATIGUE]), 3)),
+    ("social",     lambda a: round(float(a.chem[SOCIAL]), 3)),
+    ("food_eaten", lambda a: a.food_eaten),
+    ("pathways",   lambda a: a.pathway_count),
+    ("generation", lambda a: a.generation),
+]
+
+# graph colours for agents A, B, C, …
+AGENT_COLORS = ["#3A8CFF", "#FF4646", "#40C060", "#F0C040",
+                "#A070FF", "#40D0D0", "#FF8C40", "#E070C0"]
+
+
+def closest_distance(agents, grid_size: int) -> float:
+    """Smallest distance between any two agents (0 with fewer than two)."""
+    if len(agents) < 2:
+        return 0.0
+    xs = [a.x for a in agents]
+    ys = [a.y for a in agents]
+    grid = SpatialHash(xs, ys, grid_size)
+    nearest = grid.nearest(xs, ys, exclude=range(len(agents)))
+    return min(math.hypot(xs[i] - xs[j], ys[i] - ys[j])
+               for i, j in enumerate(nearest.tolist()))
+
+
+# loggers with rows still buffered, flushed at exit or on SIGTERM; a
+# logger leaves the set whenever its buffer is written out
+_open_loggers: set["Logger"] = set()
+_exit_hooked = False
+_previous_sigterm = None
+
+
+def _flush_all():
+    for logger in list(_open_loggers):
+        logger.close()
+
+
+def _on_sigterm(signum, frame):
+    # write what is buffered, then terminate the way we would have
+    _flush_all()
+    signal.signal(signum, _previous_sigterm)
+    os.kill(os.getpid(), signum)
+
+
+def _hook_exit():
+    global _exit_hooked
+    if not _exit_hooked:
+        _exit_hooked = True
+        atexit.register(_flush_all)
+
+
+def _flush_when_due(ref, wake: threading.Condition, idle: float):
+    """Body of a logger's flusher thread: write the buffer once its
+    oldest row is due. Holds the logger weakly, so it ends when the
+    logger is closed or collected, or has started another flusher."""
+    while True:
+        with wake:
+            logger = ref()
+            if (logger is None
+                    or logger._flusher is not threading.current_thread()):
+                return
+            if logger._buffer and time.monotonic() >= logger._due:
+                logger.flush()
+            delay = (logger._due - time.monotonic() if logger._buffer
+                     else idle)
+            del logger
+            wake.wait(delay)
+
+
+def flush_on_sigterm():
+    """Write every logger's buffered rows on SIGTERM, then let the signal
+    end the process as the previous handler would. Opt-in, for the
+    application that owns signal handling; call from the main thread."""
+    global _previous_sigterm
+    if _previous_sigterm is not None:
+        return
+    _previous_sigterm = signal.getsignal(signal.SIGTERM)
+    if _previous_sigterm is None:
+        _previous_sigterm = signal.SIG_DFL
+    signal.signal(signal.SIGTERM, _on_sigterm)
 
 
 class Logger:
-    """Logs simulation data every TICKS_PER_LOG ticks and produces graphs."""
+    """Logs simulation data every TICKS_PER_LOG ticks and produces graphs.
 
-    def __init__(self, output_dir: str = "."):
+    Rows go through one open CSV file and are written in batches of
+    LOG_FLUSH_ROWS, or by the logger's flusher thread LOG_FLUSH_SECONDS
+    after the oldest buffered row, and on flush()/close() and interpreter
+    exit (and on
+    SIGTERM after flush_on_sigterm()). With
+    LOG_ROTATE_ROWS set, a file that reaches that many rows is closed and
+    the next one (…_1.csv, …_2.csv) starts with its own header. Graphs
+    draw from at most LOG_GRAPH_ROWS rows kept in memory: when full,
+    every other row is dropped and only every second new row is kept.
+    """
+
+    def __init__(self, output_dir: str = ".",
+                 config: cfg.SimConfig | None = None):
+        self.config = cfg.DEFAULT if config is None else config
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.csv_path = os.path.join(output_dir, f"genesis_log_{timestamp}.csv")
+        self._stem = os.path.join(output_dir, f"genesis_log_{timestamp}")
+        self.csv_path = f"{self._stem}.csv"
+        self.paths: list[str] = []          # every file written so far
+        self._file = None
+        self._writer: csv.DictWriter | None = None
+        self._file_rows = 0
+        self._buffer: list[dict] = []
+        self._lock = threading.RLock()
+        self._wake = threading.Condition(self._lock)
+        self._flusher: threading.Thread | None = None
+        self._due = 0.0                     # when the oldest row is due
+        # thinned history for generate_graphs
         self._rows: list[dict] = []
-        self._header_written = False
+        self._stride = 1
+        self._logged = 0
+        _hook_exit()
 
     # ── per-tick check ───────────────────────────────────────────────────
-    def maybe_log(self, tick: int, agents, world):
-        if tick % cfg.TICKS_PER_LOG != 0:
+    def maybe_log(self, tick: int, agents, world, geometry=None):
+        if tick % self.config.TICKS_PER_LOG != 0:
             return
-        a, b = agents
-        dist = math.hypot(a.x - b.x, a.y - b.y)
         row = {
             "tick":               tick,
             "season":             world.get_season(),
             "season_tick":        world.get_season_tick(),
-            "total_food":         round(float(np.sum(world.food)), 1),
-            "agent_a_energy":     round(a.energy, 2),
-            "agent_b_energy":     round(b.energy, 2),
-            "agent_a_hunger":     round(a.chemicals["hunger"], 3),
-            "agent_b_hunger":     round(b.chemicals["hunger"], 3),
-            "agent_a_fear":       round(a.chemicals["fear"], 3),
-            "agent_b_fear":       round(b.chemicals["fear"], 3),
-            "agent_a_curiosity":  round(a.chemicals["curiosity"], 3),
-            "agent_b_curiosity":  round(b.chemicals["curiosity"], 3),
-            "agent_a_stress":     round(a.chemicals["stress"], 3),
-            "agent_b_stress":     round(b.chemicals["stress"], 3),
-            "agent_a_fatigue":    round(a.chemicals["fatigue"], 3),
-            "agent_b_fatigue":    round(b.chemicals["fatigue"], 3),
-            "agent_a_social":     round(a.chemicals["social"], 3),
-            "agent_b_social":     round(b.chemicals["social"], 3),
-            "agent_a_food_eaten": a.food_eaten,
-            "agent_b_food_eaten": b.food_eaten,
-            "agent_a_pathways":   len(a.pathways),
-            "agent_b_pathways":   len(b.pathways),
-            "agent_a_generation": a.generation,
-            "agent_b_generation": b.generation,
-            "distance":           round(dist, 2),
+            "total_food":         round(world.get_total_food(), 1),
         }
-        self._rows.append(row)
+        # per-agent columns, grouped by metric: agent_a_energy, agent_b_energy…
+        logged = agents[:self.config.LOG_MAX_AGENTS]
+        keys = [f"agent_{a.label.lower()}" for a in logged]
+        for metric, value in AGENT_COLUMNS:
+            for key, agent in zip(keys, logged):
+                row[f"{key}_{metric}"] = value(agent)
+        closest = (geometry.closest_distance() if geometry is not None
+                   else closest_distance(agents, self.config.GRID_SIZE))
+        row["distance"] = round(closest, 2)
+        self._keep_for_graphs(row)
         self._write_row(row)
 
+    def _keep_for_graphs(self, row: dict):
+        if self._logged % self._stride == 0:
+            self._rows.append(row)
+            if len(self._rows) >= self.config.LOG_GRAPH_ROWS:
+                del self._rows[1::2]
+                self._stride *= 2
+        self._logged += 1
+
+    # ── CSV output ───────────────────────────────────────────────────────
     def _write_row(self, row: dict):
-        mode = "a" if self._header_written else "w"
-        with open(self.csv_path, mode, newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=list(row.keys()))
-            if not self._header_written:
-                writer.writeheader()
-                self._header_written = True
-            writer.writerow(row)
+        with self._lock:
+            if not self._buffer:
+                _open_loggers.add(self)
+                # flushed by age even if no further row arrives (paused
+                # or slow runs)
+                self._due = time.monotonic() + self.config.LOG_FLUSH_SECONDS
+                if self._flusher is None:
+                    self._start_flusher()
+            self._buffer.append(row)
+            if len(self._buffer) >= self.config.LOG_FLUSH_ROWS:
+                self.flush()
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(
+            target=_flush_when_due,
+            args=(weakref.ref(self), self._wake,
+                  self.config.LOG_FLUSH_SECONDS),
+            name="genesis-log-flush", daemon=True,
+        )
+        self._flusher.start()
+
+    def flush(self):
+        """Write every buffered row to disk."""
+        with self._lock:
+            _open_loggers.discard(self)
+            rows = self._buffer
+            self._buffer = []
+            rotate = self.config.LOG_ROTATE_ROWS
+            while rows:
+                if self._writer is None:
+                    self._open(rows[0])
+                room = (rotate - self._file_rows if rotate
+                        else len(rows))
+                self._writer.writerows(rows[:room])
+                self._file_rows += min(room, len(rows))
+                rows = rows[room:]
+                if rotate and self._file_rows >= rotate:
+                    self._close_file()
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Flush and close the current file; logging again reopens it
+        for appending."""
+        with self._lock:
+            self.flush()
+            self._close_file()
+            # stop the flusher; logging again starts a new one
+            self._flusher = None
+            self._wake.notify_all()
+
+    def _open(self, row: dict):
+        rotate = self.config.LOG_ROTATE_ROWS
+        if self._file_rows and not (rotate and self._file_rows >= rotate):
+            # reopened after close(): keep appending to the same file
+            self._file = open(self.csv_path, "a", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=list(row))
+            return
+        if self.paths:
+            self.csv_path = f"{self._stem}_{len(self.paths)}.csv"
+        self.paths.append(self.csv_path)
+        self._file = open(self.csv_path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=list(row))
+        self._writer.writeheader()
+        self._file_rows = 0
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._writer = None
 
     # ── graph generation ─────────────────────────────────────────────────
     def generate_graphs(self):
@@ -78,33 +257,35 @@ class Logger:
         import matplotlib.pyplot as plt
 
         ticks = [r["tick"] for r in self._rows]
+        first = self._rows[0]
+        labels = [key[len("agent_"):-len("_energy")] for key in first
+                  if key.startswith("agent_") and key.endswith("_energy")]
+
+        def agent_series(metric):
+            return [
+                (f"Agent {label.upper()}",
+                 [r[f"agent_{label}_{metric}"] for r in self._rows],
+                 AGENT_COLORS[i % len(AGENT_COLORS)])
+                for i, label in enumerate(labels)
+            ]
 
         graphs = [
             {
                 "title": "Energy Over Time",
                 "filename": "graph_energy.png",
-                "series": [
-                    ("Agent A", [r["agent_a_energy"] for r in self._rows], "#3A8CFF"),
-                    ("Agent B", [r["agent_b_energy"] for r in self._rows], "#FF4646"),
-                ],
+                "series": agent_series("energy"),
                 "ylabel": "Energy",
             },
             {
                 "title": "Hunger Over Time",
                 "filename": "graph_hunger.png",
-                "series": [
-                    ("Agent A", [r["agent_a_hunger"] for r in self._rows], "#3A8CFF"),
-                    ("Agent B", [r["agent_b_hunger"] for r in self._rows], "#FF4646"),
-                ],
+                "series": agent_series("hunger"),
                 "ylabel": "Hunger",
             },
             {
                 "title": "Cumulative Food Eaten",
                 "filename": "graph_food_eaten.png",
-                "series": [
-                    ("Agent A", [r["agent_a_food_eaten"] for r in self._rows], "#3A8CFF"),
-                    ("Agent B", [r["agent_b_food_eaten"] for r in self._rows], "#FF4646"),
-                ],
+                "series": agent_series("food_eaten"),
                 "ylabel": "Food Eaten",
             },
             {
@@ -126,10 +307,7 @@ class Logger:
             {
                 "title": "Stress Over Time",
                 "filename": "graph_stress.png",
-                "series": [
-                    ("Agent A", [r["agent_a_stress"] for r in self._rows], "#3A8CFF"),
-                    ("Agent B", [r["agent_b_stress"] for r in self._rows], "#FF4646"),
-                ],
+                "series": agent_series("stress"),
                 "ylabel": "Stress",
             },
         ]
@@ -1,39 +1,125 @@
 """
 GENESIS v2 — Main entry point
-Game loop: events → world → predator → agents → render → log.
+Interactive loop: events → simulation step → render.
+`--headless` runs the bare Simulation engine without pygame.
 """
 
+import argparse
+import os
 import sys
-import pygame
+import time
+from collections import Counter
+
 import config as cfg
-from world import World
-from agent import Agent
-from predator import Predator
-from renderer import Renderer
-from logger import Logger
+from checkpoint import load_checkpoint, save_checkpoint
+from logger import flush_on_sigterm
+from replay import Replay, ReplayRecorder
+from runner import SimRunner
+from simulation import Simulation
 
+# speed multipliers the +/- keys step through
+SPEED_STEPS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0,
+               1000.0)
+# more events than this in one frame reach the event log as one summary
+EVENT_LOG_BATCH = 6
 
-def create_agents() -> list[Agent]:
-    """Spawn two agents at opposite corners."""
-    a = Agent(0, 2, 2, "blue")
-    b = Agent(1, cfg.GRID_SIZE - 3, cfg.GRID_SIZE - 3, "red")
-    return [a, b]
 
+def format_event(event: dict) -> str:
+    """Event-log line for a Simulation event."""
+    tick = event["tick"]
+    kind = event["type"]
+    if kind == "season":
+        return f"T{tick}: ═══ {event['season'].upper()} ═══"
+    if kind == "ate":
+        return f"T{tick}: {event['label']} ate (E={event['energy']:.0f})"
+    if kind == "died":
+        return f"T{tick}: {event['label']} DIED (Gen {event['generation']})"
+    if kind == "born":
+        return (f"T{tick}: Gen {event['generation']} born "
+                f"({event['pathways']} paths)")
+    return f"T{tick}: {kind}"
 
-def main():
-    world = World()
-    agents = create_agents()
-    pred = Predator(cfg.PREDATOR_START_X, cfg.PREDATOR_START_Y)
-    renderer = Renderer()
-    logger = Logger(output_dir="data")
 
-    tick = 0
-    paused = False
-    speed_mult = 1.0
+def summarize_events(events: list[dict]) -> str:
+    """One event-log line counting a batch of Simulation events."""
+    counts = Counter(ev["type"] for ev in events)
+    parts = [f"{counts[kind]} {kind}" for kind in ("ate", "died", "born")
+             if counts[kind]]
+    first, last = events[0]["tick"], events[-1]["tick"]
+    span = f"T{first}" if first == last else f"T{first}-{last}"
+    return f"{span}: {', '.join(parts) or 'no events'}"
+
+
+def log_events(renderer, events: list[dict], batch: bool):
+    """Add events to the renderer's log, one line each, or as a summary
+    line when `batch` (season changes always get their own line)."""
+    if not batch:
+        for ev in events:
+            renderer.add_event(format_event(ev))
+        return
+    others = [ev for ev in events if ev["type"] != "season"]
+    if others:
+        renderer.add_event(summarize_events(others))
+    for ev in events:
+        if ev["type"] == "season":
+            renderer.add_event(format_event(ev))
+
+
+def make_simulation(log_dir: str, seed: int | None = None,
+                    n_agents: int | None = None,
+                    n_predators: int | None = None,
+                    resume: str | None = None) -> Simulation:
+    """Fresh simulation, or one restored from a checkpoint file."""
+    if resume is not None:
+        return load_checkpoint(resume, seed=seed, log_dir=log_dir)
+    return Simulation(log_dir=log_dir, seed=seed, n_agents=n_agents,
+                      n_predators=n_predators)
+
+
+def stop_recording(sim: Simulation, renderer=None):
+    """Write and detach the simulation's replay recorder, if any."""
+    if sim.recorder is None:
+        return
+    sim.recorder.close()
+    message = f"Replay saved: {sim.recorder.path}"
+    sim.recorder = None
+    if renderer is not None:
+        renderer.add_event(message)
+    print(f"[GENESIS] {message}")
+
+
+def run_interactive(seed: int | None = None, n_agents: int | None = None,
+                    n_predators: int | None = None,
+                    resume: str | None = None, record: str | None = None):
+    import pygame
+    from renderer import Renderer
+
+    sim = make_simulation("data", seed, n_agents, n_predators, resume)
+    if record:
+        sim.recorder = ReplayRecorder(record, sim)
+    renderer = Renderer(sim.config)
+    checkpoint = resume
+
+    # the simulation runs on its own thread at TARGET_FPS × speed ticks
+    # per second (flat out when unlimited); each frame draws the latest
+    # snapshot it published
+    runner = SimRunner(sim, rate=sim.config.TARGET_FPS)
+    speed = SPEED_STEPS.index(1.0)
+    unlimited = False
     running = True
-    last_season = world.get_season()
+    # digits typed before F set a fast-forward target tick
+    goto = ""
+    fast_forward = None
+
+    def apply_speed():
+        mult = SPEED_STEPS[speed]
+        runner.set_rate(None if unlimited
+                        else sim.config.TARGET_FPS * mult)
+        renderer.add_event("Speed → MAX" if unlimited
+                           else f"Speed → {mult:g}x")
 
     renderer.add_event("GENESIS v2 started")
+    runner.start()
 
     while running:
         # ── events ───────────────────────────────────────────────────
@@ -46,29 +132,75 @@ def main():
                     running = False
 
                 elif event.key == pygame.K_SPACE:
-                    paused = not paused
-                    renderer.add_event("Paused" if paused else "Resumed")
+                    runner.set_paused(not runner.paused)
+                    renderer.add_event("Paused" if runner.paused
+                                       else "Resumed")
 
                 elif event.key in (pygame.K_PLUS, pygame.K_EQUALS,
                                    pygame.K_KP_PLUS):
-                    speed_mult = min(10.0, speed_mult + 0.5)
-                    renderer.add_event(f"Speed → {speed_mult:.1f}x")
+                    speed = min(len(SPEED_STEPS) - 1, speed + 1)
+                    unlimited = False
+                    apply_speed()
 
                 elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
-                    speed_mult = max(0.5, speed_mult - 0.5)
-                    renderer.add_event(f"Speed → {speed_mult:.1f}x")
+                    speed = max(0, speed - 1)
+                    unlimited = False
+                    apply_speed()
+
+                elif event.key == pygame.K_u:
+                    unlimited = not unlimited
+                    apply_speed()
+
+                elif event.unicode.isdigit():
+                    goto += event.unicode
+
+                elif event.key == pygame.K_f:
+                    if runner.fast_forward is not None:
+                        runner.stop_fast_forward()
+                    else:
+                        target = runner.start_fast_forward(
+                            until_tick=int(goto) if goto else None
+                        )
+                        renderer.add_event(f"Fast-forward {target.label}")
+                    goto = ""
+
+                elif event.key == pygame.K_n:
+                    with runner.lock:
+                        boundary = (sim.tick + sim.config.SEASON_LENGTH
+                                    - sim.world.get_season_tick())
+                        target = runner.start_fast_forward(until_tick=boundary)
+                    renderer.add_event(f"Fast-forward {target.label}")
+
+                elif event.key == pygame.K_x:
+                    target = runner.start_fast_forward(until_event="died")
+                    renderer.add_event(f"Fast-forward {target.label}")
 
                 elif event.key == pygame.K_r:
-                    world = World()
-                    agents = create_agents()
-                    pred = Predator(cfg.PREDATOR_START_X,
-                                    cfg.PREDATOR_START_Y)
-                    tick = 0
-                    last_season = "Spring"
+                    with runner.lock:
+                        stop_recording(sim, renderer)
+                        sim.reset()
+                        runner.republish()
                     renderer.add_event("*** RESTARTED ***")
 
+                elif event.key == pygame.K_c:
+                    with runner.lock:
+                        checkpoint = os.path.join(
+                            "data", f"genesis_checkpoint_{sim.tick}.npz"
+                        )
+                        save_checkpoint(sim, checkpoint)
+                    renderer.add_event(f"Checkpoint: T{sim.tick}")
+
+                elif event.key == pygame.K_l and checkpoint:
+                    with runner.lock:
+                        stop_recording(sim, renderer)
+                        sim.logger.close()
+                        sim = runner.sim = load_checkpoint(checkpoint,
+                                                           log_dir="data")
+                        runner.republish()
+                    renderer.add_event(f"*** BACK TO T{sim.tick} ***")
+
                 elif event.key == pygame.K_s:
-                    fname = f"genesis_screenshot_{tick}.png"
+                    fname = f"genesis_screenshot_{runner.latest().tick}.png"
                     renderer.screenshot(fname)
                     renderer.add_event(f"Screenshot: {fname}")
 
@@ -78,63 +210,204 @@ def main():
                         "Debug ON" if renderer.debug else "Debug OFF"
                     )
 
-        if paused:
-            renderer.draw(world, agents, tick, paused, speed_mult, pred)
-            renderer.tick(int(cfg.TARGET_FPS * speed_mult))
-            continue
-
-        # ── simulation tick ──────────────────────────────────────────
-        tick += 1
-
-        # world step
-        world.update()
-
-        # season change event
-        current_season = world.get_season()
-        if current_season != last_season:
-            renderer.add_event(f"T{tick}: ═══ {current_season.upper()} ═══")
-            last_season = current_season
-
-        # predator step
-        pred.update(agents, tick)
-
-        # agent steps
-        for i, agent in enumerate(agents):
-            other = agents[1 - i]
-            events = agent.update(world, other, pred)
-
-            if events.get("ate"):
-                renderer.flash(agent.x, agent.y)
-                label = "A" if agent.id == 0 else "B"
-                renderer.add_event(
-                    f"T{tick}: {label} ate (E={agent.energy:.0f})"
-                )
-            if events.get("died"):
-                label = "A" if agent.id == 0 else "B"
-                renderer.add_event(
-                    f"T{tick}: {label} DIED (Gen {agent.generation})"
-                )
-                # produce offspring instead of simple respawn
-                sx = 2 if agent.id == 0 else cfg.GRID_SIZE - 3
-                sy = 2 if agent.id == 0 else cfg.GRID_SIZE - 3
-                offspring = agent.produce_offspring(sx, sy)
-                agents[i] = offspring
-                renderer.add_event(
-                    f"T{tick}: Gen {offspring.generation} born "
-                    f"({len(offspring.pathways)} paths)"
-                )
-
-        # log
-        logger.maybe_log(tick, agents, world)
+        # ── events from the simulation thread ────────────────────────
+        # batched into one line when many arrive per frame; no flashes
+        # while fast-forwarding, and one per cell otherwise
+        events = runner.drain_events()
+        fast = runner.fast_forward is not None
+        log_events(renderer, events,
+                   batch=fast or len(events) > EVENT_LOG_BATCH)
+        if not fast:
+            for x, y in {(ev["x"], ev["y"]) for ev in events
+                         if ev["type"] == "ate"}:
+                renderer.flash(x, y)
+        if fast_forward is not None and not fast:
+            renderer.add_event(f"Fast-forward done: T{runner.sim.tick}")
+        fast_forward = runner.fast_forward
 
         # ── render ───────────────────────────────────────────────────
-        renderer.draw(world, agents, tick, paused, speed_mult, pred)
-        renderer.tick(int(cfg.TARGET_FPS * speed_mult))
+        if fast_forward is not None:
+            # render-skip: only the progress sidebar is drawn
+            tick = runner.sim.tick
+            renderer.draw_fast_forward(tick, fast_forward.label,
+                                       fast_forward.progress(tick),
+                                       runner.measured_rate)
+            renderer.tick(sim.config.TARGET_FPS)
+            continue
+        snapshot = runner.latest()
+        agents, predators = snapshot.frame(runner.blend(snapshot))
+        renderer.draw(snapshot.world, agents, snapshot.tick, runner.paused,
+                      float("inf") if unlimited else SPEED_STEPS[speed],
+                      predators, tick_rate=runner.measured_rate)
+        renderer.tick(sim.config.TARGET_FPS)
 
     # ── shutdown ─────────────────────────────────────────────────────
+    runner.stop()
     pygame.quit()
-    logger.generate_graphs()
+    stop_recording(sim)
+    runner.sim.logger.close()
+    runner.sim.logger.generate_graphs()
     print("[GENESIS] Simulation ended. Graphs saved to data/.")
+
+
+def run_playback(path: str):
+    """Play a recorded replay through the renderer; nothing is simulated.
+
+    SPACE pauses, +/- change speed, LEFT/RIGHT seek 100 ticks and
+    PAGEUP/PAGEDOWN a season; digits then G jump to a tick.
+    """
+    import pygame
+    from renderer import Renderer
+
+    replay = Replay(path)
+    config = replay.config
+    renderer = Renderer(config)
+    speed = SPEED_STEPS.index(1.0)
+    paused = False
+    running = True
+    goto = ""
+    index = 0
+    position = 0.0          # fractional frame, advanced by the speed
+
+    renderer.add_event(f"Replay: {len(replay)} frames")
+
+    while running:
+        seek = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                    renderer.add_event("Paused" if paused else "Resumed")
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS,
+                                   pygame.K_KP_PLUS):
+                    speed = min(len(SPEED_STEPS) - 1, speed + 1)
+                    renderer.add_event(f"Speed → {SPEED_STEPS[speed]:g}x")
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    speed = max(0, speed - 1)
+                    renderer.add_event(f"Speed → {SPEED_STEPS[speed]:g}x")
+                elif event.key == pygame.K_RIGHT:
+                    seek = index + 100
+                elif event.key == pygame.K_LEFT:
+                    seek = index - 100
+                elif event.key == pygame.K_PAGEDOWN:
+                    seek = index + config.SEASON_LENGTH
+                elif event.key == pygame.K_PAGEUP:
+                    seek = index - config.SEASON_LENGTH
+                elif event.unicode.isdigit():
+                    goto += event.unicode
+                elif event.key == pygame.K_g and goto:
+                    seek = replay.index_of(int(goto))
+                    goto = ""
+                elif event.key == pygame.K_s:
+                    fname = f"genesis_replay_{replay.ticks[index]}.png"
+                    renderer.screenshot(fname)
+                    renderer.add_event(f"Screenshot: {fname}")
+                elif event.key == pygame.K_d:
+                    renderer.toggle_debug()
+
+        # ── advance ──────────────────────────────────────────────────
+        if seek is not None:
+            index = max(0, min(len(replay) - 1, seek))
+            position = float(index)
+            renderer.add_event(f"Seek → T{replay.ticks[index]}")
+        elif not paused and index < len(replay) - 1:
+            position = min(position + SPEED_STEPS[speed], len(replay) - 1)
+            step_to = int(position)
+            events = replay.events(index + 1, step_to + 1)
+            log_events(renderer, events, batch=len(events) > EVENT_LOG_BATCH)
+            for x, y in {(ev["x"], ev["y"]) for ev in events
+                         if ev["type"] == "ate"}:
+                renderer.flash(x, y)
+            index = step_to
+
+        # ── render ───────────────────────────────────────────────────
+        world, agents, predators, tick = replay.frame(index)
+        renderer.draw(world, agents, tick, paused, SPEED_STEPS[speed],
+                      predators)
+        renderer.tick(config.TARGET_FPS)
+
+    pygame.quit()
+
+
+def run_headless(ticks: int, seed: int | None = None,
+                 log_dir: str = "data", graphs: bool = True,
+                 n_agents: int | None = None, n_predators: int | None = None,
+                 resume: str | None = None, checkpoint: str | None = None,
+                 record: str | None = None):
+    """Run the engine flat out with no display; pygame is never imported.
+    `checkpoint` names a file to save the final state to and `record`
+    one to save a replay of the run to."""
+    sim = make_simulation(log_dir, seed, n_agents, n_predators, resume)
+    if record:
+        sim.recorder = ReplayRecorder(record, sim)
+    start = time.perf_counter()
+    sim.run(ticks)
+    elapsed = time.perf_counter() - start
+
+    rate = ticks / elapsed if elapsed > 0 else float("inf")
+    if len(sim.agents) <= sim.config.LOG_MAX_AGENTS:
+        gens = ", ".join(f"{a.generation}" for a in sim.agents)
+    else:
+        gens = f"max {max(a.generation for a in sim.agents)}"
+    print(f"[GENESIS] {ticks} ticks in {elapsed:.1f}s "
+          f"({rate:.0f} ticks/s). Generations: {gens}. "
+          f"Explored: {sim.population.coverage():.0%}")
+    if checkpoint:
+        save_checkpoint(sim, checkpoint)
+        print(f"[GENESIS] Checkpoint at T{sim.tick}: {checkpoint}")
+    stop_recording(sim)
+    sim.logger.close()
+    if graphs:
+        sim.logger.generate_graphs()
+    print(f"[GENESIS] Log saved: {sim.logger.csv_path}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="GENESIS simulation")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a display as fast as possible")
+    parser.add_argument("--ticks", type=int, default=100_000,
+                        help="ticks to simulate in headless mode")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the simulation's random generator")
+    parser.add_argument("--agents", type=int, default=None,
+                        help=f"number of agents (default {cfg.N_AGENTS})")
+    parser.add_argument("--predators", type=int, default=None,
+                        help=f"number of predators "
+                             f"(default {cfg.N_PREDATORS})")
+    parser.add_argument("--log-dir", default="data",
+                        help="directory for CSV logs and graphs")
+    parser.add_argument("--no-graphs", action="store_true",
+                        help="skip matplotlib graphs after a headless run")
+    parser.add_argument("--resume", metavar="PATH", default=None,
+                        help="continue from a checkpoint file; with --seed "
+                             "the generator is reseeded to fork a variant")
+    parser.add_argument("--checkpoint", metavar="PATH", default=None,
+                        help="save a checkpoint after a headless run")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record a replay of the run to this file")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="play back a recorded replay")
+    args = parser.parse_args(argv)
+
+    # a terminated run still writes the CSV rows it has buffered
+    flush_on_sigterm()
+    if args.replay:
+        run_playback(args.replay)
+    elif args.headless:
+        run_headless(args.ticks, seed=args.seed, log_dir=args.log_dir,
+                     graphs=not args.no_graphs, n_agents=args.agents,
+                     n_predators=args.predators, resume=args.resume,
+                     checkpoint=args.checkpoint, record=args.record)
+    else:
+        run_interactive(seed=args.seed, n_agents=args.agents,
+                        n_predators=args.predators, resume=args.resume,
+                        record=args.record)
     sys.exit(0)
 
 
@@ -0,0 +1,335 @@
+"""
+GENESIS — Agent population
+Struct-of-arrays view of many agents: positions, energy and a (N, 12)
+chemical matrix, updated for the whole population in vectorized passes.
+"""
+
+import math
+
+import numpy as np
+import config as cfg
+import falloff
+from agent import (
+    Agent, CHEMICALS, NEIGHBOUR_OFFSETS,
+    HUNGER, FEAR, CURIOSITY, SATIATION, AGGRESSION, FATIGUE, ALERTNESS,
+    COMFORT, URGENCY, MEMORY_CONSOLIDATION, SOCIAL, STRESS,
+    territory_density,
+)
+from spatial import SpatialHash, nearest_offsets
+from world import LAYER_SCENT, LAYER_FOOD_MARKERS, LAYER_ALARM_MARKERS
+
+# NEIGHBOUR_OFFSETS as (1, 8) arrays, scan order preserved
+_DX = np.array([[dx for dx, _ in NEIGHBOUR_OFFSETS]])
+_DY = np.array([[dy for _, dy in NEIGHBOUR_OFFSETS]])
+
+
+def _distance(dx, dy):
+    """Euclidean length of integer offsets, rounded exactly as math.hypot
+    rounds them (np.hypot can differ in the last place)."""
+    return np.sqrt(dx * dx + dy * dy)
+
+
+class AgentPopulation:
+    """Positions, energy and chemistry of N agents as NumPy arrays.
+
+    The Agent objects stay the unit of identity (trails, history);
+    gather() pulls their scalar state into the arrays and scatter() pushes
+    the chemical matrix back. Pathway and visited grids live in (N, H, W)
+    blocks: each agent's `pathways` and `visited` are views of its slice.
+    `explored` marks every cell any agent has visited since creation.
+    Move noise is drawn from `rng`.
+    """
+
+    def __init__(self, agents: list[Agent],
+                 config: cfg.SimConfig | None = None,
+                 rng: np.random.Generator | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.agents = list(agents)
+        n = len(self.agents)
+        size = self.config.GRID_SIZE
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.energy = np.zeros(n, dtype=np.float64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.chem = np.zeros((n, len(CHEMICALS)), dtype=np.float64)
+        self.pathways = np.zeros((n, size, size), dtype=np.float32)
+        self.visited = np.zeros((n, size, size), dtype=bool)
+        self.explored = np.zeros((size, size), dtype=bool)
+        self.gather()
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    # ── sync with Agent objects ──────────────────────────────────────────
+    def gather(self):
+        """Pull positions, energy, liveness and chemicals from the agents,
+        and move the grids of any new agent (e.g. an offspring put in its
+        parent's slot) into the shared blocks."""
+        for i, agent in enumerate(self.agents):
+            if agent.pathways.base is not self.pathways:
+                self.pathways[i] = agent.pathways
+                agent.pathways = self.pathways[i]
+            if agent.visited.base is not self.visited:
+                self.visited[i] = agent.visited
+                agent.visited = self.visited[i]
+                self.explored |= agent.visited
+            self.x[i] = agent.x
+            self.y[i] = agent.y
+            self.energy[i] = agent.energy
+            self.alive[i] = agent.alive
+            self.chem[i] = agent.chem
+
+    def scatter(self):
+        """Push the chemical matrix back into the agents."""
+        for agent, row in zip(self.agents, self.chem):
+            agent.chem[:] = row
+
+    def coverage(self) -> float:
+        """Share of grid cells any agent has visited, in [0, 1]."""
+        return np.count_nonzero(self.explored) / self.explored.size
+
+    def _explore(self, rows, ys, xs):
+        """Mark cells (ys, xs), entered by agents `rows`, as explored."""
+        self.explored[ys, xs] = True
+
+    # ── neighbours ───────────────────────────────────────────────────────
+    def spatial_hash(self) -> SpatialHash:
+        """Bucket index over the living agents' current positions."""
+        return SpatialHash(self.x, self.y, self.config.GRID_SIZE,
+                           active=self.alive)
+
+    def nearest_partners(self) -> np.ndarray:
+        """Index of each agent's nearest living other agent, or -1."""
+        return self.spatial_hash().nearest(self.x, self.y,
+                                           exclude=np.arange(len(self)))
+
+    def nearest_predators(self, predators, geometry=None):
+        """(hunted, dx, dy): whether each agent has a live predator, and
+        its offset from the nearest one. `predators` is a Predator or a
+        PredatorPack; a Geometry cache answers instead when given."""
+        if geometry is not None:
+            nearest, dx, dy = (geometry.predator, geometry.predator_dx,
+                               geometry.predator_dy)
+        elif predators is None:
+            return np.zeros(len(self), dtype=bool), self.x * 0, self.y * 0
+        else:
+            nearest, dx, dy = nearest_offsets(self.x, self.y,
+                                              *predators.positions(),
+                                              self.config.GRID_SIZE)
+        return nearest >= 0, dx, dy
+
+    # ── chemistry ────────────────────────────────────────────────────────
+    def update_chemicals(self, partners: np.ndarray | None = None,
+                         predator=None, geometry=None):
+        """Agent.update_chemicals for every agent in one vectorized pass.
+
+        `partners[i]` is the agent that plays `other_agent` for agent i
+        (-1 for none); by default the nearest living other agent. Partner
+        terms read the partner's chemistry from before this pass, so the
+        result does not depend on agent order. Dead agents are skipped.
+        A Geometry cache, when given, supplies partners and distances.
+        """
+        if geometry is not None:
+            partners = geometry.partners
+        elif partners is None:
+            partners = self.nearest_partners()
+        live = self.alive
+        c = self.chem
+        old_hunger = c[:, HUNGER].copy()
+
+        has = (partners >= 0) & live
+        has[has] = self.alive[partners[has]]
+        px = np.where(has, self.x[partners], 0)
+        py = np.where(has, self.y[partners], 0)
+        odx, ody = self.x - px, self.y - py
+        if geometry is not None:
+            dist = geometry.partner_dist
+        else:
+            dist = _distance(odx, ody)
+        config = self.config
+        lut = falloff.tables(config)
+
+        # ── hunger — inverse of energy, suppressed by satiation ──────
+        hunger = np.clip(1.0 - (self.energy / 100.0), 0.0, 1.0)
+        satiation = np.maximum(0.0, c[:, SATIATION] - config.SATIATION_DECAY)
+        hunger = np.maximum(0.0, hunger - satiation * 0.5)
+
+        # ── fear — proximity to partner and predator ─────────────────
+        max_dist = math.hypot(config.GRID_SIZE, config.GRID_SIZE)
+        fear = np.where(has, np.clip(1.0 - (dist / max_dist), 0.0, 1.0), 0.0)
+        hunted, pdx, pdy = self.nearest_predators(predator, geometry)
+        pred_alive = hunted.any()
+        if pred_alive:
+            pred_fear = lut.predator_fear.take(pdx, pdy)
+            fear = np.where(hunted, np.minimum(
+                1.0, fear + pred_fear * config.PREDATOR_FEAR_BOOST), fear)
+        fear *= (1.0 - hunger ** 2 * 0.9)
+
+        # ── curiosity — rises in new cells, decays in known ──────────
+        here = (np.flatnonzero(live), self.y[live], self.x[live])
+        new_cell = np.zeros(len(self), dtype=bool)
+        new_cell[live] = ~self.visited[here]
+        self.visited[here] = True
+        self._explore(*here)
+        curiosity = np.where(
+            new_cell,
+            np.minimum(1.0, c[:, CURIOSITY] + 0.15),
+            np.maximum(0.0, c[:, CURIOSITY] - config.CURIOSITY_GAIN),
+        )
+        curiosity = np.maximum(0.0, curiosity - fear * 0.4)
+
+        # ── aggression — partner proximity × territory density ───────
+        path_density = np.zeros(len(self))
+        rows = np.flatnonzero(has)
+        path_density[rows] = territory_density(
+            self.pathways, rows, px[rows], py[rows],
+            config.PATHWAY_TERRITORY_RADIUS,
+        )
+        proximity_pressure = lut.aggression.take(odx, ody)
+        aggression = np.where(has, np.clip(
+            c[:, AGGRESSION] * 0.95
+            + proximity_pressure * path_density * 0.1, 0.0, 1.0,
+        ), c[:, AGGRESSION])
+        fatigue = c[:, FATIGUE]
+        aggression = np.maximum(0.0, aggression - fatigue * 0.3)
+        curiosity = np.maximum(0.0, curiosity - fatigue * 0.3)
+
+        # ── alertness — fear and predator proximity ──────────────────
+        alert_input = fear * 0.5
+        if pred_alive:
+            alert_input = np.where(hunted, alert_input + pred_fear * 0.5,
+                                   alert_input)
+        alertness = np.clip(
+            c[:, ALERTNESS] * 0.9 + alert_input * 0.3, 0.0, 1.0
+        )
+        satiation = satiation * (1.0 - alertness * 0.25)
+
+        # ── comfort — familiarity × satedness × safety ───────────────
+        # the current cell was just added to visited: familiarity is 1
+        comfort_input = 1.0 * (1.0 - hunger) * (1.0 - fear)
+        comfort = np.clip(c[:, COMFORT] * 0.97 + comfort_input * 0.03,
+                          0.0, 1.0)
+        fear = np.maximum(0.0, fear - comfort * 0.3)
+
+        # ── urgency, memory consolidation ────────────────────────────
+        urgency = np.minimum(1.0, c[:, URGENCY] * 0.95 + hunger * fear * 1.5)
+        consolidation = np.minimum(
+            1.0,
+            c[:, MEMORY_CONSOLIDATION] * 0.97
+            + fatigue * (1.0 - hunger) * 0.04,
+        )
+
+        # ── social — partner proximity × hunger compatibility ────────
+        proximity_social = lut.social.take(odx, ody)
+        partner_hunger = np.where(has, old_hunger[partners], 0.0)
+        hunger_compat = (1.0 - hunger) * (1.0 - partner_hunger)
+        social_input = proximity_social * (hunger_compat * 2.0 - 1.0)
+        social = np.where(has, np.clip(
+            c[:, SOCIAL] * 0.99 + social_input * 0.03, -1.0, 1.0,
+        ), c[:, SOCIAL])
+
+        # ── stress — inverse of energy, accumulates ──────────────────
+        energy_pressure = np.maximum(0.0, 1.0 - self.energy / 50.0)
+        stress = np.clip(c[:, STRESS] * 0.999 + energy_pressure * 0.01,
+                         0.0, 1.0)
+
+        updated = np.stack([
+            hunger, fear, curiosity, satiation, aggression, fatigue,
+            alertness, comfort, urgency, consolidation, social, stress,
+        ], axis=1)
+        c[live] = updated[live]
+
+    # ── movement ─────────────────────────────────────────────────────────
+    def decide_moves(self, world, partners: np.ndarray | None = None,
+                     predator=None, noise: np.ndarray | None = None,
+                     geometry=None):
+        """Agent.decide_move for every agent: score all 8 neighbours of
+        all agents as one (N, 8) array. Returns target (xs, ys).
+
+        `noise` replaces the bulk uniform draw in [-1, 1) (scaled by each
+        agent's noise range). Ties go to the first best offset in
+        NEIGHBOUR_OFFSETS order; an agent whose best score is negative,
+        or who is dead, stays put. Each agent shies from its nearest
+        predator. A Geometry cache, when given, supplies partners and
+        predator offsets.
+        """
+        if geometry is not None:
+            partners = geometry.partners
+        elif partners is None:
+            partners = self.nearest_partners()
+        n = len(self)
+        c = self.chem
+        hunger, fear = c[:, HUNGER], c[:, FEAR]
+
+        config = self.config
+        hunger_w = hunger * config.HUNGER_WEIGHT_MULTIPLIER
+        fear_w = fear * config.FEAR_WEIGHT_MULTIPLIER
+        curiosity_w = c[:, CURIOSITY] * config.CURIOSITY_WEIGHT_MULTIPLIER
+        hunger_w *= (1.0 + c[:, URGENCY])
+        fear_w *= (1.0 - c[:, URGENCY] * 0.7)
+        curiosity_w *= (1.0 - c[:, FATIGUE] * 0.7)
+        noise_range = config.RANDOM_NOISE_RANGE + c[:, STRESS] * 0.15
+
+        nx = self.x[:, None] + _DX
+        ny = self.y[:, None] + _DY
+        values = world.values_at(nx, ny)
+        inside = world.inside_at(nx, ny)
+
+        # world layers
+        score = values[LAYER_SCENT] * hunger_w[:, None]
+        score += (values[LAYER_FOOD_MARKERS] * config.FOOD_MARKER_WEIGHT
+                  * hunger[:, None])
+        score -= (values[LAYER_ALARM_MARKERS] * config.ALARM_MARKER_WEIGHT
+                  * fear[:, None])
+
+        # nearest neighbour repulsion, eased by positive social; the
+        # masks are skipped when every agent has a partner / a predator,
+        # which is the common case and leaves the result unchanged
+        has = (partners >= 0) & self.alive
+        has[has] = self.alive[partners[has]]
+        fear_w = fear_w[:, None]
+        lut = falloff.tables(config)
+        proximity = lut.repulsion.take(nx - self.x[partners][:, None],
+                                       ny - self.y[partners][:, None])
+        repulsion = proximity * fear_w
+        social = np.maximum(0.0, c[:, SOCIAL])[:, None]
+        easing = proximity * social * 0.3
+        if has.all():
+            score -= repulsion
+            score += easing
+        else:
+            has = has[:, None]
+            score -= np.where(has, repulsion, 0.0)
+            score += np.where(has, easing, 0.0)
+
+        # repulsion from the nearest predator, zero beyond its sense range
+        hunted, pdx, pdy = self.nearest_predators(predator, geometry)
+        if hunted.any():
+            pred_prox = lut.predator_repulsion.take(pdx[:, None] + _DX,
+                                                    pdy[:, None] + _DY)
+            pressure = pred_prox * fear_w * 2.0
+            score -= (pressure if hunted.all()
+                      else np.where(hunted[:, None], pressure, 0.0))
+
+        # unexplored / pathway / comfort terms from each agent's memory
+        edge = config.GRID_SIZE - 1
+        rows = np.arange(n)
+        cells = (rows[:, None], np.minimum(np.maximum(ny, 0), edge),
+                 np.minimum(np.maximum(nx, 0), edge))
+        visited = self.visited[cells]
+        pathway = self.pathways[cells].astype(np.float64)
+        score += np.where(visited, 0.0, curiosity_w[:, None])
+        score += pathway * config.PATHWAY_WEIGHT
+        score += np.where(visited, c[:, COMFORT][:, None] * 0.1, 0.0)
+
+        # noise, drawn in bulk; stress widens it
+        if noise is None:
+            noise = self.rng.uniform(-1.0, 1.0, (n, 8))
+        score += noise * noise_range[:, None]
+
+        score[~inside] = -np.inf
+        best = np.argmax(score, axis=1)
+        move = self.alive & (score[rows, best] >= 0)
+        return (np.where(move, nx[rows, best], self.x),
+                np.where(move, ny[rows, best], self.y))
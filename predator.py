@@ -5,20 +5,33 @@ Moves toward nearest agent. Agents must sense and respond.
 """
 
 import math
+
+import numpy as np
 import config as cfg
+from spatial import SpatialHash
+
+# up to this many (hunter, living agent) pairs, attacks check every
+# pair directly; beyond it the spatial index is faster
+_DIRECT_ATTACK_PAIRS = 4096
 
 
 class Predator:
     """Simple predator that moves toward the nearest living agent."""
 
-    def __init__(self, x: int, y: int):
+    def __init__(self, x: int, y: int, config: cfg.SimConfig | None = None):
+        self.config = cfg.DEFAULT if config is None else config
         self.x = x
         self.y = y
         self.alive = True
-        self.speed_interval = cfg.PREDATOR_SPEED  # moves every N ticks
+        self.speed_interval = self.config.PREDATOR_SPEED  # moves every N ticks
         self.trail: list[tuple[int, int]] = []
         self._trail_max = 25
 
+    def positions(self):
+        """(xs, ys, alive) arrays, as for a PredatorPack of one."""
+        return (np.array([self.x]), np.array([self.y]),
+                np.array([self.alive]))
+
     def update(self, agents, tick):
         """Move toward nearest living agent; attack if adjacent."""
         if tick % self.speed_interval != 0:
@@ -46,8 +59,8 @@ class Predator:
             self.y += 1 if dy > 0 else -1
 
         # clamp to grid
-        self.x = max(0, min(cfg.GRID_SIZE - 1, self.x))
-        self.y = max(0, min(cfg.GRID_SIZE - 1, self.y))
+        self.x = max(0, min(self.config.GRID_SIZE - 1, self.x))
+        self.y = max(0, min(self.config.GRID_SIZE - 1, self.y))
 
         # trail
         self.trail.append((self.x, self.y))
@@ -59,4 +72,86 @@ class Predator:
             if agent.alive:
                 d = math.hypot(self.x - agent.x, self.y - agent.y)
                 if d < 2.0:
-                    agent.energy -= cfg.PREDATOR_DAMAGE
+                    agent.energy -= self.config.PREDATOR_DAMAGE
+
+
+class PredatorPack:
+    """K predators held as arrays; each behaves like a Predator.
+
+    Every PREDATOR_SPEED ticks each live predator steps toward its nearest
+    living agent and then damages every living agent within reach. Targets
+    and victims come from a spatial index over the agents; a small pack
+    among few agents finds its victims with one direct distance check.
+    """
+
+    def __init__(self, xs, ys, config: cfg.SimConfig | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        self.x = np.array(xs, dtype=np.int64)
+        self.y = np.array(ys, dtype=np.int64)
+        self.alive = np.ones(self.x.size, dtype=bool)
+        self.speed_interval = self.config.PREDATOR_SPEED  # moves every N ticks
+        self.trails: list[list[tuple[int, int]]] = [[] for _ in self.x]
+        self._trail_max = 25
+
+    def __len__(self) -> int:
+        return self.x.size
+
+    def positions(self):
+        """(xs, ys, alive) arrays."""
+        return self.x, self.y, self.alive
+
+    def update(self, agents, tick, geometry=None):
+        """Move every predator toward its nearest living agent; attack.
+
+        `geometry`, when given, must be fresh for the agents' positions:
+        its agent index answers the queries, and it is told where the
+        pack moved.
+        """
+        if tick % self.speed_interval != 0:
+            return
+        if geometry is not None:
+            index = geometry.index
+        else:
+            index = SpatialHash([a.x for a in agents], [a.y for a in agents],
+                                self.config.GRID_SIZE,
+                                active=[a.alive for a in agents])
+
+        # each live predator hunts its nearest living agent
+        live = np.flatnonzero(self.alive)
+        targets = index.nearest(self.x[live], self.y[live])
+        hunting = live[targets >= 0]
+        targets = targets[targets >= 0]
+        if not hunting.size:
+            return
+
+        # one step along the longer axis (y on ties), clamped to the grid
+        dx = index.xs[targets] - self.x[hunting]
+        dy = index.ys[targets] - self.y[hunting]
+        along_x = np.abs(dx) > np.abs(dy)
+        edge = self.config.GRID_SIZE - 1
+        self.x[hunting] = np.clip(self.x[hunting]
+                                  + np.where(along_x, np.sign(dx), 0), 0, edge)
+        self.y[hunting] = np.clip(self.y[hunting]
+                                  + np.where(along_x, 0, np.sign(dy)), 0, edge)
+
+        # trails
+        for k, x, y in zip(hunting.tolist(), self.x[hunting].tolist(),
+                           self.y[hunting].tolist()):
+            trail = self.trails[k]
+            trail.append((x, y))
+            if len(trail) > self._trail_max:
+                trail.pop(0)
+        if geometry is not None:
+            geometry.update_predators(self.x, self.y, self.alive)
+
+        # attack every living agent within reach, once per predator
+        px, py = self.x[hunting], self.y[hunting]
+        if hunting.size * len(index) <= _DIRECT_ATTACK_PAIRS:
+            living = index.members
+            dx = index.xs[living] - px[:, None]
+            dy = index.ys[living] - py[:, None]
+            victims = living[np.nonzero(dx * dx + dy * dy < 4)[1]]
+        else:
+            _, victims = index.within(px, py, 2.0)
+        for i in victims.tolist():
+            agents[i].energy -= self.config.PREDATOR_DAMAGE
@@ -4,6 +4,7 @@ Pygame visualisation: seasonal grid, agents, markers, predator, sidebar.
 """
 
 import math
+import numpy as np
 import pygame
 import config as cfg
 
@@ -40,10 +41,11 @@ SEASON_LABEL_COLOR = {
 class Renderer:
     """Draws the GENESIS world each frame."""
 
-    def __init__(self):
+    def __init__(self, config: cfg.SimConfig | None = None):
+        self.config = cfg.DEFAULT if config is None else config
         pygame.init()
         self.screen = pygame.display.set_mode(
-            (cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)
+            (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)
         )
         pygame.display.set_caption("GENESIS v2 — Emergent Intelligence")
         self.clock = pygame.time.Clock()
@@ -66,7 +68,7 @@ class Renderer:
 
         # trail surface
         self._trail_surf = pygame.Surface(
-            (cfg.GRID_PIXEL_SIZE, cfg.GRID_PIXEL_SIZE), pygame.SRCALPHA
+            (self.config.GRID_PIXEL_SIZE,) * 2, pygame.SRCALPHA
         )
 
     # ── helpers ──────────────────────────────────────────────────────────
@@ -83,33 +85,92 @@ class Renderer:
 
     # ── main draw ────────────────────────────────────────────────────────
     def draw(self, world, agents, tick, paused, speed_mult,
-             predator=None):
+             predators=None, tick_rate: float | None = None):
+        """One frame. `world` and the entities may be a runner Snapshot's
+        copies, with positions blended between ticks; `tick_rate` is the
+        measured ticks per second, shown when given."""
         # seasonal background
-        bg = cfg.SEASON_SKY_COLOR.get(world.get_season(), (10, 10, 15))
+        bg = self.config.SEASON_SKY_COLOR.get(world.get_season(), (10, 10, 15))
         self.screen.fill(bg)
 
         self._draw_grid(world)
         self._draw_markers(world)
-        self._draw_trails(agents, predator)
+        self._draw_trails(agents, predators)
         self._draw_agents(agents)
-        if predator is not None:
-            self._draw_predator(predator, tick)
+        if predators is not None:
+            for k in range(len(predators)):
+                if predators.alive[k]:
+                    self._draw_predator(float(predators.x[k]),
+                                        float(predators.y[k]), tick)
         self._draw_flashes()
         if self.debug:
             self._draw_debug(world, agents)
         self._draw_sidebar(world, agents, tick, paused, speed_mult,
-                           predator)
+                           predators, tick_rate)
+        pygame.display.flip()
+
+    def draw_fast_forward(self, tick, label, progress, tick_rate):
+        """Progress-only frame while fast-forwarding: the sidebar is
+        redrawn and the grid keeps its last picture. `progress` is 0–1,
+        or None for an open-ended target."""
+        sx = self.config.GRID_PIXEL_SIZE
+        sw = self.config.SCREEN_WIDTH - sx
+        sh = self.config.SCREEN_HEIGHT
+        pad = sx + 10
+
+        pygame.draw.rect(self.screen, SIDEBAR_BG, (sx, 0, sw, sh))
+        pygame.draw.line(self.screen, DIVIDER, (sx, 0), (sx, sh), 2)
+        pygame.draw.rect(self.screen, HEADER_BG, (sx, 0, sw, 44))
+        title = self.font_title.render("FAST-FORWARD", True, TEXT_COLOR)
+        self.screen.blit(title, (sx + sw // 2 - title.get_width() // 2, 10))
+
+        y_pos = 54
+        for text, font, color in (
+            (label, self.font_md, TEXT_COLOR),
+            (f"Tick: {tick}", self.font_lg, TEXT_COLOR),
+            (f"Ticks/s: {tick_rate:.0f}", self.font_sm, TEXT_DIM),
+        ):
+            surf = font.render(text, True, color)
+            self.screen.blit(surf, (pad, y_pos))
+            y_pos += font.get_linesize() + 4
+
+        if progress is not None:
+            bar_w = sw - 20
+            pygame.draw.rect(self.screen, (30, 30, 35),
+                             (pad, y_pos, bar_w, 8), border_radius=3)
+            pygame.draw.rect(self.screen, TEXT_ACCENT_BLUE,
+                             (pad, y_pos, int(bar_w * progress), 8),
+                             border_radius=3)
+            y_pos += 14
+            pct = self.font_sm.render(f"{progress:.0%}", True, TEXT_DIM)
+            self.screen.blit(pct, (pad, y_pos))
+            y_pos += 16
+
+        hint = self.font_sm.render("F to stop", True, TEXT_DIM)
+        self.screen.blit(hint, (pad, y_pos))
+        y_pos += 20
+
+        pygame.draw.line(
+            self.screen, DIVIDER, (pad, y_pos), (sx + sw - 10, y_pos)
+        )
+        y_pos += 5
+        for line in self._event_log:
+            surf = self.font_sm.render(line[:38], True, TEXT_DIM)
+            self.screen.blit(surf, (pad, y_pos))
+            y_pos += 13
         pygame.display.flip()
 
     # ── grid ─────────────────────────────────────────────────────────────
     def _draw_grid(self, world):
-        cs = cfg.CELL_SIZE
-        for y in range(cfg.GRID_SIZE):
-            for x in range(cfg.GRID_SIZE):
+        cs = self.config.CELL_SIZE
+        scent = world.read_layer("scent")
+        food = world.read_layer("food")
+        for y in range(self.config.GRID_SIZE):
+            for x in range(self.config.GRID_SIZE):
                 px, py = x * cs, y * cs
 
                 # scent tint
-                s = world.scent[y, x]
+                s = scent[y, x]
                 if s > 0.01:
                     tint = (
                         int(SCENT_TINT[0] * s),
@@ -119,7 +180,7 @@ class Renderer:
                     pygame.draw.rect(self.screen, tint, (px, py, cs, cs))
 
                 # food dot
-                f = world.food[y, x]
+                f = food[y, x]
                 if f > 0.05:
                     # autumn/winter: food tints orange
                     season = world.get_season()
@@ -140,11 +201,13 @@ class Renderer:
 
     # ── markers ──────────────────────────────────────────────────────────
     def _draw_markers(self, world):
-        cs = cfg.CELL_SIZE
-        for y in range(cfg.GRID_SIZE):
-            for x in range(cfg.GRID_SIZE):
+        cs = self.config.CELL_SIZE
+        food_markers = world.read_layer("food_markers")
+        alarm_markers = world.read_layer("alarm_markers")
+        for y in range(self.config.GRID_SIZE):
+            for x in range(self.config.GRID_SIZE):
                 # food markers (gold)
-                fm = world.food_markers[y, x]
+                fm = food_markers[y, x]
                 if fm > 0.02:
                     alpha = int(min(120, fm * 150))
                     surf = pygame.Surface((cs, cs), pygame.SRCALPHA)
@@ -152,7 +215,7 @@ class Renderer:
                     self.screen.blit(surf, (x * cs, y * cs))
 
                 # alarm markers (red)
-                am = world.alarm_markers[y, x]
+                am = alarm_markers[y, x]
                 if am > 0.02:
                     alpha = int(min(100, am * 130))
                     surf = pygame.Surface((cs, cs), pygame.SRCALPHA)
@@ -160,9 +223,9 @@ class Renderer:
                     self.screen.blit(surf, (x * cs, y * cs))
 
     # ── trails ───────────────────────────────────────────────────────────
-    def _draw_trails(self, agents, predator=None):
+    def _draw_trails(self, agents, predators=None):
         self._trail_surf.fill((0, 0, 0, 0))
-        cs = cfg.CELL_SIZE
+        cs = self.config.CELL_SIZE
         for agent in agents:
             if not agent.trail:
                 continue
@@ -172,10 +235,10 @@ class Renderer:
                 c = (color[0], color[1], color[2], alpha)
                 rect = pygame.Rect(tx * cs + 2, ty * cs + 2, cs - 4, cs - 4)
                 pygame.draw.rect(self._trail_surf, c, rect, border_radius=2)
-        # predator trail
-        if predator is not None:
-            for i, (tx, ty) in enumerate(predator.trail):
-                alpha = int(30 + 40 * (i / max(len(predator.trail), 1)))
+        # predator trails
+        for trail in (predators.trails if predators is not None else []):
+            for i, (tx, ty) in enumerate(trail):
+                alpha = int(30 + 40 * (i / max(len(trail), 1)))
                 c = (PREDATOR_TRAIL[0], PREDATOR_TRAIL[1],
                      PREDATOR_TRAIL[2], alpha)
                 rect = pygame.Rect(tx * cs + 1, ty * cs + 1, cs - 2, cs - 2)
@@ -184,7 +247,7 @@ class Renderer:
 
     # ── agents ───────────────────────────────────────────────────────────
     def _draw_agents(self, agents):
-        cs = cfg.CELL_SIZE
+        cs = self.config.CELL_SIZE
         for agent in agents:
             if not agent.alive:
                 continue
@@ -201,7 +264,7 @@ class Renderer:
             # body
             pygame.draw.circle(self.screen, color, (cx, cy), cs // 2 + 1)
             # energy ring
-            energy_frac = max(0.0, agent.energy / cfg.ENERGY_MAX)
+            energy_frac = max(0.0, agent.energy / self.config.ENERGY_MAX)
             pygame.draw.arc(
                 self.screen, (255, 255, 255),
                 (cx - cs // 2 - 2, cy - cs // 2 - 2, cs + 4, cs + 4),
@@ -209,10 +272,10 @@ class Renderer:
             )
 
     # ── predator ─────────────────────────────────────────────────────────
-    def _draw_predator(self, predator, tick):
-        cs = cfg.CELL_SIZE
-        cx = predator.x * cs + cs // 2
-        cy = predator.y * cs + cs // 2
+    def _draw_predator(self, x, y, tick):
+        cs = self.config.CELL_SIZE
+        cx = x * cs + cs // 2
+        cy = y * cs + cs // 2
         # pulsing glow
         pulse = abs(math.sin(tick * 0.1)) * 0.5 + 0.5
         glow_r = int(cs * 1.5 * pulse)
@@ -234,7 +297,7 @@ class Renderer:
 
     # ── flashes ──────────────────────────────────────────────────────────
     def _draw_flashes(self):
-        cs = cfg.CELL_SIZE
+        cs = self.config.CELL_SIZE
         done = []
         for (x, y), frames in self._flashes.items():
             alpha = int(200 * (frames / 6))
@@ -249,23 +312,25 @@ class Renderer:
 
     # ── debug overlay ────────────────────────────────────────────────────
     def _draw_debug(self, world, agents):
-        cs = cfg.CELL_SIZE
+        cs = self.config.CELL_SIZE
         for agent in agents:
             color = (TEXT_ACCENT_BLUE if agent.color_name == "blue"
                      else TEXT_ACCENT_RED)
-            for (px, py), strength in agent.pathways.items():
-                if strength > 0.02:
-                    alpha = int(min(255, strength * 255))
-                    surf = pygame.Surface((cs, cs), pygame.SRCALPHA)
-                    surf.fill((*color[:3], alpha // 2))
-                    self.screen.blit(surf, (px * cs, py * cs))
+            grid = agent.pathways
+            ys, xs = np.nonzero(grid > 0.02)
+            for px, py, strength in zip(xs.tolist(), ys.tolist(),
+                                        grid[ys, xs].tolist()):
+                alpha = int(min(255, strength * 255))
+                surf = pygame.Surface((cs, cs), pygame.SRCALPHA)
+                surf.fill((*color[:3], alpha // 2))
+                self.screen.blit(surf, (px * cs, py * cs))
 
     # ── sidebar ──────────────────────────────────────────────────────────
     def _draw_sidebar(self, world, agents, tick, paused, speed_mult,
-                      predator=None):
-        sx = cfg.GRID_PIXEL_SIZE
-        sw = cfg.SCREEN_WIDTH - sx
-        sh = cfg.SCREEN_HEIGHT
+                      predators=None, tick_rate=None):
+        sx = self.config.GRID_PIXEL_SIZE
+        sw = self.config.SCREEN_WIDTH - sx
+        sh = self.config.SCREEN_HEIGHT
 
         # background
         pygame.draw.rect(self.screen, SIDEBAR_BG, (sx, 0, sw, sh))
@@ -301,7 +366,8 @@ class Renderer:
         y_pos += 12
 
         s_tick = self.font_sm.render(
-            f"Season tick: {world.get_season_tick()}/{cfg.SEASON_LENGTH}",
+            f"Season tick: {world.get_season_tick()}/"
+            f"{self.config.SEASON_LENGTH}",
             True, TEXT_DIM,
         )
         self.screen.blit(s_tick, (pad, y_pos))
@@ -313,10 +379,11 @@ class Renderer:
         y_pos += 6
 
         # ── agent stats ──────────────────────────────────────────────
-        for agent in agents:
+        shown = agents[:self.config.SIDEBAR_MAX_AGENTS]
+        for agent in shown:
             color = (TEXT_ACCENT_BLUE if agent.color_name == "blue"
                      else TEXT_ACCENT_RED)
-            label = f"AGENT {'A' if agent.id == 0 else 'B'}  Gen {agent.generation}"
+            label = f"AGENT {agent.label}  Gen {agent.generation}"
             if not agent.alive:
                 label += " [DEAD]"
             hdr = self.font_md.render(label, True, color)
@@ -326,7 +393,7 @@ class Renderer:
             # energy bar
             bar_w = sw - 20
             bar_h = 8
-            frac = max(0.0, agent.energy / cfg.ENERGY_MAX)
+            frac = max(0.0, agent.energy / self.config.ENERGY_MAX)
             pygame.draw.rect(
                 self.screen, (35, 35, 40),
                 (pad, y_pos, bar_w, bar_h), border_radius=3,
@@ -347,7 +414,7 @@ class Renderer:
                 (f"Ftg:{chems['fatigue']:.2f}", f"Alt:{chems['alertness']:.2f}"),
                 (f"Cmf:{chems['comfort']:.2f}", f"Urg:{chems['urgency']:.2f}"),
                 (f"Mem:{chems['memory_consolidation']:.2f}", f"Soc:{chems['social']:+.2f}"),
-                (f"Str:{chems['stress']:.2f}", f"Pw:{len(agent.pathways)}"),
+                (f"Str:{chems['stress']:.2f}", f"Pw:{agent.pathway_count}"),
             ]
             col_w = (sw - 20) // 2
             for left, right in chem_pairs:
@@ -368,17 +435,32 @@ class Renderer:
             )
             y_pos += 5
 
+        hidden = len(agents) - len(shown)
+        if hidden > 0:
+            alive = sum(1 for a in agents if a.alive)
+            more = self.font_sm.render(
+                f"+{hidden} more agents  ({alive}/{len(agents)} alive)",
+                True, TEXT_DIM,
+            )
+            self.screen.blit(more, (pad, y_pos))
+            y_pos += 16
+
         # ── sim info ─────────────────────────────────────────────────
         state = "PAUSED" if paused else "RUNNING"
+        speed = "MAX" if math.isinf(speed_mult) else f"{speed_mult:.1f}x"
         info_lines = [
             f"Tick: {tick}   {state}",
-            f"Speed: {speed_mult:.1f}x  FPS: {self.clock.get_fps():.0f}",
+            f"Speed: {speed}  FPS: {self.clock.get_fps():.0f}",
             f"Food on grid: {world.get_total_food():.0f}",
         ]
-        if predator is not None:
+        if tick_rate is not None:
+            info_lines.insert(2, f"Ticks/s: {tick_rate:.0f}")
+        if predators is not None and len(predators) == 1:
             info_lines.append(
-                f"Predator: ({predator.x},{predator.y})"
+                f"Predator: ({predators.x[0]:.0f},{predators.y[0]:.0f})"
             )
+        elif predators is not None:
+            info_lines.append(f"Predators: {int(predators.alive.sum())}")
         for line in info_lines:
             surf = self.font_sm.render(line, True, TEXT_DIM)
             self.screen.blit(surf, (pad, y_pos))
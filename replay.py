@@ -0,0 +1,454 @@
+"""
+GENESIS — Replays
+Record a run as a compact per-tick delta stream and play it back through
+the renderer without simulating.
+
+    python main.py --headless --ticks 50000 --seed 1 --record data/run.npz
+    python main.py --replay data/run.npz
+
+Each tick stores agent and predator positions with the few per-agent
+numbers the sidebar shows, the tick's events, and the food and scent
+cells whose 8-bit display value changed, as the gap from the previous
+changed cell and the step from the previous value so the chunks
+deflate well. Markers are only ever written
+where agents act, so each tick keeps the marker values under the agents
+and at each event's cell (an agent that died there was replaced by its
+offspring at the spawn point), and playback decays them like the world
+does. A full keyframe
+every `keyframe_every` ticks makes seeking cheap.
+"""
+
+import zipfile
+
+import numpy as np
+from agent import ChemicalView, agent_label
+from checkpoint import config_from_json, config_to_json
+from predator import PredatorPack
+from runner import WorldView
+
+EVENT_KINDS = ("season", "ate", "died", "born")
+# layers kept as changed cells; food and scent are stored as
+# round(value · 255)
+_CODED = ("food", "scent")
+_LEVELS = 255
+_MARKERS = ("food_markers", "alarm_markers")
+# positions looked back over to rebuild trails
+_TRAIL_LOOKBACK = 4
+# per-frame arrays and the dtype each is stored in
+_FRAME_DTYPES = {
+    "tick": np.int64, "season": np.uint8, "total_food": np.float32,
+    "agent_x": np.int16, "agent_y": np.int16, "agent_alive": bool,
+    "agent_energy": np.float32, "agent_chem": np.float16,
+    "agent_generation": np.int32, "agent_food": np.int32,
+    "agent_paths": np.int32, "agent_markers": np.float32,
+    "predator_x": np.int16, "predator_y": np.int16, "predator_alive": bool,
+}
+
+
+def _append_arrays(path: str, mode: str, arrays: dict):
+    """Add arrays to the .npz zip at `path` as np.savez_compressed
+    would; the file is a complete archive again when this returns."""
+    with zipfile.ZipFile(path, mode, compression=zipfile.ZIP_DEFLATED,
+                         allowZip64=True) as archive:
+        for name, array in arrays.items():
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as out:
+                np.lib.format.write_array(out, np.asanyarray(array),
+                                          allow_pickle=False)
+
+
+# ── recording ────────────────────────────────────────────────────────────
+class ReplayRecorder:
+    """Streams one frame per Simulation tick to `path`.
+
+    Attach with `sim.recorder = ReplayRecorder(path, sim)` and the
+    simulation records itself after every step. Frames are buffered from
+    one keyframe to the next and then appended to the file as a chunk, so
+    memory stays flat and a killed run keeps every finished chunk;
+    close() writes the last, partial one. Ticks must advance by one; a
+    reset or loaded checkpoint needs a new recorder.
+    """
+
+    def __init__(self, path: str, sim, keyframe_every: int = 250):
+        self.path = path
+        self.config = sim.config
+        self.keyframe_every = keyframe_every
+        self.ids = [a.id for a in sim.agents]
+        self.colors = [a.color_name for a in sim.agents]
+        self._slots = {a.label: i for i, a in enumerate(sim.agents)}
+        size = sim.config.GRID_SIZE
+        self._codes = np.zeros((len(_CODED), size, size), dtype=np.uint8)
+        self._gap_dtype = (np.uint16 if self._codes.size <= 1 << 16
+                           else np.uint32)
+        self._recorded = 0
+        self._chunks = 0
+        self._last_tick: int | None = None
+        self._clear()
+        _append_arrays(path, "w", {
+            "config": np.array(config_to_json(self.config)),
+            "ids": np.array(self.ids, dtype=np.int64),
+            "colors": np.array(self.colors),
+        })
+        self.record(sim, [])
+
+    def __len__(self) -> int:
+        return self._recorded
+
+    def _clear(self):
+        """Empty the buffers of the chunk being recorded."""
+        self._frames: dict[str, list] = {name: [] for name in _FRAME_DTYPES}
+        self._events: list[tuple] = []
+        self._change_gaps: list[np.ndarray] = []
+        self._change_steps: list[np.ndarray] = []
+        self._keyframes: list[int] = []
+        self._key_layers: list[np.ndarray] = []
+        self._key_markers: list[np.ndarray] = []
+
+    def record(self, sim, events: list[dict]):
+        """Append the state after sim's latest tick and its events."""
+        if self._last_tick is not None and sim.tick != self._last_tick + 1:
+            raise ValueError(f"replay expects tick {self._last_tick + 1}, "
+                             f"got {sim.tick}")
+        index = self._recorded
+        if index and index % self.keyframe_every == 0:
+            self.flush()
+        self._last_tick = sim.tick
+        self._recorded += 1
+        frames = self._frames
+        world = sim.world
+        agents = sim.agents
+        frames["tick"].append(sim.tick)
+        frames["season"].append(world.season_index)
+        frames["total_food"].append(world.get_total_food())
+        frames["agent_x"].append([a.x for a in agents])
+        frames["agent_y"].append([a.y for a in agents])
+        frames["agent_alive"].append([a.alive for a in agents])
+        frames["agent_energy"].append([a.energy for a in agents])
+        frames["agent_chem"].append(np.array([a.chem for a in agents],
+                                             dtype=np.float16))
+        frames["agent_generation"].append([a.generation for a in agents])
+        frames["agent_food"].append([a.food_eaten for a in agents])
+        frames["agent_paths"].append([a.pathway_count for a in agents])
+        frames["agent_markers"].append(
+            [(world.get_food_marker(a.x, a.y),
+              world.get_alarm_marker(a.x, a.y)) for a in agents]
+        )
+        predators = sim.predators
+        frames["predator_x"].append(predators.x.copy())
+        frames["predator_y"].append(predators.y.copy())
+        frames["predator_alive"].append(predators.alive.copy())
+
+        for ev in events:
+            self._events.append(self._pack_event(index, ev, world))
+
+        # food and scent at display precision: cells whose code moved
+        codes = np.stack([world.read_layer(name) for name in _CODED])
+        codes = np.rint(np.clip(codes, 0.0, 1.0) * _LEVELS).astype(np.uint8)
+        changed = np.flatnonzero(codes != self._codes)
+        self._change_gaps.append(np.diff(changed, prepend=0))
+        self._change_steps.append(codes.ravel()[changed]
+                                   - self._codes.ravel()[changed])
+        self._codes = codes
+        if index % self.keyframe_every == 0:
+            self._keyframes.append(index)
+            self._key_layers.append(codes)
+            self._key_markers.append(
+                np.stack([world.read_layer(name) for name in _MARKERS])
+            )
+
+    def _pack_event(self, index: int, ev: dict, world) -> tuple:
+        """(frame, kind, slot, x, y, value, extra, food marker, alarm
+        marker) row for one event; the markers are read at (x, y)."""
+        kind = ev["type"]
+        slot = self._slots.get(ev.get("label"), -1)
+        if kind == "season":
+            value = self.config.SEASONS.index(ev["season"])
+            extra = 0
+        elif kind == "ate":
+            value, extra = ev["energy"], 0
+        elif kind == "died":
+            value, extra = ev["generation"], ev["age"]
+        else:
+            value, extra = ev["generation"], ev["pathways"]
+        x, y = ev.get("x", -1), ev.get("y", -1)
+        markers = ((world.get_food_marker(x, y), world.get_alarm_marker(x, y))
+                   if x >= 0 else (0.0, 0.0))
+        return (index, EVENT_KINDS.index(kind), slot, x, y, value, extra,
+                *markers)
+
+    def flush(self):
+        """Append the frames buffered since the last chunk to the file."""
+        if not self._frames["tick"]:
+            return
+        events = np.array(self._events, dtype=np.float64).reshape(-1, 9)
+        arrays = {name: np.array(values, dtype=_FRAME_DTYPES[name])
+                  for name, values in self._frames.items()}
+        arrays.update(
+            event_frame=events[:, 0].astype(np.int64),
+            event_kind=events[:, 1].astype(np.uint8),
+            event_slot=events[:, 2].astype(np.int32),
+            event_x=events[:, 3].astype(np.int16),
+            event_y=events[:, 4].astype(np.int16),
+            event_value=events[:, 5].astype(np.float32),
+            event_extra=events[:, 6].astype(np.int32),
+            event_markers=events[:, 7:].astype(np.float32),
+            change_count=np.array([c.size for c in self._change_gaps],
+                                  dtype=np.int64),
+            change_gap=np.concatenate(self._change_gaps).astype(
+                self._gap_dtype),
+            change_step=np.concatenate(self._change_steps),
+            keyframes=np.array(self._keyframes, dtype=np.int64),
+            key_layers=np.array(self._key_layers, dtype=np.uint8),
+            key_markers=np.array(self._key_markers, dtype=np.float32),
+        )
+        _append_arrays(self.path, "a", {
+            f"{self._chunks:06d}/{name}": array
+            for name, array in arrays.items()
+        })
+        self._chunks += 1
+        self._clear()
+
+    def close(self):
+        """Write the frames still buffered; the file is then complete."""
+        self.flush()
+
+
+# ── playback ─────────────────────────────────────────────────────────────
+class AgentView:
+    """What the renderer reads from an agent, rebuilt from a replay."""
+
+    def __init__(self, agent_id: int, color_name: str, x: int, y: int,
+                 alive: bool, energy: float, chem: np.ndarray,
+                 generation: int, food_eaten: int, pathway_count: int,
+                 trail: list, pathways: np.ndarray):
+        self.id = agent_id
+        self.color_name = color_name
+        self.x = x
+        self.y = y
+        self.alive = alive
+        self.energy = energy
+        self.chem = chem
+        self.generation = generation
+        self.food_eaten = food_eaten
+        self.pathway_count = pathway_count
+        self.trail = trail
+        # not recorded; the debug overlay shows nothing in playback
+        self.pathways = pathways
+
+    @property
+    def chemicals(self) -> ChemicalView:
+        return ChemicalView(self.chem)
+
+    @property
+    def label(self) -> str:
+        return agent_label(self.id)
+
+
+def _load_chunks(path: str) -> dict[str, np.ndarray]:
+    """A recorded file's arrays with its chunks joined end to end."""
+    data, parts = {}, {}
+    with np.load(path) as npz:
+        for name in sorted(npz.files):
+            chunk, _, field = name.rpartition("/")
+            if chunk:
+                parts.setdefault(field, []).append(npz[name])
+            else:
+                data[name] = npz[name]
+    if not parts:
+        raise ValueError(f"{path}: no frames recorded")
+    for field, arrays in parts.items():
+        data[field] = np.concatenate(arrays)
+    _decode_changes(data)
+    return data
+
+
+def _decode_changes(data: dict):
+    """Turn the recorded gaps and steps into change_cell (flat index)
+    and change_value (8-bit code), with change_start per frame."""
+    counts = data.pop("change_count")
+    start = np.concatenate(([0], np.cumsum(counts)))
+    # cells: running sum of the gaps, restarted at every frame
+    run = np.cumsum(data.pop("change_gap"), dtype=np.int64)
+    before = np.concatenate(([0], run))[start[:-1]]
+    cells = run - np.repeat(before, counts)
+    # values: running sum of each cell's steps, wrapping like uint8 did
+    steps = data.pop("change_step")
+    order = np.argsort(cells, kind="stable")
+    ordered = steps[order]
+    sums = np.cumsum(ordered, dtype=np.uint8)
+    by_cell = cells[order]
+    first = np.flatnonzero(np.concatenate(
+        ([True], by_cell[1:] != by_cell[:-1])))
+    lengths = np.diff(np.append(first, by_cell.size))
+    values = np.empty_like(steps)
+    values[order] = sums - np.repeat(sums[first] - ordered[first], lengths)
+    data["change_cell"] = cells
+    data["change_value"] = values
+    data["change_start"] = start
+
+
+class Replay:
+    """A recorded run, addressable by frame; frame i is the state after
+    tick `ticks[i]`.
+
+    Layers are rebuilt from the nearest keyframe plus the change stream
+    and marker deposits, and stepping forward one frame applies just
+    that frame's changes.
+    """
+
+    def __init__(self, path: str):
+        self.data = data = _load_chunks(path)
+        self.config = config_from_json(str(data["config"]))
+        self.ticks = data["tick"]
+        size = self.config.GRID_SIZE
+        self._codes = np.zeros((len(_CODED), size, size), dtype=np.uint8)
+        self._markers = np.zeros((len(_MARKERS), size, size),
+                                 dtype=np.float32)
+        self._marker_decay = np.array([1.0 - self.config.FOOD_MARKER_DECAY,
+                                       1.0 - self.config.ALARM_MARKER_DECAY])
+        self._at = -1
+        self._no_paths = np.zeros((size, size), dtype=np.float32)
+        self._agent_trail = 40
+        self._predator_trail = 25
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return self.ticks.size
+
+    def index_of(self, tick: int) -> int:
+        """Frame of the first recorded tick at or after `tick`."""
+        return int(min(len(self) - 1,
+                       np.searchsorted(self.ticks, tick, side="left")))
+
+    def seek(self, index: int):
+        """Bring the layers to frame `index`."""
+        index = max(0, min(len(self) - 1, index))
+        data = self.data
+        keyframes = data["keyframes"]
+        key = int(keyframes[np.searchsorted(keyframes, index, "right") - 1])
+        if not self._at <= index or key > self._at:
+            slot = np.searchsorted(keyframes, key)
+            self._codes[...] = data["key_layers"][slot]
+            self._markers[...] = data["key_markers"][slot]
+            self._at = key
+        if index == self._at:
+            return
+
+        start = data["change_start"]
+        lo, hi = start[self._at + 1], start[index + 1]
+        self._codes.reshape(-1)[data["change_cell"][lo:hi]] = (
+            data["change_value"][lo:hi]
+        )
+
+        # decay every marker, then put back what each frame left under
+        # the agents and at its events' cells, decayed by the frames
+        # since; later frames win
+        frames = np.arange(self._at + 1, index + 1)
+        n_agents = data["ids"].size
+        lo, hi = np.searchsorted(data["event_frame"], [frames[0], index + 1])
+        placed = np.flatnonzero(data["event_x"][lo:hi] >= 0) + lo
+        order = np.argsort(np.concatenate((np.repeat(frames, n_agents),
+                                           data["event_frame"][placed])),
+                           kind="stable")
+        xs = np.concatenate((data["agent_x"][frames].ravel(),
+                             data["event_x"][placed]))[order]
+        ys = np.concatenate((data["agent_y"][frames].ravel(),
+                             data["event_y"][placed]))[order]
+        ages = np.concatenate((np.repeat(index - frames, n_agents),
+                               index - data["event_frame"][placed]))[order]
+        values = np.concatenate((
+            data["agent_markers"][frames].reshape(-1, len(_MARKERS)),
+            data["event_markers"][placed],
+        ))[order] * np.power(self._marker_decay, ages[:, None])
+        self._markers *= (self._marker_decay ** frames.size)[:, None, None]
+        for plane in range(len(_MARKERS)):
+            self._markers[plane, ys, xs] = values[:, plane]
+        self._at = index
+
+    def frame(self, index: int) -> tuple:
+        """(world view, agents, predators, tick) for frame `index`."""
+        self.seek(index)
+        index = self._at
+        data = self.data
+        config = self.config
+        tick = int(self.ticks[index])
+        layers = {name: self._codes[i] / np.float32(_LEVELS)
+                  for i, name in enumerate(_CODED)}
+        layers.update(zip(_MARKERS, self._markers.copy()))
+        world = WorldView(config.SEASONS[int(data["season"][index])],
+                          tick % config.SEASON_LENGTH, config.SEASON_LENGTH,
+                          layers, float(data["total_food"][index]))
+
+        agents = []
+        for slot, agent_id in enumerate(data["ids"].tolist()):
+            agents.append(AgentView(
+                agent_id, str(data["colors"][slot]),
+                int(data["agent_x"][index, slot]),
+                int(data["agent_y"][index, slot]),
+                bool(data["agent_alive"][index, slot]),
+                float(data["agent_energy"][index, slot]),
+                data["agent_chem"][index, slot].astype(np.float64),
+                int(data["agent_generation"][index, slot]),
+                int(data["agent_food"][index, slot]),
+                int(data["agent_paths"][index, slot]),
+                self._trail(data["agent_x"][:, slot], data["agent_y"][:, slot],
+                            index, self._agent_trail,
+                            data["agent_generation"][:, slot]),
+                self._no_paths,
+            ))
+
+        predators = PredatorPack(data["predator_x"][index],
+                                 data["predator_y"][index], config)
+        predators.alive = data["predator_alive"][index].copy()
+        predators.trails = [
+            self._trail(data["predator_x"][:, k], data["predator_y"][:, k],
+                        index, self._predator_trail)
+            for k in range(len(predators))
+        ]
+        return world, agents, predators, tick
+
+    @staticmethod
+    def _trail(xs, ys, index: int, length: int, generation=None) -> list:
+        """Last `length` cells moved into up to frame `index`, within the
+        current life when `generation` is given."""
+        lo = max(0, index - length * _TRAIL_LOOKBACK)
+        if generation is not None:
+            born = np.flatnonzero(generation[lo:index + 1]
+                                  != generation[index])
+            if born.size:
+                lo += int(born[-1]) + 1
+        x = xs[lo:index + 1].astype(np.int64)
+        y = ys[lo:index + 1].astype(np.int64)
+        moved = np.flatnonzero((np.diff(x) != 0) | (np.diff(y) != 0)) + 1
+        return list(zip(x[moved].tolist(), y[moved].tolist()))[-length:]
+
+    def events(self, start: int, stop: int) -> list[dict]:
+        """Simulation-style event dicts for frames start ≤ i < stop."""
+        data = self.data
+        frames = data["event_frame"]
+        lo, hi = np.searchsorted(frames, [start, stop])
+        events = []
+        for row in range(lo, hi):
+            kind = EVENT_KINDS[data["event_kind"][row]]
+            tick = int(self.ticks[frames[row]])
+            slot = int(data["event_slot"][row])
+            label = agent_label(int(data["ids"][slot])) if slot >= 0 else ""
+            value = float(data["event_value"][row])
+            if kind == "season":
+                events.append({"type": kind, "tick": tick,
+                               "season": self.config.SEASONS[int(value)]})
+            elif kind == "ate":
+                events.append({"type": kind, "tick": tick, "label": label,
+                               "x": int(data["event_x"][row]),
+                               "y": int(data["event_y"][row]),
+                               "energy": value})
+            elif kind == "died":
+                events.append({"type": kind, "tick": tick, "label": label,
+                               "x": int(data["event_x"][row]),
+                               "y": int(data["event_y"][row]),
+                               "generation": int(value),
+                               "age": int(data["event_extra"][row])})
+            else:
+                events.append({"type": kind, "tick": tick, "label": label,
+                               "generation": int(value),
+                               "pathways": int(data["event_extra"][row])})
+        return events
@@ -0,0 +1,293 @@
+"""
+GENESIS — Simulation runner
+Runs a Simulation on a worker thread at a target or unlimited tick rate
+and publishes snapshots; the display reads the latest one at its own
+frame rate, so drawing never holds the simulation back.
+"""
+
+import copy
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from simulation import Simulation
+
+# longest the worker holds the simulation lock in one go (seconds)
+_SLICE = 1 / 60
+# a worker further behind its schedule than this drops the backlog
+_MAX_LAG = 0.25
+# events kept for the display between two reads
+_EVENT_BUFFER = 10_000
+
+
+class WorldView:
+    """Read-only copy of the world fields the renderer reads."""
+
+    def __init__(self, season: str, season_tick: int, season_length: int,
+                 layers: dict[str, np.ndarray], total_food: float):
+        self.season = season
+        self.season_tick = season_tick
+        self.season_length = season_length
+        self.layers = layers
+        self.total_food = total_food
+
+    @classmethod
+    def capture(cls, world) -> "WorldView":
+        layers = {name: np.array(world.read_layer(name))
+                  for name in ("food", "scent", "food_markers",
+                               "alarm_markers")}
+        return cls(world.get_season(), world.get_season_tick(),
+                   world.config.SEASON_LENGTH, layers,
+                   world.get_total_food())
+
+    def read_layer(self, name: str) -> np.ndarray:
+        return self.layers[name]
+
+    def get_season(self) -> str:
+        return self.season
+
+    def get_season_tick(self) -> int:
+        return self.season_tick
+
+    def get_season_progress(self) -> float:
+        return self.season_tick / self.season_length
+
+    def get_total_food(self) -> float:
+        return self.total_food
+
+
+class Snapshot:
+    """Everything Renderer.draw needs from one tick, copied so the worker
+    can keep stepping. `previous` holds the agent and predator positions
+    one tick earlier, for drawing in-between frames."""
+
+    def __init__(self, sim: Simulation, previous=None):
+        self.tick = sim.tick
+        self.time = time.perf_counter()
+        self.world = WorldView.capture(sim.world)
+        pathways = np.array([a.pathways for a in sim.agents])
+        self.agents = []
+        for agent, grid in zip(sim.agents, pathways):
+            view = copy.copy(agent)
+            view.chem = agent.chem.copy()
+            view.pathways = grid
+            view.trail = list(agent.trail)
+            self.agents.append(view)
+        pack = sim.predators
+        self.predators = copy.copy(pack)
+        self.predators.x = pack.x.copy()
+        self.predators.y = pack.y.copy()
+        self.predators.alive = pack.alive.copy()
+        self.predators.trails = [list(trail) for trail in pack.trails]
+        self.previous = previous
+
+    def frame(self, alpha: float) -> tuple[list, object]:
+        """(agents, predators) with positions blended `alpha` of the way
+        from the previous tick to this one. Jumps of more than one cell
+        (e.g. a birth at the spawn point) are not blended."""
+        if self.previous is None or alpha >= 1.0:
+            return self.agents, self.predators
+        ax, ay, px, py = self.previous
+        agents = []
+        for agent, x0, y0 in zip(self.agents, ax.tolist(), ay.tolist()):
+            if abs(agent.x - x0) <= 1 and abs(agent.y - y0) <= 1:
+                agent = copy.copy(agent)
+                agent.x = x0 + (agent.x - x0) * alpha
+                agent.y = y0 + (agent.y - y0) * alpha
+            agents.append(agent)
+        predators = copy.copy(self.predators)
+        predators.x = px + (self.predators.x - px) * alpha
+        predators.y = py + (self.predators.y - py) * alpha
+        return agents, predators
+
+
+class FastForward:
+    """Run-until target: a tick, or the next event of a given type
+    ("died", "season", …); open-ended when both are None."""
+
+    def __init__(self, start: int, until_tick: int | None = None,
+                 until_event: str | None = None):
+        self.start = start
+        self.until_tick = until_tick
+        self.until_event = until_event
+
+    @property
+    def label(self) -> str:
+        if self.until_tick is not None:
+            return f"to T{self.until_tick}"
+        if self.until_event is not None:
+            return f"to next {self.until_event}"
+        return "until stopped"
+
+    def progress(self, tick: int) -> float | None:
+        """Share of the way to a tick target; None for other targets."""
+        if self.until_tick is None:
+            return None
+        span = self.until_tick - self.start
+        return 1.0 if span <= 0 else min(1.0, (tick - self.start) / span)
+
+    def reached(self, tick: int, events: list[dict]) -> bool:
+        if self.until_tick is not None and tick >= self.until_tick:
+            return True
+        return any(ev["type"] == self.until_event for ev in events)
+
+
+class SimRunner:
+    """Steps a Simulation on a daemon thread.
+
+    `rate` is the target in ticks per second, or None to run flat out.
+    While `fast_forward` holds a FastForward the worker runs flat out and
+    publishes nothing until its target is reached or it is cancelled.
+    Hold `lock` to touch `sim` from another thread (reset, checkpoint,
+    load); the worker takes it only between ticks, for at most one short
+    slice at a time. latest() returns the newest snapshot and asks for
+    the next one, so snapshots are copied at the display's pace rather
+    than every tick.
+    """
+
+    def __init__(self, sim: Simulation, rate: float | None = None):
+        self.sim = sim
+        self.rate = rate
+        self.paused = False
+        self.fast_forward: FastForward | None = None
+        self.lock = threading.Lock()
+        self.measured_rate = 0.0
+        self.error: BaseException | None = None
+        self._events: deque[dict] = deque(maxlen=_EVENT_BUFFER)
+        self._snapshot = Snapshot(sim)
+        self._want_snapshot = True
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="genesis-sim")
+
+    # ── control ──────────────────────────────────────────────────────────
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Finish the current slice and stop the worker."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+
+    def set_rate(self, rate: float | None):
+        self.rate = rate
+        self._wake.set()
+
+    def set_paused(self, paused: bool):
+        self.paused = paused
+        self._wake.set()
+
+    def start_fast_forward(self, until_tick: int | None = None,
+                           until_event: str | None = None) -> FastForward:
+        """Run flat out from the current tick until the target; the
+        previous rate applies again afterwards. Unpauses."""
+        self.fast_forward = FastForward(self.sim.tick, until_tick,
+                                        until_event)
+        self.set_paused(False)
+        return self.fast_forward
+
+    def stop_fast_forward(self):
+        self.fast_forward = None
+        self._wake.set()
+
+    # ── display side ─────────────────────────────────────────────────────
+    def latest(self) -> Snapshot:
+        """Newest published snapshot; the worker publishes another after
+        its next slice. Re-raises an error that stopped the worker."""
+        if self.error is not None:
+            raise RuntimeError("simulation worker failed") from self.error
+        self._want_snapshot = True
+        return self._snapshot
+
+    def republish(self):
+        """Snapshot the simulation now (call while holding `lock`), e.g.
+        after replacing or resetting it while paused."""
+        self._snapshot = Snapshot(self.sim)
+
+    def drain_events(self) -> list[dict]:
+        """Events since the last call, oldest first (at most the last
+        _EVENT_BUFFER of them)."""
+        events = []
+        while self._events:
+            events.append(self._events.popleft())
+        return events
+
+    def blend(self, snapshot: Snapshot) -> float:
+        """How far (0–1) the display is between `snapshot` and the tick
+        after it, at the target rate."""
+        if self.rate is None or self.paused or self.fast_forward:
+            return 1.0
+        return min(1.0, (time.perf_counter() - snapshot.time) * self.rate)
+
+    # ── worker ───────────────────────────────────────────────────────────
+    def _run(self):
+        try:
+            self._loop()
+        except BaseException as exc:
+            self.error = exc
+
+    def _loop(self):
+        due_at = time.perf_counter()        # when the next tick is due
+        counted, counted_at = 0, due_at
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            if self.paused:
+                self._wake.wait(0.1)
+                self._wake.clear()
+                due_at = time.perf_counter()
+                continue
+            rate = None if self.fast_forward else self.rate
+            if rate is not None:
+                if now < due_at:
+                    self._wake.wait(due_at - now)
+                    self._wake.clear()
+                    continue
+                if now - due_at > _MAX_LAG:
+                    due_at = now
+                budget = int((now - due_at) * rate) + 1
+            else:
+                budget = None
+
+            with self.lock:
+                ran = self._slice(budget)
+            if rate is not None:
+                due_at += ran / rate
+            else:
+                # after a fast-forward the next tick is one period away
+                due_at = time.perf_counter() + (1 / self.rate if self.rate
+                                                else 0.0)
+
+            counted += ran
+            if now - counted_at >= 0.5:
+                self.measured_rate = counted / (now - counted_at)
+                counted, counted_at = 0, now
+
+    def _slice(self, budget: int | None) -> int:
+        """Step up to `budget` ticks (any number if None) within _SLICE
+        seconds; publish a snapshot afterwards if one was asked for."""
+        sim = self.sim
+        end = time.perf_counter() + _SLICE
+        ran = 0
+        previous = None
+        target = self.fast_forward
+        while budget is None or ran < budget:
+            previous = (sim.geometry.xs, sim.geometry.ys,
+                        sim.predators.x.copy(), sim.predators.y.copy())
+            events = sim.step()
+            self._events.extend(events)
+            ran += 1
+            if target is not None and target.reached(sim.tick, events):
+                if self.fast_forward is target:
+                    self.fast_forward = None
+                self._want_snapshot = True
+                break
+            if time.perf_counter() >= end:
+                break
+        if self._want_snapshot:
+            self._want_snapshot = False
+            self._snapshot = Snapshot(sim, previous)
+        return ran
@@ -0,0 +1,189 @@
+"""
+GENESIS — Simulation
+Headless engine: world → predator → agents → log, with no display.
+The interactive loop in main.py is one client of this engine.
+"""
+
+import numpy as np
+import config as cfg
+from world import World
+from agent import Agent
+from predator import PredatorPack
+from logger import Logger
+from population import AgentPopulation
+from spatial import Geometry
+
+
+def create_agents(n: int = 2, config: cfg.SimConfig | None = None,
+                  rng: np.random.Generator | None = None) -> list[Agent]:
+    """Spawn n agents; the first two start at opposite corners."""
+    config = cfg.DEFAULT if config is None else config
+    agents = []
+    for agent_id in range(n):
+        x, y = spawn_point(agent_id, config.GRID_SIZE)
+        color = "blue" if agent_id % 2 == 0 else "red"
+        agents.append(Agent(agent_id, x, y, color, config, rng))
+    return agents
+
+
+def spawn_point(agent_id: int, grid_size: int) -> tuple[int, int]:
+    """Cell where an agent (and its offspring) is born.
+
+    Agents 0 and 1 use opposite corners; the rest are spread over the
+    grid along an R2 low-discrepancy sequence.
+    """
+    if agent_id == 0:
+        return 2, 2
+    if agent_id == 1:
+        return grid_size - 3, grid_size - 3
+    span = grid_size - 5
+    x = 2 + int((agent_id * 0.7548776662) % 1.0 * span)
+    y = 2 + int((agent_id * 0.5698402910) % 1.0 * span)
+    return x, y
+
+
+def create_predators(n: int = 1,
+                     config: cfg.SimConfig | None = None) -> PredatorPack:
+    """Pack of n predators; the first starts at PREDATOR_START_X/Y, the
+    rest are spread over the grid along an R2 sequence."""
+    config = cfg.DEFAULT if config is None else config
+    xs, ys = [], []
+    span = config.GRID_SIZE - 5
+    for k in range(n):
+        if k == 0:
+            xs.append(config.PREDATOR_START_X)
+            ys.append(config.PREDATOR_START_Y)
+        else:
+            xs.append(2 + int((0.5 + k * 0.7548776662) % 1.0 * span))
+            ys.append(2 + int((0.5 + k * 0.5698402910) % 1.0 * span))
+    return PredatorPack(xs, ys, config)
+
+
+class Simulation:
+    """Owns the world, agents, predators and logger; advances them per tick.
+
+    `agents` is the list behind `population`, the struct-of-arrays view
+    the per-tick chemistry and move scoring run on. Every part reads its
+    parameters from `config` (config.py's values unless given) and
+    draws from its own `rng`, seeded from `seed`, so differently
+    configured simulations can run side by side, even interleaved.
+    """
+
+    def __init__(self, log_dir: str | None = "data", seed: int | None = None,
+                 n_agents: int | None = None, n_predators: int | None = None,
+                 config: cfg.SimConfig | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        self.log_dir = log_dir
+        self.seed = seed
+        self.n_agents = self.config.N_AGENTS if n_agents is None else n_agents
+        self.n_predators = (self.config.N_PREDATORS if n_predators is None
+                            else n_predators)
+        self.logger = (Logger(output_dir=log_dir, config=self.config)
+                       if log_dir is not None else None)
+        # optional replay.ReplayRecorder, fed after every tick
+        self.recorder = None
+        self.reset()
+
+    def reset(self):
+        """Fresh world, agents and predators. The logger keeps its file."""
+        config = self.config
+        self.rng = np.random.default_rng(self.seed)
+        self.world = World(config=config, rng=self.rng)
+        self.population = AgentPopulation(
+            create_agents(self.n_agents, config, self.rng), config, self.rng
+        )
+        self.agents = self.population.agents
+        self.predators = create_predators(self.n_predators, config)
+        self.geometry = Geometry(config.GRID_SIZE)
+        self.geometry.update_predators(*self.predators.positions())
+        self._locate_agents()
+        self.tick = 0
+        self.last_season = self.world.get_season()
+
+    # ── per-tick step ────────────────────────────────────────────────────
+    def step(self) -> list[dict]:
+        """Advance one tick. Returns a list of event dicts for clients."""
+        events: list[dict] = []
+        self.tick += 1
+        tick = self.tick
+
+        # world step
+        self.world.update()
+
+        # season change event
+        current_season = self.world.get_season()
+        if current_season != self.last_season:
+            events.append({"type": "season", "tick": tick,
+                           "season": current_season})
+            self.last_season = current_season
+
+        # predator step
+        self.predators.update(self.agents, tick, self.geometry)
+
+        # agent steps — chemistry and move scoring run for the whole
+        # population at once, each agent reacting to its nearest living
+        # neighbour; the chosen moves are then carried out in index order
+        agents = self.agents
+        population = self.population
+        geometry = self.geometry
+        population.gather()
+        population.update_chemicals(predator=self.predators,
+                                    geometry=geometry)
+        population.scatter()
+        xs, ys = population.decide_moves(self.world, predator=self.predators,
+                                         geometry=geometry)
+        for i, (nx, ny) in enumerate(zip(xs.tolist(), ys.tolist())):
+            agent = agents[i]
+            result = agent.act(self.world, nx, ny)
+
+            if result.get("ate"):
+                events.append({"type": "ate", "tick": tick,
+                               "label": agent.label,
+                               "x": agent.x, "y": agent.y,
+                               "energy": agent.energy})
+            if result.get("died"):
+                events.append({"type": "died", "tick": tick,
+                               "label": agent.label,
+                               "x": agent.x, "y": agent.y,
+                               "generation": agent.generation,
+                               "age": agent.total_ticks})
+                # produce offspring instead of simple respawn
+                sx, sy = spawn_point(agent.id, self.config.GRID_SIZE)
+                offspring = agent.produce_offspring(sx, sy)
+                agents[i] = offspring
+                events.append({"type": "born", "tick": tick,
+                               "label": offspring.label,
+                               "generation": offspring.generation,
+                               "pathways": offspring.pathway_count})
+
+        # distances after movement, read by the logger and next tick
+        self._locate_agents()
+
+        # log
+        if self.logger is not None:
+            self.logger.maybe_log(tick, agents, self.world, geometry)
+        if self.recorder is not None:
+            self.recorder.record(self, events)
+
+        return events
+
+    def _locate_agents(self):
+        """Refresh the geometry cache from the agents' positions."""
+        agents = self.agents
+        self.geometry.update_agents([a.x for a in agents],
+                                    [a.y for a in agents],
+                                    [a.alive for a in agents])
+
+    def run(self, n_ticks: int,
+            collect_events: bool = False) -> list[dict] | None:
+        """Advance n_ticks as fast as possible. Returns all events when
+        `collect_events` is set; otherwise they are dropped as they come,
+        so long runs use constant memory."""
+        if not collect_events:
+            for _ in range(n_ticks):
+                self.step()
+            return None
+        events: list[dict] = []
+        for _ in range(n_ticks):
+            events.extend(self.step())
+        return events
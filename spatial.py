@@ -0,0 +1,247 @@
+"""
+GENESIS — Spatial hash
+Uniform-grid bucket index over agent positions for neighbour queries
+that stay near-linear as the population grows.
+"""
+
+import math
+
+import numpy as np
+
+# widest bucket ring nearest() searches before scanning every point
+_MAX_REACH = 3
+# up to this many indexed points, queries compare every pair at once
+_ALL_PAIRS_MAX = 64
+# distance² standing in for "no such point"
+_FAR = np.iinfo(np.int64).max
+
+
+class SpatialHash:
+    """Integer points bucketed into square cells, stored CSR-style.
+
+    Built once per tick from position arrays; `active` limits the index
+    to e.g. living agents. Query results are indices into those arrays.
+    With at most _ALL_PAIRS_MAX points, nearest() and within() skip the
+    buckets and compare every query with every point in one array; the
+    buckets are only sorted when a query needs them.
+    """
+
+    def __init__(self, xs, ys, grid_size: int, cell_size: int | None = None,
+                 active=None):
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        members = (np.arange(self.xs.size) if active is None
+                   else np.flatnonzero(active))
+        if cell_size is None:
+            # about one point per bucket
+            cell_size = grid_size / math.sqrt(max(1, members.size))
+        self.cell = max(1, int(cell_size))
+        self.side = grid_size // self.cell + 1
+        self.members = members                  # ascending indices
+        self._bucketed: np.ndarray | None = None
+        self._starts: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self.members.size
+
+    def _keys(self, xs, ys):
+        return (ys // self.cell) * self.side + xs // self.cell
+
+    def _buckets(self) -> tuple[np.ndarray, np.ndarray]:
+        """(members sorted by bucket, CSR start of every bucket)."""
+        if self._starts is None:
+            keys = self._keys(self.xs[self.members], self.ys[self.members])
+            order = np.argsort(keys, kind="stable")
+            self._bucketed = self.members[order]
+            self._starts = np.searchsorted(
+                keys[order], np.arange(self.side * self.side + 1)
+            )
+        return self._bucketed, self._starts
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def block_pairs(self, qx, qy, reach: int = 1):
+        """(query, member) index pairs for every indexed point in the
+        (2·reach+1)² buckets around each query point."""
+        qx = np.asarray(qx, dtype=np.int64)
+        qy = np.asarray(qy, dtype=np.int64)
+        bucketed, starts = self._buckets()
+        # every (query, bucket offset) pair as one flat array
+        offsets = np.arange(-reach, reach + 1)
+        bx = (qx // self.cell)[:, None] + np.tile(offsets, offsets.size)
+        by = (qy // self.cell)[:, None] + np.repeat(offsets, offsets.size)
+        ok = (bx >= 0) & (bx < self.side) & (by >= 0) & (by < self.side)
+        key = np.where(ok, by * self.side + bx, 0).ravel()
+        start = starts[key]
+        count = np.where(ok.ravel(), starts[key + 1] - start, 0)
+        total = int(count.sum())
+        if not total:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        q = np.repeat(np.arange(qx.size).repeat(offsets.size ** 2), count)
+        first = np.repeat(np.cumsum(count) - count, count)
+        slot = np.repeat(start, count) + np.arange(total) - first
+        return q, bucketed[slot]
+
+    def nearest(self, qx, qy, exclude=None) -> np.ndarray:
+        """Index of the nearest indexed point to each query, or -1.
+
+        `exclude[i]` is skipped for query i (e.g. the agent itself). Ties
+        go to the lowest index. The search widens ring by ring around each
+        query until its answer is proven; stragglers fall back to a scan
+        of every indexed point.
+        """
+        qx = np.asarray(qx, dtype=np.int64)
+        qy = np.asarray(qy, dtype=np.int64)
+        n = qx.size
+        exclude = (np.full(n, -1) if exclude is None
+                   else np.asarray(exclude))
+        if len(self) <= _ALL_PAIRS_MAX:
+            return self._nearest_all_pairs(qx, qy, exclude)
+        best = np.full(n, -1, dtype=np.intp)
+        best_d2 = np.full(n, _FAR, dtype=np.int64)
+
+        pending = np.arange(n)
+        for reach in range(1, _MAX_REACH + 1):
+            if not pending.size:
+                return best
+            q, c = self.block_pairs(qx[pending], qy[pending], reach=reach)
+            self._take_min(pending[q], c, qx, qy, exclude, best, best_d2)
+            # anything within reach·cell of a query lies inside its block
+            proven = reach * self.cell
+            pending = pending[best_d2[pending] > proven * proven]
+            best[pending] = -1
+            best_d2[pending] = _FAR
+
+        if pending.size and len(self):
+            q = np.repeat(pending, len(self))
+            c = np.tile(self.members, pending.size)
+            self._take_min(q, c, qx, qy, exclude, best, best_d2)
+        return best
+
+    def _all_pairs(self, qx, qy) -> tuple[np.ndarray, np.ndarray]:
+        """Indexed points in index order and their (queries, points)
+        distance² matrix."""
+        members = self.members
+        dx = self.xs[members] - qx[:, None]
+        dy = self.ys[members] - qy[:, None]
+        return members, dx * dx + dy * dy
+
+    def _nearest_all_pairs(self, qx, qy, exclude) -> np.ndarray:
+        best = np.full(qx.size, -1, dtype=np.intp)
+        if not len(self):
+            return best
+        members, d2 = self._all_pairs(qx, qy)
+        d2[members == exclude[:, None]] = _FAR
+        # argmin keeps the first of equal minima: the lowest index
+        column = np.argmin(d2, axis=1)
+        found = d2[np.arange(qx.size), column] < _FAR
+        best[found] = members[column[found]]
+        return best
+
+    def _take_min(self, q, c, qx, qy, exclude, best, best_d2):
+        keep = c != exclude[q]
+        q, c = q[keep], c[keep]
+        if not q.size:
+            return
+        dx = self.xs[c] - qx[q]
+        dy = self.ys[c] - qy[q]
+        d2 = dx * dx + dy * dy
+        order = np.lexsort((c, d2, q))
+        q, c, d2 = q[order], c[order], d2[order]
+        first = np.ones(q.size, dtype=bool)
+        first[1:] = q[1:] != q[:-1]
+        best[q[first]] = c[first]
+        best_d2[q[first]] = d2[first]
+
+    def within(self, qx, qy, radius: float):
+        """(query, member) pairs with Euclidean distance < radius."""
+        qx = np.asarray(qx, dtype=np.int64)
+        qy = np.asarray(qy, dtype=np.int64)
+        if len(self) <= _ALL_PAIRS_MAX:
+            members, d2 = self._all_pairs(qx, qy)
+            q, column = np.nonzero(d2 < radius * radius)
+            return q, members[column]
+        reach = max(1, math.ceil(radius / self.cell))
+        q, c = self.block_pairs(qx, qy, reach=reach)
+        dx = self.xs[c] - qx[q]
+        dy = self.ys[c] - qy[q]
+        close = dx * dx + dy * dy < radius * radius
+        return q[close], c[close]
+
+
+class Geometry:
+    """Per-tick distance cache shared by the predators, the population
+    and the logger.
+
+    Both sides are neighbour-limited: each agent's nearest living partner
+    and its nearest live predator, which is all any subsystem reads.
+    Refresh with update_agents() after the agents move and
+    update_predators() after the predators move; the predator index is
+    kept between the two.
+    """
+
+    def __init__(self, grid_size: int):
+        self.grid_size = grid_size
+        self.xs = np.zeros(0, dtype=np.int64)
+        self.ys = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.index = SpatialHash(self.xs, self.ys, grid_size)
+        self.partners = np.zeros(0, dtype=np.intp)
+        self.partner_dist = np.zeros(0)
+        self.update_predators(np.zeros(0, dtype=np.int64),
+                              np.zeros(0, dtype=np.int64),
+                              np.zeros(0, dtype=bool))
+
+    def update_agents(self, xs, ys, alive):
+        """Agent positions changed: spatial index, nearest partners and
+        nearest predators."""
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        self.alive = np.asarray(alive, dtype=bool)
+        self.index = SpatialHash(self.xs, self.ys, self.grid_size,
+                                 active=self.alive)
+        self.partners = self.index.nearest(self.xs, self.ys,
+                                           exclude=np.arange(self.xs.size))
+        has = self.partners >= 0
+        dx = self.xs - self.xs[self.partners]
+        dy = self.ys - self.ys[self.partners]
+        self.partner_dist = np.where(has, np.sqrt(dx * dx + dy * dy), np.inf)
+        self._predator_offsets()
+
+    def update_predators(self, xs, ys, alive):
+        """Predator positions or liveness changed."""
+        # copied: the pack moves its own arrays in place
+        self.predator_index = SpatialHash(np.array(xs, dtype=np.int64),
+                                          np.array(ys, dtype=np.int64),
+                                          self.grid_size,
+                                          active=np.array(alive, dtype=bool))
+        self._predator_offsets()
+
+    def _predator_offsets(self):
+        (self.predator, self.predator_dx,
+         self.predator_dy) = nearest_offsets(self.xs, self.ys,
+                                             index=self.predator_index)
+
+    def closest_distance(self) -> float:
+        """Smallest distance between two living agents (0 if none)."""
+        finite = self.partner_dist[np.isfinite(self.partner_dist)]
+        return float(finite.min()) if finite.size else 0.0
+
+
+def nearest_offsets(qx, qy, xs=None, ys=None, alive=None,
+                    grid_size: int | None = None,
+                    index: SpatialHash | None = None):
+    """Nearest live point (xs, ys) to each query: (index or -1, qx - x,
+    qy - y). Offsets are 0 where there is no live point. A prebuilt
+    `index` over the points replaces xs, ys, alive and grid_size."""
+    qx = np.asarray(qx, dtype=np.int64)
+    qy = np.asarray(qy, dtype=np.int64)
+    if index is None:
+        index = SpatialHash(xs, ys, grid_size, active=alive)
+    if not len(index):
+        zeros = np.zeros(qx.size, dtype=np.int64)
+        return np.full(qx.size, -1, dtype=np.intp), zeros, zeros
+    nearest = index.nearest(qx, qy)
+    has = nearest >= 0
+    return (nearest, np.where(has, qx - index.xs[nearest], 0),
+            np.where(has, qy - index.ys[nearest], 0))
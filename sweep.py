@@ -0,0 +1,251 @@
+"""
+GENESIS — Parameter sweeps
+Headless runs over a grid or list of config overrides × seeds, spread
+across a process pool, with one JSON line of summary metrics per run.
+
+    python sweep.py --grid PREDATOR_DAMAGE=10,15,20 \\
+                    --grid INHERITANCE_STRENGTH=0.5,0.7 --seeds 8
+    python sweep.py spec.json --out data/sweep.jsonl
+
+A spec file holds {"grid": {NAME: [values]}} and/or {"runs": [{NAME:
+value}]} (a grid expands every run), plus optional "seeds" (a count or a
+list) and "ticks". Dict-valued constants merge a partial override, e.g.
+{"SEASON_FOOD_REGEN": {"Winter": 0.001}}. Rerunning a sweep against the
+same results file skips every run already recorded there.
+
+With --checkpoint every run forks from one saved tick (see checkpoint.py)
+instead of starting fresh: the saved config plus each override, with the
+RNGs reseeded per seed.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config as cfg
+from checkpoint import load_checkpoint, read_config
+from simulation import Simulation
+
+
+# ── run specs ────────────────────────────────────────────────────────────
+def grid_runs(grid: dict[str, list]) -> list[dict]:
+    """Every combination of the grid's values, as override dicts."""
+    names = list(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(grid[n] for n in names))]
+
+
+def make_config(params: dict,
+                base: cfg.SimConfig | None = None) -> cfg.SimConfig:
+    """base (DEFAULT if None) with params applied; dict overrides merge
+    into the base value."""
+    base = cfg.DEFAULT if base is None else base
+    changes = {}
+    for name, value in params.items():
+        current = getattr(base, name, None)
+        if isinstance(current, Mapping) and isinstance(value, Mapping):
+            value = {**current, **value}
+        changes[name] = value
+    return base.replace(**changes)
+
+
+def run_key(params: dict, seed: int, ticks: int,
+            checkpoint: str | None = None) -> str:
+    """Identity of one run in a results file."""
+    key = {"params": params, "seed": seed, "ticks": ticks}
+    if checkpoint is not None:
+        key["checkpoint"] = checkpoint
+    return json.dumps(key, sort_keys=True)
+
+
+# ── one run (in a worker process) ────────────────────────────────────────
+def run_one(params: dict, seed: int, ticks: int,
+            checkpoint: str | None = None) -> dict:
+    """Simulate one config and seed headless, from scratch or forked from
+    a checkpoint; return its summary."""
+    if checkpoint is None:
+        sim = Simulation(log_dir=None, seed=seed, config=make_config(params))
+    else:
+        sim = load_checkpoint(
+            checkpoint, seed=seed,
+            config=make_config(params, read_config(checkpoint)),
+        )
+    deaths = births = food = 0
+    ages = []
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for event in sim.step():
+            kind = event["type"]
+            if kind == "ate":
+                food += 1
+            elif kind == "died":
+                deaths += 1
+                ages.append(event["age"])
+            elif kind == "born":
+                births += 1
+    elapsed = time.perf_counter() - start
+
+    # agents still alive at the end count with their age so far
+    ages += [a.total_ticks for a in sim.agents]
+    generations = [a.generation for a in sim.agents]
+    summary = {"params": params, "seed": seed, "ticks": ticks}
+    if checkpoint is not None:
+        summary["checkpoint"] = checkpoint
+    return {
+        **summary,
+        "deaths": deaths,
+        "births": births,
+        "food_eaten": food,
+        "mean_ticks_survived": round(sum(ages) / len(ages), 2) if ages else 0,
+        "max_ticks_survived": max(ages, default=0),
+        "max_generation": max(generations, default=0),
+        "mean_generation": (round(sum(generations) / len(generations), 3)
+                            if generations else 0),
+        "final_energy": round(sum(a.energy for a in sim.agents), 2),
+        "explored": round(sim.population.coverage(), 4),
+        "seconds": round(elapsed, 2),
+    }
+
+
+# ── sweep driver ─────────────────────────────────────────────────────────
+def completed_runs(path: str) -> set[str]:
+    """Keys of the runs already recorded in a results file. A line cut
+    short by an interrupted sweep, and failed runs, do not count."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "error" not in result:
+                done.add(run_key(result["params"], result["seed"],
+                                 result["ticks"], result.get("checkpoint")))
+    return done
+
+
+def sweep(runs: list[dict], seeds: list[int], ticks: int, out: str,
+          workers: int | None = None, checkpoint: str | None = None) -> int:
+    """Run every (params, seed) pair not yet in `out` across a process
+    pool, appending one JSON line per run as it finishes. Returns the
+    number of runs carried out."""
+    base = read_config(checkpoint) if checkpoint is not None else None
+    for params in runs:
+        make_config(params, base)           # unknown names fail here
+    done = completed_runs(out)
+    pending = [(params, seed) for params in runs for seed in seeds
+               if run_key(params, seed, ticks, checkpoint) not in done]
+    total = len(runs) * len(seeds)
+    print(f"[GENESIS] sweep: {total} runs, {total - len(pending)} already "
+          f"in {out}, {len(pending)} to go")
+    if not pending:
+        return 0
+
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "a") as f, ProcessPoolExecutor(workers) as pool:
+        # a cut-off last line from an interrupted sweep stays on its own
+        if f.tell() and not _ends_with_newline(out):
+            f.write("\n")
+        futures = {pool.submit(run_one, params, seed, ticks, checkpoint):
+                   (params, seed) for params, seed in pending}
+        try:
+            for n, future in enumerate(as_completed(futures), 1):
+                params, seed = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = {"params": params, "seed": seed, "ticks": ticks,
+                              "error": repr(exc)}
+                    if checkpoint is not None:
+                        result["checkpoint"] = checkpoint
+                f.write(json.dumps(result) + "\n")
+                f.flush()
+                status = ("failed" if "error" in result
+                          else f"gen {result['max_generation']}")
+                print(f"[GENESIS] {n}/{len(pending)} seed {seed} "
+                      f"{params}: {status}")
+        except KeyboardInterrupt:
+            pool.shutdown(cancel_futures=True)
+            raise
+    return len(pending)
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+# ── command line ─────────────────────────────────────────────────────────
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _parse_grid(items: list[str]) -> dict[str, list]:
+    grid = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected NAME=v1,v2,… but got {item!r}")
+        grid[name] = [_parse_value(v) for v in values.split(",")]
+    return grid
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="GENESIS parameter sweep")
+    parser.add_argument("spec", nargs="?",
+                        help="JSON file with a grid or list of runs")
+    parser.add_argument("--grid", action="append", default=[],
+                        metavar="NAME=V1,V2",
+                        help="comma-separated JSON values for one "
+                             "constant (repeatable)")
+    parser.add_argument("--seeds", type=int, default=None,
+                        help="run seeds 0..N-1 per parameter set "
+                             "(default: spec's seeds, else 4)")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="ticks per run (default: spec's, else 5000)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="data/sweep.jsonl",
+                        help="results file; finished runs in it are skipped")
+    parser.add_argument("--checkpoint", metavar="PATH", default=None,
+                        help="fork every run from this checkpoint file")
+    args = parser.parse_args(argv)
+
+    spec = {}
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    try:
+        grid = {**spec.get("grid", {}), **_parse_grid(args.grid)}
+    except ValueError as exc:
+        parser.error(str(exc))
+    runs = spec.get("runs", [])
+    if grid:
+        runs = [{**base, **combo} for base in runs or [{}]
+                for combo in grid_runs(grid)]
+    runs = runs or [{}]
+    base = read_config(args.checkpoint) if args.checkpoint else None
+    for params in runs:
+        try:
+            make_config(params, base)
+        except TypeError as exc:
+            parser.error(f"bad parameter set {params}: {exc}")
+    seeds = args.seeds if args.seeds is not None else spec.get("seeds", 4)
+    if isinstance(seeds, int):
+        seeds = list(range(seeds))
+    ticks = args.ticks or spec.get("ticks", 5000)
+    sweep(runs, seeds, ticks, args.out, args.workers, args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
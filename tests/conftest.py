@@ -0,0 +1,10 @@
+"""
+GENESIS — Test setup
+The modules live flat in the repository root; make them importable.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,38 @@
+"""
+GENESIS — Ensemble tests
+A one-replica Ensemble follows a Simulation with the same seed exactly.
+"""
+
+import numpy as np
+import pytest
+
+import config as cfg
+from ensemble import Ensemble
+from simulation import Simulation
+
+
+@pytest.mark.parametrize("lazy_markers", [True, False])
+@pytest.mark.parametrize("n_agents, n_predators", [(2, 1), (3, 2)])
+def test_single_replica_matches_simulation(n_agents, n_predators,
+                                           lazy_markers):
+    config = cfg.DEFAULT.replace(LAZY_MARKERS=lazy_markers)
+    sim = Simulation(log_dir=None, seed=5, n_agents=n_agents,
+                     n_predators=n_predators, config=config)
+    ens = Ensemble(1, seed=5, n_agents=n_agents, n_predators=n_predators,
+                   config=config)
+    births = 0
+    for _ in range(1000):
+        births += sum(e["type"] == "born" for e in sim.step())
+        ens.step()
+        pop = ens.population
+        assert (pop.x.tolist(), pop.y.tolist()) == (
+            [a.x for a in sim.agents], [a.y for a in sim.agents])
+        assert pop.energy.tolist() == [a.energy for a in sim.agents]
+        assert pop.generation.tolist() == [a.generation
+                                           for a in sim.agents]
+        assert np.array_equal(ens.world.food[0], sim.world.food)
+        assert np.array_equal(ens.world.alarm_markers[0],
+                              sim.world.alarm_markers)
+        assert ens.predator_x[0].tolist() == sim.predators.x.tolist()
+        assert ens.predator_y[0].tolist() == sim.predators.y.tolist()
+    assert ens.summary()[0]["births"] == births
@@ -0,0 +1,77 @@
+"""
+GENESIS — World tests
+Scent diffusion against the plain padded-copy formulation, and the
+incremental scent update against full rebuilds.
+"""
+
+import numpy as np
+import pytest
+
+import config as cfg
+from simulation import Simulation
+from world import DIFFUSION_PASSES, World
+
+
+def reference_scent(food: np.ndarray, diffusion: float,
+                    decay: float) -> np.ndarray:
+    """Three 5-point stencil passes on a fresh zero-padded copy each
+    pass, as the original _diffuse_scent computed them."""
+    padded = np.pad(food, 1, mode="constant", constant_values=0)
+    for _ in range(DIFFUSION_PASSES):
+        new = padded.copy()
+        new[1:-1, 1:-1] = (
+            padded[1:-1, 1:-1] * (1.0 - diffusion)
+            + (padded[:-2, 1:-1] + padded[2:, 1:-1]
+               + padded[1:-1, :-2] + padded[1:-1, 2:])
+            * (diffusion / 4.0)
+        )
+        padded = new
+    return np.clip(padded[1:-1, 1:-1] * (1.0 - decay), 0.0, 1.0)
+
+
+@pytest.mark.parametrize("diffusion", [0.2, 0.3, 0.45, 0.5])
+def test_ping_pong_diffusion_is_bit_identical(diffusion):
+    world = World(config=cfg.DEFAULT, rng=np.random.default_rng(1))
+    rng = np.random.default_rng(2)
+    # the buffers are reused across rebuilds; none may leak into the next
+    for _ in range(3):
+        world.food[...] = rng.random(world.food.shape) * (
+            rng.random(world.food.shape) < 0.3)
+        world._diffuse_full(diffusion)
+        expected = reference_scent(world.food, diffusion,
+                                   cfg.DEFAULT.SCENT_DECAY)
+        assert np.array_equal(world.scent, expected)
+
+
+@pytest.mark.parametrize("precision", ["float64", "float32", "uint16"])
+def test_incremental_scent_equals_full_rebuild(precision):
+    world = World(precision=precision, config=cfg.DEFAULT,
+                  rng=np.random.default_rng(3))
+    world.update()
+    rng = np.random.default_rng(4)
+    edge = world.size - 1
+    full = world._diffuse_full
+    world._diffuse_full = None      # the incremental path must be taken
+    for _ in range(25):
+        # a few scattered cells, always including corners and edges
+        ys = np.append(rng.integers(0, world.size, 4), [0, edge, 0, 17])
+        xs = np.append(rng.integers(0, world.size, 4), [0, edge, edge, 0])
+        world.food[ys, xs] = world._encode(rng.random(ys.size))
+        world.mark_food_dirty(ys, xs)
+        world._diffuse_scent()
+        incremental = world.scent.copy()
+        full(world._scent_diffusion)
+        assert np.array_equal(world.scent, incremental)
+
+
+def test_incremental_run_matches_full_rebuilds():
+    # short seasons: autumn and winter regrow few enough cells to take
+    # the incremental path, and each season change forces a rebuild
+    config = cfg.DEFAULT.replace(SEASON_LENGTH=100)
+    runs = [Simulation(log_dir=None, seed=5,
+                       config=config.replace(SCENT_INCREMENTAL=flag))
+            for flag in (True, False)]
+    for _ in range(450):
+        for sim in runs:
+            sim.step()
+        assert np.array_equal(runs[0].world.scent, runs[1].world.scent)
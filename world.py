@@ -3,21 +3,90 @@ GENESIS — World
 Grid environment: food, scent diffusion, seasons, chemical markers.
 """
 
+from multiprocessing import shared_memory
+
 import numpy as np
 import config as cfg
 
+# planes of World.layers, in order; each is also a named World attribute
+LAYERS = ("food", "scent", "food_markers", "alarm_markers")
+LAYER_FOOD, LAYER_SCENT, LAYER_FOOD_MARKERS, LAYER_ALARM_MARKERS = range(4)
+
+# stencil passes per diffusion step; also the radius a food change reaches
+DIFFUSION_PASSES = 3
+# cost of refreshing one dirty cell's footprint, in full-rebuild cells;
+# past size² / this many dirty cells a full rebuild is cheaper
+_DIRTY_CELL_COST = 400
+
+# WORLD_PRECISION -> (storage dtype, dtype arithmetic runs in)
+PRECISIONS = {
+    "float64": (np.float64, np.float64),
+    "float32": (np.float32, np.float32),
+    "uint16":  (np.uint16, np.float32),
+}
+# uint16 code for 1.0; every layer value lives in [0, 1]
+_Q_MAX = 65535
+
 
 class World:
     """60×60 grid world with food, scent diffusion, seasons, and markers."""
 
-    def __init__(self):
-        self.size = cfg.GRID_SIZE
-        self.food = np.zeros((self.size, self.size), dtype=np.float64)
-        self.scent = np.zeros((self.size, self.size), dtype=np.float64)
+    def __init__(self, size: int | None = None, precision: str | None = None,
+                 config: cfg.SimConfig | None = None,
+                 rng: np.random.Generator | None = None):
+        self.config = cfg.DEFAULT if config is None else config
+        # food spawn, regrowth and decay draw from this stream only
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.size = self.config.GRID_SIZE if size is None else size
+        self.precision = (self.config.WORLD_PRECISION if precision is None
+                          else precision)
+        if self.precision not in PRECISIONS:
+            raise ValueError(f"unknown world precision: {self.precision!r}")
+        self.dtype, self.work_dtype = PRECISIONS[self.precision]
+        self.quantized = self.dtype == np.uint16
+        shape = (self.size, self.size)
+
+        # all layers in one contiguous (layers, H, W) tensor with a
+        # permanent zero halo; food, scent, food_markers and alarm_markers
+        # are stable views of its interior
+        self.halo = self.config.VISION_RANGE + 1
+        padded_shape = (self.size + 2 * self.halo,) * 2
+        self._bind_layers(
+            np.zeros((len(LAYERS), *padded_shape), dtype=self.dtype)
+        )
+        self.inside = np.zeros(padded_shape, dtype=bool)
+        self.inside[self._interior] = True
+        self._marker_decay = np.array(
+            [1.0 - self.config.FOOD_MARKER_DECAY,
+             1.0 - self.config.ALARM_MARKER_DECAY]
+        )[:, None, None]
+
+        # lazy markers: the marker planes hold the value at the last write
+        # and marker_ticks the tick it happened; decay is applied on read
+        self.lazy_markers = self.config.LAZY_MARKERS
+        self.marker_ticks = np.zeros((2, *padded_shape), dtype=np.int32)
+        self._shm: shared_memory.SharedMemory | None = None
+
+        # diffusion ping-pong buffers; their zero border is the padding
+        padded = (self.size + 2, self.size + 2)
+        self._diffuse_bufs = [
+            stencil_views(np.zeros(padded, dtype=self.work_dtype))
+            for _ in range(2)
+        ]
+        self._diffuse_tmp = np.zeros(shape, dtype=self.work_dtype)
+
+        # incremental scent: food cells changed since the last diffusion
+        self._dirty_cells: list[int] = []
+        self._dirty_arrays: list[np.ndarray] = []
+        self._scent_stale = True
+        self._scent_diffusion: float | None = None
 
-        # communication markers (Phase 2)
-        self.food_markers = np.zeros((self.size, self.size), dtype=np.float64)
-        self.alarm_markers = np.zeros((self.size, self.size), dtype=np.float64)
+        # regen/decay event sampling: one draw per cell, or O(hits)
+        mode = self.config.FOOD_EVENT_SAMPLING
+        if mode == "auto":
+            mode = ("sparse" if self.size * self.size
+                    >= self.config.SPARSE_SAMPLING_MIN_CELLS else "dense")
+        self.sparse_sampling = mode == "sparse"
 
         # seasons (Phase 1)
         self.tick_count = 0
@@ -29,8 +98,157 @@ class World:
     # ── initialisation ───────────────────────────────────────────────────
     def _spawn_food(self):
         """Randomly place food on ~15 % of cells."""
-        mask = np.random.random((self.size, self.size)) < cfg.FOOD_SPAWN_RATE
-        self.food[mask] = np.random.uniform(0.5, 1.0, size=mask.sum())
+        mask = (self.rng.random((self.size, self.size))
+                < self.config.FOOD_SPAWN_RATE)
+        self.food[mask] = self._encode(
+            self.rng.uniform(0.5, 1.0, size=mask.sum())
+        )
+
+    # ── layer tensor ─────────────────────────────────────────────────────
+    @property
+    def _interior(self) -> tuple[slice, slice]:
+        h = self.halo
+        return slice(h, h + self.size), slice(h, h + self.size)
+
+    def _bind_layers(self, layers: np.ndarray):
+        """Point the layer tensor and its named views at `layers`."""
+        self.layers = layers
+        for index, name in enumerate(LAYERS):
+            setattr(self, name, layers[(index, *self._interior)])
+
+    def snapshot_layers(self) -> np.ndarray:
+        """Copy of every layer, halo included, in one memcpy."""
+        return self.layers.copy()
+
+    def load_layers(self, layers: np.ndarray):
+        """Overwrite every layer in place from a snapshot_layers() copy."""
+        np.copyto(self.layers, layers)
+        self._dirty_cells = []
+        self._dirty_arrays = []
+        self.invalidate_scent()
+
+    def share_layers(self) -> shared_memory.SharedMemory:
+        """Move the layer tensor into a shared-memory segment.
+
+        Other processes map it with
+        World.attach_layers(shm.name, world.size, world.halo, ...).
+        The world keeps using the segment until it is garbage collected;
+        the caller unlinks it when every process is done.
+        """
+        if self._shm is None:
+            shm = shared_memory.SharedMemory(create=True,
+                                             size=self.layers.nbytes)
+            shared = np.ndarray(self.layers.shape, dtype=self.dtype,
+                                buffer=shm.buf)
+            np.copyto(shared, self.layers)
+            self._bind_layers(shared)
+            self._shm = shm
+        return self._shm
+
+    @staticmethod
+    def attach_layers(name: str, size: int, halo: int,
+                      precision: str = "float64"):
+        """Map a layer tensor shared by World.share_layers in another
+        process; `halo` is the sharing world's (its config's VISION_RANGE
+        + 1). Returns (segment, layers); the layers include the halo.
+        Keep the segment alive while the array is in use."""
+        shm = shared_memory.SharedMemory(name=name)
+        side = size + 2 * halo
+        layers = np.ndarray((len(LAYERS), side, side),
+                            dtype=PRECISIONS[precision][0], buffer=shm.buf)
+        return shm, layers
+
+    # ── neighbourhood windows ────────────────────────────────────────────
+    def window(self, x: int, y: int, r: int = 1) -> np.ndarray:
+        """Zero-copy (layers, 2r+1, 2r+1) view of every layer around
+        (x, y), in storage dtype. Off-grid cells read from the zero halo;
+        `r` may be at most `halo`."""
+        if r > self.halo:
+            raise ValueError(f"window radius {r} exceeds halo {self.halo}")
+        top, left = y + self.halo - r, x + self.halo - r
+        return self.layers[:, top:top + 2 * r + 1, left:left + 2 * r + 1]
+
+    def window_values(self, x: int, y: int, r: int = 1) -> np.ndarray:
+        """window() as floats with marker decay applied: the view itself
+        for eager float worlds, a small copy otherwise."""
+        values = self._decode(self.window(x, y, r))
+        if self.lazy_markers:
+            top, left = y + self.halo - r, x + self.halo - r
+            ticks = self.marker_ticks[:, top:top + 2 * r + 1,
+                                      left:left + 2 * r + 1]
+            values = np.array(values)
+            values[LAYER_FOOD_MARKERS:LAYER_ALARM_MARKERS + 1] *= (
+                self._marker_decay ** (self.tick_count - ticks)
+            )
+        return values
+
+    def window_inside(self, x: int, y: int, r: int = 1) -> np.ndarray:
+        """Zero-copy (2r+1, 2r+1) bool view: which window cells are on
+        the grid."""
+        top, left = y + self.halo - r, x + self.halo - r
+        return self.inside[top:top + 2 * r + 1, left:left + 2 * r + 1]
+
+    def values_at(self, xs, ys) -> np.ndarray:
+        """(layers, *xs.shape) float values at many cells at once, marker
+        decay applied. Cells may lie up to `halo` cells off the grid and
+        read zero there."""
+        # one flat index into the padded planes: take() on it is much
+        # cheaper than a 2-D gather for the few cells a tick reads
+        h = self.halo
+        cells = (ys + h) * self.inside.shape[1] + (xs + h)
+        layers = self.layers.reshape(len(self.layers), -1)
+        values = self._decode(layers.take(cells, axis=1))
+        if self.lazy_markers:
+            ticks = self.marker_ticks.reshape(2, -1).take(cells, axis=1)
+            ages = self.tick_count - ticks
+            decay = self._marker_decay.reshape(2, *[1] * (ages.ndim - 1))
+            values[LAYER_FOOD_MARKERS:LAYER_ALARM_MARKERS + 1] *= decay ** ages
+        return values
+
+    def inside_at(self, xs, ys) -> np.ndarray:
+        """Bool array: which of the cells (xs, ys) are on the grid."""
+        return self.inside[ys + self.halo, xs + self.halo]
+
+    # ── precision helpers ────────────────────────────────────────────────
+    def _encode(self, values):
+        """Layer codes for float values in [0, 1] (identity for floats)."""
+        if self.quantized:
+            return np.rint(np.multiply(values, _Q_MAX)).astype(np.uint16)
+        return values
+
+    def _decode(self, codes):
+        """Float values for layer codes (identity for floats)."""
+        if self.quantized:
+            return np.multiply(codes, 1.0 / _Q_MAX, dtype=self.work_dtype)
+        return codes
+
+    def _value(self, layer: np.ndarray, x: int, y: int) -> float:
+        if self.quantized:
+            return int(layer[y, x]) / _Q_MAX
+        return float(layer[y, x])
+
+    def _store(self, layer: np.ndarray, values: np.ndarray):
+        """Write work-dtype `values` into `layer`; `values` is scratch."""
+        if self.quantized:
+            np.multiply(values, _Q_MAX, out=values)
+            np.rint(values, out=values)
+        layer[...] = values
+
+    def read_layer(self, name: str) -> np.ndarray:
+        """Float view of a layer ("food", "scent", "food_markers",
+        "alarm_markers"); a decoded copy when quantized, and a decayed
+        copy for lazy marker planes."""
+        index = LAYERS.index(name)
+        if self.lazy_markers and index >= LAYER_FOOD_MARKERS:
+            return self._decayed_markers(index - LAYER_FOOD_MARKERS)
+        return self._decode(getattr(self, name))
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the world layers and their scratch buffers."""
+        arrays = [self.layers, self.inside, self.marker_ticks,
+                  self._diffuse_tmp]
+        arrays += [bufs[0].base for bufs in self._diffuse_bufs]
+        return sum(a.nbytes for a in arrays)
 
     # ── season helpers ───────────────────────────────────────────────────
     def get_season(self) -> str:
@@ -38,14 +256,17 @@ class World:
 
     def get_season_progress(self) -> float:
         """Returns 0.0–1.0 progress through current season."""
-        return (self.tick_count % cfg.SEASON_LENGTH) / cfg.SEASON_LENGTH
+        length = self.config.SEASON_LENGTH
+        return (self.tick_count % length) / length
 
     def get_season_tick(self) -> int:
         """Tick within the current season (0 to SEASON_LENGTH-1)."""
-        return self.tick_count % cfg.SEASON_LENGTH
+        return self.tick_count % self.config.SEASON_LENGTH
 
     def get_total_food(self) -> float:
         """Sum of all food on the grid."""
+        if self.quantized:
+            return float(np.sum(self.food, dtype=np.float64)) / _Q_MAX
         return float(np.sum(self.food))
 
     # ── per-tick update ──────────────────────────────────────────────────
@@ -54,70 +275,208 @@ class World:
         self.tick_count += 1
 
         # advance season
-        new_index = (self.tick_count // cfg.SEASON_LENGTH) % 4
+        new_index = (self.tick_count // self.config.SEASON_LENGTH) % 4
         if new_index != self.season_index:
             self.season_index = new_index
-            self.current_season = cfg.SEASONS[self.season_index]
+            self.current_season = self.config.SEASONS[self.season_index]
 
         # seasonal food decay (autumn/winter)
-        decay_rate = cfg.SEASON_FOOD_DECAY[self.current_season]
+        decay_rate = self.config.SEASON_FOOD_DECAY[self.current_season]
         if decay_rate > 0:
-            decay_mask = np.random.random((self.size, self.size)) < decay_rate
-            self.food[decay_mask] *= 0.9
+            ys, xs = self._sample_cells(decay_rate)
+            self.food[ys, xs] = self._encode(self._decode(self.food[ys, xs]) * 0.9)
+            self._dirty_arrays.append(ys * self.size + xs)
 
         # seasonal food regeneration
-        regen_rate = cfg.SEASON_FOOD_REGEN[self.current_season]
-        regen = np.random.random((self.size, self.size)) < regen_rate
-        self.food[regen] = np.minimum(self.food[regen] + 0.1, 1.0)
+        regen_rate = self.config.SEASON_FOOD_REGEN[self.current_season]
+        ys, xs = self._sample_cells(regen_rate)
+        self.food[ys, xs] = self._encode(
+            np.minimum(self._decode(self.food[ys, xs]) + 0.1, 1.0)
+        )
+        self._dirty_arrays.append(ys * self.size + xs)
 
         # scent diffusion (seasonal)
         self._diffuse_scent()
 
         # decay communication markers
-        self.food_markers *= (1.0 - cfg.FOOD_MARKER_DECAY)
-        self.alarm_markers *= (1.0 - cfg.ALARM_MARKER_DECAY)
-        np.clip(self.food_markers, 0, 1, out=self.food_markers)
-        np.clip(self.alarm_markers, 0, 1, out=self.alarm_markers)
+        if not self.lazy_markers:
+            self._decay_markers()
+        elif (self.config.MARKER_COMPACT_INTERVAL and self.tick_count
+              % self.config.MARKER_COMPACT_INTERVAL == 0):
+            self.compact_markers()
+
+    def _decay_markers(self):
+        """Scale both marker planes in place and keep them within [0, 1]."""
+        # whole planes: the halo stays zero and the block stays contiguous
+        markers = self.layers[LAYER_FOOD_MARKERS:LAYER_ALARM_MARKERS + 1]
+        if self.quantized:
+            # round down so faint markers still reach zero
+            tmp = self._diffuse_tmp
+            for layer, factor in zip(markers, self._marker_decay):
+                layer = layer[self._interior]
+                np.multiply(layer, factor, out=tmp)
+                np.floor(tmp, out=tmp)
+                layer[...] = tmp
+            return
+        np.multiply(markers, self._marker_decay, out=markers)
+        np.clip(markers, 0, 1, out=markers)
+
+    def _decayed_markers(self, plane: int) -> np.ndarray:
+        """Float marker values of one lazy plane (0 food, 1 alarm) at the
+        current tick, grid interior only."""
+        ticks = self.marker_ticks[(plane, *self._interior)]
+        codes = self.layers[(LAYER_FOOD_MARKERS + plane, *self._interior)]
+        factor = self._marker_decay[plane, 0, 0]
+        return self._decode(codes) * factor ** (self.tick_count - ticks)
+
+    def compact_markers(self):
+        """Fold pending lazy decay into the stored marker values.
+
+        Optional upkeep: reads are exact without it, but it lets quantized
+        markers round down to zero and keeps ages small.
+        """
+        for plane in range(2):
+            values = self._decayed_markers(plane).astype(self.work_dtype)
+            layer = self.layers[(LAYER_FOOD_MARKERS + plane, *self._interior)]
+            self._store(layer, values)
+        self.marker_ticks[(slice(None), *self._interior)] = self.tick_count
+
+    def _sample_cells(self, rate: float) -> tuple[np.ndarray, np.ndarray]:
+        """(ys, xs) of cells hit by an independent per-cell event of `rate`.
+
+        Dense mode draws one uniform per cell. Sparse mode draws the hit
+        count from Binomial(size², rate) and then that many distinct cells
+        uniformly — the same distribution at O(hits) RNG cost.
+        """
+        if not self.sparse_sampling:
+            return np.nonzero(self.rng.random((self.size, self.size)) < rate)
+        n_cells = self.size * self.size
+        hits = choose_distinct(n_cells, self.rng.binomial(n_cells, rate),
+                                self.rng)
+        return np.divmod(hits, self.size)
+
+    def mark_food_dirty(self, ys, xs):
+        """Flag food cells written from outside World for scent refresh."""
+        flat = np.ravel_multi_index((np.atleast_1d(ys), np.atleast_1d(xs)),
+                                    self.food.shape)
+        self._dirty_arrays.append(flat)
+
+    def invalidate_scent(self):
+        """Force a full scent rebuild on the next update."""
+        self._scent_stale = True
 
     def _diffuse_scent(self):
-        """Scent = blurred food map with seasonal diffusion factor."""
-        self.scent = self.food.copy()
-        diffusion = cfg.SEASON_SCENT_DIFFUSION.get(
-            self.current_season, cfg.SCENT_DIFFUSION
+        """Scent = blurred food map with seasonal diffusion factor.
+
+        Rebuilds the whole field when it is stale or the seasonal
+        coefficient changed; otherwise only the footprints of the food
+        cells that changed since the last tick are recomputed.
+        """
+        diffusion = self.config.SEASON_SCENT_DIFFUSION.get(
+            self.current_season, self.config.SCENT_DIFFUSION
         )
+        dirty = self._dirty_arrays
+        if self._dirty_cells:
+            dirty.append(np.array(self._dirty_cells, dtype=np.intp))
+        flat = np.concatenate(dirty) if dirty else np.empty(0, np.intp)
+        self._dirty_cells = []
+        self._dirty_arrays = []
 
-        padded = np.pad(self.scent, 1, mode="constant", constant_values=0)
-        for _ in range(3):
-            new = padded.copy()
-            new[1:-1, 1:-1] = (
-                padded[1:-1, 1:-1] * (1.0 - diffusion)
-                + (padded[:-2, 1:-1] + padded[2:, 1:-1]
-                   + padded[1:-1, :-2] + padded[1:-1, 2:])
-                * (diffusion / 4.0)
-            )
-            padded = new
-        self.scent = padded[1:-1, 1:-1]
+        if (self._scent_stale or not self.config.SCENT_INCREMENTAL
+                or diffusion != self._scent_diffusion
+                or flat.size * _DIRTY_CELL_COST >= self.size * self.size):
+            self._diffuse_full(diffusion)
+            self._scent_stale = False
+            self._scent_diffusion = diffusion
+        elif flat.size:
+            self._diffuse_cells(_sorted_unique(flat), diffusion)
+
+    def _diffuse_full(self, diffusion: float):
+        """Three explicit 5-point stencil passes with zero boundary,
+        computed in place between two preallocated padded buffers."""
+        keep = 1.0 - diffusion
+        spread = diffusion / 4.0
 
-        self.scent *= (1.0 - cfg.SCENT_DECAY)
-        self.scent = np.clip(self.scent, 0.0, 1.0)
+        src, dst = self._diffuse_bufs
+        tmp = self._diffuse_tmp
+        np.copyto(src[0], self.food)
+        if self.quantized:
+            np.multiply(src[0], 1.0 / _Q_MAX, out=src[0])
+        for _ in range(DIFFUSION_PASSES):
+            stencil_pass(src, dst[0], tmp, keep, spread)
+            src, dst = dst, src
+
+        if self.quantized:
+            np.multiply(src[0], 1.0 - self.config.SCENT_DECAY, out=tmp)
+            np.clip(tmp, 0.0, 1.0, out=tmp)
+            self._store(self.scent, tmp)
+        else:
+            np.multiply(src[0], 1.0 - self.config.SCENT_DECAY, out=self.scent)
+            np.clip(self.scent, 0.0, 1.0, out=self.scent)
+
+    def _diffuse_cells(self, flat: np.ndarray, diffusion: float):
+        """Recompute scent within DIFFUSION_PASSES of each dirty cell.
+
+        Each cell gets its own food window of radius 2 * DIFFUSION_PASSES;
+        after the passes its central footprint is exact, and cells outside
+        the grid are zeroed after every pass like the full padded buffer.
+        The result is bit-identical to a full rebuild.
+        """
+        r = DIFFUSION_PASSES
+        keep = 1.0 - diffusion
+        spread = diffusion / 4.0
+
+        ys, xs = np.divmod(flat, self.size)
+        offsets = np.arange(-2 * r, 2 * r + 1)
+        wy = ys[:, None] + offsets
+        wx = xs[:, None] + offsets
+        inside = (((wy >= 0) & (wy < self.size))[:, :, None]
+                  & ((wx >= 0) & (wx < self.size))[:, None, :])
+        np.clip(wy, 0, self.size - 1, out=wy)
+        np.clip(wx, 0, self.size - 1, out=wx)
+
+        n, w = flat.size, offsets.size
+        work = self.work_dtype
+        src = stencil_views(np.zeros((n, w + 2, w + 2), dtype=work))
+        dst = stencil_views(np.zeros((n, w + 2, w + 2), dtype=work))
+        tmp = np.empty((n, w, w), dtype=work)
+        np.multiply(self._decode(self.food[wy[:, :, None], wx[:, None, :]]),
+                    inside, out=src[0])
+        for _ in range(DIFFUSION_PASSES):
+            stencil_pass(src, dst[0], tmp, keep, spread)
+            np.multiply(dst[0], inside, out=dst[0])
+            src, dst = dst, src
+
+        core = slice(r, 3 * r + 1)
+        result = src[0][:, core, core] * (1.0 - self.config.SCENT_DECAY)
+        np.clip(result, 0.0, 1.0, out=result)
+        ty = ys[:, None] + offsets[core]
+        tx = xs[:, None] + offsets[core]
+        valid = (((ty >= 0) & (ty < self.size))[:, :, None]
+                 & ((tx >= 0) & (tx < self.size))[:, None, :])
+        ty = np.broadcast_to(ty[:, :, None], valid.shape)
+        tx = np.broadcast_to(tx[:, None, :], valid.shape)
+        self.scent[ty[valid], tx[valid]] = self._encode(result[valid])
 
     # ── agent interactions ───────────────────────────────────────────────
     def eat_food(self, x: int, y: int) -> float:
         """Agent eats food at (x, y). Returns energy gained."""
-        if self.food[y, x] > 0.05:
-            gained = min(self.food[y, x], 1.0) * cfg.ENERGY_FOOD_GAIN
-            self.food[y, x] = 0.0
+        food = self._value(self.food, x, y)
+        if food > 0.05:
+            gained = min(food, 1.0) * self.config.ENERGY_FOOD_GAIN
+            self.food[y, x] = 0
+            self._dirty_cells.append(y * self.size + x)
             return gained
         return 0.0
 
     def get_scent(self, x: int, y: int) -> float:
         if 0 <= x < self.size and 0 <= y < self.size:
-            return float(self.scent[y, x])
+            return self._value(self.scent, x, y)
         return 0.0
 
     def get_food(self, x: int, y: int) -> float:
         if 0 <= x < self.size and 0 <= y < self.size:
-            return float(self.food[y, x])
+            return self._value(self.food, x, y)
         return 0.0
 
     def has_food(self, x: int, y: int) -> bool:
@@ -125,29 +484,94 @@ class World:
 
     def get_visible_scent(self, cx: int, cy: int, r: int):
         """Return dict {(dx,dy): scent} for cells within vision range."""
-        visible = {}
-        for dy in range(-r, r + 1):
-            for dx in range(-r, r + 1):
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size:
-                    visible[(dx, dy)] = float(self.scent[ny, nx])
-        return visible
+        scent = self.window_values(cx, cy, r)[LAYER_SCENT].tolist()
+        inside = self.window_inside(cx, cy, r).tolist()
+        return {
+            (dx, dy): scent[dy + r][dx + r]
+            for dy in range(-r, r + 1)
+            for dx in range(-r, r + 1)
+            if inside[dy + r][dx + r]
+        }
 
     # ── communication markers ────────────────────────────────────────────
     def leave_food_marker(self, x: int, y: int, strength: float = 1.0):
-        if 0 <= x < self.size and 0 <= y < self.size:
-            self.food_markers[y, x] = min(1.0, self.food_markers[y, x] + strength)
+        self._leave_marker(0, x, y, strength)
 
     def leave_alarm_marker(self, x: int, y: int, strength: float = 1.0):
-        if 0 <= x < self.size and 0 <= y < self.size:
-            self.alarm_markers[y, x] = min(1.0, self.alarm_markers[y, x] + strength)
+        self._leave_marker(1, x, y, strength)
 
     def get_food_marker(self, x: int, y: int) -> float:
-        if 0 <= x < self.size and 0 <= y < self.size:
-            return float(self.food_markers[y, x])
-        return 0.0
+        return self._marker_value(0, x, y)
 
     def get_alarm_marker(self, x: int, y: int) -> float:
+        return self._marker_value(1, x, y)
+
+    def _marker_value(self, plane: int, x: int, y: int) -> float:
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return 0.0
+        h = self.halo
+        value = self._value(self.layers[LAYER_FOOD_MARKERS + plane], x + h, y + h)
+        if self.lazy_markers and value:
+            age = self.tick_count - int(self.marker_ticks[plane, y + h, x + h])
+            value *= float(self._marker_decay[plane, 0, 0]) ** age
+        return value
+
+    def _leave_marker(self, plane: int, x: int, y: int, strength: float):
         if 0 <= x < self.size and 0 <= y < self.size:
-            return float(self.alarm_markers[y, x])
-        return 0.0
+            h = self.halo
+            value = min(1.0, self._marker_value(plane, x, y) + strength)
+            self.layers[LAYER_FOOD_MARKERS + plane, y + h, x + h] = (
+                self._encode(value)
+            )
+            self.marker_ticks[plane, y + h, x + h] = self.tick_count
+
+
+def choose_distinct(n: int, k: int,
+                    rng: np.random.Generator) -> np.ndarray:
+    """k distinct integers drawn uniformly from range(n) by `rng`, sorted.
+
+    Draws with replacement and tops up the duplicates, which keeps the
+    first k distinct values of a uniform stream: a uniform k-subset.
+    """
+    if 2 * k > n:
+        return np.sort(rng.permutation(n)[:k])
+    picked = _sorted_unique(rng.integers(0, n, k))
+    while picked.size < k:
+        extra = rng.integers(0, n, k - picked.size)
+        picked = _sorted_unique(np.concatenate((picked, extra)))
+    return picked
+
+
+def _sorted_unique(a: np.ndarray) -> np.ndarray:
+    """np.unique for 1-D integer arrays via a plain sort, several times
+    faster than np.unique on large index arrays."""
+    if a.size == 0:
+        return a
+    a = np.sort(a)
+    keep = np.empty(a.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(a[1:], a[:-1], out=keep[1:])
+    return a[keep]
+
+
+def stencil_views(padded: np.ndarray) -> tuple:
+    """(centre, up, down, left, right) views into a padded buffer."""
+    return (padded[..., 1:-1, 1:-1], padded[..., :-2, 1:-1],
+            padded[..., 2:, 1:-1], padded[..., 1:-1, :-2],
+            padded[..., 1:-1, 2:])
+
+
+def stencil_pass(src: tuple, out: np.ndarray, tmp: np.ndarray,
+                 keep: float, spread: float):
+    """One diffusion pass: out = centre * keep + (N + S + W + E) * spread.
+
+    `src` holds views from stencil_views(); the summation
+    order is fixed so every code path produces identical floats.
+    """
+    centre, up, down, left, right = src
+    np.add(up, down, out=out)
+    np.add(out, left, out=out)
+    np.add(out, right, out=out)
+    np.multiply(out, spread, out=out)
+    np.multiply(centre, keep, out=tmp)
+    np.add(tmp, out, out=out)